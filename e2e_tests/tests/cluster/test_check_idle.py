@@ -0,0 +1,185 @@
+import http.server
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+here = os.path.dirname(__file__)
+static_srv = os.path.join(here, "../../../master/static/srv")
+old = sys.path
+try:
+    sys.path = [static_srv] + sys.path
+    import check_idle
+finally:
+    sys.path = old
+
+
+class FakeJupyter:
+    """
+    A fake Jupyter server which serves whatever kernels, terminals, and sessions a test sets, and
+    counts the requests and connections it receives.
+    """
+
+    def __init__(self) -> None:
+        self.api: Dict[str, List[Dict[str, Any]]] = {"kernels": [], "terminals": [], "sessions": []}
+        self.requests: List[str] = []
+        self.connections = 0
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            # Keep connections alive, like Jupyter does.
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                fake.connections += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                fake.requests.append(self.path)
+                body = json.dumps(fake.api[self.path.rsplit("/", 1)[-1]]).encode("utf8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "FakeJupyter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def kernel(execution_state: str = "idle", last_activity: str = "t0", connections: int = 0) -> Any:
+    return {
+        "execution_state": execution_state,
+        "last_activity": last_activity,
+        "connections": connections,
+    }
+
+
+@pytest.mark.e2e_cpu
+def test_detector_reuses_one_connection() -> None:
+    with FakeJupyter() as jupyter:
+        detector = check_idle.IdleDetector(jupyter.url, check_idle.IdleType.KERNELS_OR_TERMINALS)
+        for _ in range(5):
+            assert detector.is_idle()
+        assert len(jupyter.requests) == 15
+        assert jupyter.connections == 1
+
+
+@pytest.mark.e2e_cpu
+def test_kernels_or_terminals_stops_at_first_sign_of_use() -> None:
+    with FakeJupyter() as jupyter:
+        detector = check_idle.IdleDetector(jupyter.url, check_idle.IdleType.KERNELS_OR_TERMINALS)
+        jupyter.api["kernels"] = [kernel()]
+        assert not detector.is_idle()
+        assert jupyter.requests == ["/api/kernels"]
+
+        jupyter.api["kernels"] = []
+        jupyter.api["terminals"] = [{"name": "1", "last_activity": "t0"}]
+        jupyter.requests.clear()
+        assert not detector.is_idle()
+        assert jupyter.requests == ["/api/kernels", "/api/terminals"]
+
+
+@pytest.mark.e2e_cpu
+def test_kernel_connections() -> None:
+    with FakeJupyter() as jupyter:
+        detector = check_idle.IdleDetector(jupyter.url, check_idle.IdleType.KERNEL_CONNECTIONS)
+        jupyter.api["kernels"] = [kernel(connections=0), kernel(connections=1)]
+        assert not detector.is_idle()
+        jupyter.api["kernels"] = [kernel(connections=0)]
+        assert detector.is_idle()
+        assert jupyter.requests == ["/api/kernels", "/api/kernels"]
+
+
+@pytest.mark.e2e_cpu
+def test_activity() -> None:
+    with FakeJupyter() as jupyter:
+        detector = check_idle.IdleDetector(jupyter.url, check_idle.IdleType.ACTIVITY)
+        jupyter.api["kernels"] = [kernel(last_activity="t0")]
+        # The first check has nothing to compare against.
+        assert not detector.is_idle()
+        assert detector.is_idle()
+
+        jupyter.api["terminals"] = [{"name": "1", "last_activity": "t1"}]
+        assert not detector.is_idle()
+        assert detector.is_idle()
+
+        # A busy kernel is active whatever its last activity, and needs no other request.
+        jupyter.api["kernels"] = [kernel("busy", last_activity="t0")]
+        jupyter.requests.clear()
+        assert not detector.is_idle()
+        assert jupyter.requests == ["/api/kernels"]
+
+
+@pytest.mark.e2e_cpu
+def test_detector_unreachable_is_not_idle() -> None:
+    with FakeJupyter() as jupyter:
+        url = jupyter.url
+    detector = check_idle.IdleDetector(url, check_idle.IdleType.KERNELS_OR_TERMINALS)
+    assert not detector.is_idle()
+
+
+class ScriptedDetector:
+    def __init__(self, states: List[bool]) -> None:
+        self.states = states
+
+    def is_idle(self) -> bool:
+        return self.states.pop(0)
+
+
+@pytest.mark.e2e_cpu
+def test_monitor_reports_changes_immediately_and_backs_off() -> None:
+    reports: List[bool] = []
+    states = [False] * 5 + [True] * 4 + [False]
+    monitor = check_idle.IdleMonitor(ScriptedDetector(states), reports.append)
+
+    intervals = [monitor.check() for _ in range(len(states))]
+
+    # Every check of an active notebook is reported, but only the first check of an idle one, and
+    # checks grow further apart while the notebook stays active or idle.
+    assert reports == [False] * 5 + [True] + [False]
+    assert intervals == [5, 10, 20, 30, 30, 5, 10, 20, 30, 5]
+
+
+@pytest.mark.e2e_cpu
+def test_monitor_repeats_idle_reports_and_retries_failures(monkeypatch: Any) -> None:
+    now = [0.0]
+    monkeypatch.setattr(check_idle.time, "monotonic", lambda: now[0])
+    reports: List[bool] = []
+    fail = [True]
+
+    def report(idle: bool) -> None:
+        if fail.pop(0) if fail else False:
+            raise ConnectionError("master is unreachable")
+        reports.append(idle)
+
+    monitor = check_idle.IdleMonitor(ScriptedDetector([True] * 4), report)
+    # The first report fails, so the second check reports again.
+    monitor.check()
+    assert reports == []
+    monitor.check()
+    assert reports == [True]
+
+    now[0] += check_idle.IDLE_REPORT_INTERVAL - 1
+    monitor.check()
+    assert reports == [True]
+    now[0] += 1
+    monitor.check()
+    assert reports == [True, True]
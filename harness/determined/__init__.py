@@ -1,30 +1,103 @@
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from determined.__version__ import __version__
-from determined._experiment_config import ExperimentConfig
-from determined._info import RendezvousInfo, TrialInfo, ResourcesInfo, ClusterInfo, get_cluster_info
-from determined._import import import_from_path
-from determined import core
-from determined._env_context import EnvContext
-from determined._trial_context import TrialContext
-from determined._trial import LegacyTrial
-from determined._trial_controller import (
-    _DistributedBackend,
-    TrialController,
-)
-from determined._execution import (
-    _catch_sys_exit,
-    _make_test_experiment_config,
-    _make_local_execution_env,
-    _get_gpus,
-    _make_local_execution_exp_config,
-    _local_execution_manager,
-    _load_trial_for_checkpoint_export,
-    InvalidHP,
-)
-from determined import errors
-from determined import util
 
 # LOG_FORMAT is the standard format for use with the logging module, which is required for the
 # WebUI's log viewer to filter logs by log level.
 #
 # Dev note: if this format is changed, the ship_logs.py log parsing must be updated as well.
 LOG_FORMAT = "%(levelname)s: [%(process)s] %(name)s: %(message)s"
+
+# Everything else in the package is imported on first access, so that importing any part of
+# determined (like determined.launch.wrap_rank in every worker, or determined.ipc in the pid server)
+# does not also import the Core API, its REST bindings, and the training loops.
+_lazy_attrs = {
+    "ExperimentConfig": "determined._experiment_config",
+    "RendezvousInfo": "determined._info",
+    "TrialInfo": "determined._info",
+    "ResourcesInfo": "determined._info",
+    "ClusterInfo": "determined._info",
+    "get_cluster_info": "determined._info",
+    "import_from_path": "determined._import",
+    "EnvContext": "determined._env_context",
+    "TrialContext": "determined._trial_context",
+    "LegacyTrial": "determined._trial",
+    "_DistributedBackend": "determined._trial_controller",
+    "TrialController": "determined._trial_controller",
+    "_catch_sys_exit": "determined._execution",
+    "_make_test_experiment_config": "determined._execution",
+    "_make_local_execution_env": "determined._execution",
+    "_get_gpus": "determined._execution",
+    "_make_local_execution_exp_config": "determined._execution",
+    "_local_execution_manager": "determined._execution",
+    "_load_trial_for_checkpoint_export": "determined._execution",
+    "InvalidHP": "determined._execution",
+}
+
+_lazy_submodules = {
+    "common",
+    "constants",
+    "core",
+    "errors",
+    "experimental",
+    "gpu",
+    "horovod",
+    "ipc",
+    "keras",
+    "launch",
+    "layers",
+    "lightning",
+    "load",
+    "profiler",
+    "pytorch",
+    "searcher",
+    "tensorboard",
+    "transformers",
+    "util",
+    "workload",
+}
+
+if TYPE_CHECKING:
+    from determined._experiment_config import ExperimentConfig
+    from determined._info import (
+        RendezvousInfo,
+        TrialInfo,
+        ResourcesInfo,
+        ClusterInfo,
+        get_cluster_info,
+    )
+    from determined._import import import_from_path
+    from determined import core
+    from determined._env_context import EnvContext
+    from determined._trial_context import TrialContext
+    from determined._trial import LegacyTrial
+    from determined._trial_controller import (
+        _DistributedBackend,
+        TrialController,
+    )
+    from determined._execution import (
+        _catch_sys_exit,
+        _make_test_experiment_config,
+        _make_local_execution_env,
+        _get_gpus,
+        _make_local_execution_exp_config,
+        _local_execution_manager,
+        _load_trial_for_checkpoint_export,
+        InvalidHP,
+    )
+    from determined import errors
+    from determined import util
+else:
+
+    def __getattr__(name: str) -> Any:
+        if name in _lazy_attrs:
+            value = getattr(importlib.import_module(_lazy_attrs[name]), name)
+            globals()[name] = value
+            return value
+        if name in _lazy_submodules:
+            return importlib.import_module(f"{__name__}.{name}")
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    def __dir__() -> List[str]:
+        return sorted(set(globals()) | set(_lazy_attrs) | _lazy_submodules)
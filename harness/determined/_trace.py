@@ -0,0 +1,143 @@
+"""
+An opt-in tracer which records spans of the harness's hot path and writes them as a Chrome
+trace-event file, which can be opened in Perfetto (https://ui.perfetto.dev) or chrome://tracing.
+
+Set DET_TRACE_DIR to a directory to enable tracing; every process writes its own
+trace-<hostname>-<pid>.json file there when it exits. Spans are kept in a ring buffer of
+DET_TRACE_BUFFER_SIZE spans (100000 by default), so a long run keeps only its most recent spans.
+
+Recording a span costs two clock reads and a deque append, and nothing is formatted until the trace
+is written. When tracing is disabled, span() returns a shared no-op context manager.
+"""
+import atexit
+import collections
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import socket
+import tempfile
+import threading
+import time
+from types import TracebackType
+from typing import Any, ContextManager, Deque, Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger("determined")
+
+TRACE_DIR_ENV = "DET_TRACE_DIR"
+TRACE_BUFFER_SIZE_ENV = "DET_TRACE_BUFFER_SIZE"
+DEFAULT_BUFFER_SIZE = 100000
+
+# (name, category, start_ns, duration_ns, thread id)
+_Event = Tuple[str, str, int, int, int]
+
+
+class Tracer:
+    def __init__(self, path: pathlib.Path, buffer_size: int = DEFAULT_BUFFER_SIZE) -> None:
+        self.path = path
+        self._events: Deque[_Event] = collections.deque(maxlen=buffer_size)
+
+    @classmethod
+    def from_env(cls) -> Optional["Tracer"]:
+        trace_dir = os.environ.get(TRACE_DIR_ENV)
+        if not trace_dir:
+            return None
+        buffer_size = int(os.environ.get(TRACE_BUFFER_SIZE_ENV, DEFAULT_BUFFER_SIZE))
+        path = pathlib.Path(trace_dir, f"trace-{socket.gethostname()}-{os.getpid()}.json")
+        return cls(path, buffer_size)
+
+    def complete(self, name: str, category: str, start_ns: int) -> None:
+        """Record a span which started at start_ns (from time.time_ns()) and ends now."""
+        self._events.append(
+            (name, category, start_ns, time.time_ns() - start_ns, threading.get_ident())
+        )
+
+    def span(self, name: str, category: str) -> "_Span":
+        return _Span(self, name, category)
+
+    def write(self) -> None:
+        """Write the recorded spans to the trace file, replacing any previous version of it."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"{socket.gethostname()} (pid {pid})"},
+            }
+        ]
+        # Copy the buffer first; other threads may still be recording.
+        for name, category, start_ns, duration_ns, tid in list(self._events):
+            events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start_ns / 1000,
+                    "dur": duration_ns / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                }
+            )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, self.path)
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_category", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._start = 0
+
+    def __enter__(self) -> None:
+        self._start = time.time_ns()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self._tracer.complete(self._name, self._category, self._start)
+
+
+_tracer = Tracer.from_env()
+_null_span = contextlib.nullcontext()
+
+
+def _write_at_exit() -> None:
+    if _tracer is None:
+        return
+    try:
+        _tracer.write()
+        logger.info(f"wrote trace to {_tracer.path}")
+    except Exception as e:
+        logger.warning(f"failed to write trace to {_tracer.path}: {e}")
+
+
+atexit.register(_write_at_exit)
+
+
+def span(name: str, category: str = "harness") -> ContextManager[None]:
+    """Trace the body of a with statement, if tracing is enabled."""
+    if _tracer is None:
+        return _null_span
+    return _tracer.span(name, category)
+
+
+def now() -> int:
+    """A start time to pass to complete(), for spans which do not fit a with statement."""
+    return time.time_ns()
+
+
+def complete(name: str, start_ns: int, category: str = "harness") -> None:
+    if _tracer is not None:
+        _tracer.complete(name, category, start_ns)
@@ -0,0 +1,302 @@
+"""
+An event-loop implementation of the tunnel listener in proxy.py.
+
+Every forwarded connection is served by two coroutines on a single event loop thread, instead of by
+two threads of its own. Reads start at MIN_READ_SIZE and grow up to MAX_READ_SIZE while a
+connection keeps filling them. Writes wait for the receiving side to drain, so a fast sender is
+throttled to the speed of a slow receiver instead of being buffered without bound. Optionally, small
+reads are held for up to coalesce_delay seconds to be sent as one WebSocket frame.
+
+lomond builds the WebSocket handshake and masks the frames we send; the frames the master sends are
+parsed here, straight from the stream.
+"""
+import asyncio
+import contextlib
+import socket
+import ssl
+import struct
+import sys
+import threading
+import urllib.parse
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import lomond
+from lomond.errors import HandshakeError
+from lomond.frame import Frame
+from lomond.mask import mask_payload
+from lomond.opcode import Opcode
+from lomond.proxy import ProxyFail, ProxyParser
+from lomond.proxy import build_request as build_proxy_request
+from lomond.response import Response
+from lomond.status import Status
+
+MIN_READ_SIZE = 64 * 1024
+MAX_READ_SIZE = 1024 * 1024
+# Seconds to wait for the master to acknowledge our close frame.
+CLOSE_TIMEOUT = 30.0
+
+
+def proxy_for(url: str, proxies: Optional[Dict[str, str]]) -> Optional[str]:
+    """The HTTP proxy, if any, that lomond would connect to url through."""
+    ws = lomond.WebSocket(url, proxies=proxies)
+    proxy = ws.proxies.get("https" if ws.is_secure else "http")
+    assert proxy is None or isinstance(proxy, str)
+    return proxy or None
+
+
+def supports(url: str, proxies: Optional[Dict[str, str]]) -> bool:
+    # asyncio can't layer TLS to the master over a TLS connection to an https:// proxy.
+    proxy = proxy_for(url, proxies)
+    return proxy is None or urllib.parse.urlparse(proxy).scheme != "https"
+
+
+def _connect_proxy(proxy: str, host: str, port: int) -> socket.socket:
+    """Open a socket to host:port through an HTTP CONNECT proxy."""
+    parsed = urllib.parse.urlparse(proxy)
+    sock = socket.create_connection((parsed.hostname, parsed.port or 80))
+    try:
+        sock.sendall(build_proxy_request(host, port, parsed.username, parsed.password))
+        parser = ProxyParser()
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                raise ConnectionError("proxy closed the connection")
+            for _ in parser.feed(data):
+                return sock
+    except BaseException:
+        sock.close()
+        raise
+
+
+class _Tunnel:
+    def __init__(
+        self,
+        local_reader: asyncio.StreamReader,
+        local_writer: asyncio.StreamWriter,
+        coalesce_delay: float,
+    ) -> None:
+        self.local_reader = local_reader
+        self.local_writer = local_writer
+        self.coalesce_delay = coalesce_delay
+        self.ws_reader: Optional[asyncio.StreamReader] = None
+        self.ws_writer: Optional[asyncio.StreamWriter] = None
+        self.close_sent = False
+
+    async def connect(
+        self,
+        url: str,
+        proxies: Optional[Dict[str, str]],
+        headers: List[Tuple[bytes, bytes]],
+        ssl_context: Optional[ssl.SSLContext],
+        server_hostname: Optional[str],
+    ) -> None:
+        ws = lomond.WebSocket(url, proxies=proxies)
+        for header, value in headers:
+            ws.add_header(header, value)
+        if not ws.is_secure:
+            ssl_context, server_hostname = None, None
+        elif server_hostname is None:
+            server_hostname = ws.host
+
+        proxy = proxy_for(url, proxies)
+        if proxy is not None:
+            loop = asyncio.get_event_loop()
+            sock = await loop.run_in_executor(None, _connect_proxy, proxy, ws.host, ws.port)
+            self.ws_reader, self.ws_writer = await asyncio.open_connection(
+                sock=sock, ssl=ssl_context, server_hostname=server_hostname, limit=MAX_READ_SIZE
+            )
+        else:
+            self.ws_reader, self.ws_writer = await asyncio.open_connection(
+                ws.host,
+                ws.port,
+                ssl=ssl_context,
+                server_hostname=server_hostname,
+                limit=MAX_READ_SIZE,
+            )
+
+        self.ws_writer.write(ws.build_request())
+        response = Response(await self.ws_reader.readuntil(b"\r\n\r\n"))
+        ws.on_response(response)
+
+    async def send(self, opcode: int, payload: bytes) -> None:
+        assert self.ws_writer
+        self.ws_writer.write(Frame.build(opcode, payload))
+        await self.ws_writer.drain()
+
+    async def send_close(self) -> None:
+        if self.close_sent:
+            return
+        self.close_sent = True
+        await self.send(Opcode.CLOSE, Frame.build_close_payload(Status.NORMAL, b"goodbye"))
+
+    async def read_frame(self) -> Tuple[int, bytes]:
+        """Read one frame from the master, returning its opcode and payload."""
+        assert self.ws_reader
+        byte0, byte1 = await self.ws_reader.readexactly(2)
+        if byte0 & 0x70:
+            raise ConnectionError("received a WebSocket frame with reserved bits set")
+        length = byte1 & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await self.ws_reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await self.ws_reader.readexactly(8))
+        if byte1 & 0x80:
+            # Servers should not mask their frames, but accept them anyway.
+            masking_key = await self.ws_reader.readexactly(4)
+            payload = bytearray(await self.ws_reader.readexactly(length))
+            mask_payload(masking_key, payload)
+            return byte0 & 0x0F, bytes(payload)
+        return byte0 & 0x0F, await self.ws_reader.readexactly(length)
+
+    async def read_local(self, size: int) -> bytes:
+        data = await self.local_reader.read(size)
+        if not self.coalesce_delay or not data:
+            return data
+        # Hold small reads for a moment, in case more data follows right after them.
+        chunks = [data]
+        received = len(data)
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.coalesce_delay
+        while received < size and loop.time() < deadline:
+            try:
+                more = await asyncio.wait_for(
+                    self.local_reader.read(size - received), deadline - loop.time()
+                )
+            except asyncio.TimeoutError:
+                break
+            if not more:
+                break
+            chunks.append(more)
+            received += len(more)
+        return b"".join(chunks)
+
+    async def copy_to_websocket(self) -> None:
+        size = MIN_READ_SIZE
+        while True:
+            data = await self.read_local(size)
+            if not data:
+                break
+            await self.send(Opcode.BINARY, data)
+            if len(data) >= size:
+                size = min(size * 2, MAX_READ_SIZE)
+            elif len(data) < size // 4:
+                size = max(size // 2, MIN_READ_SIZE)
+        await self.send_close()
+
+    async def copy_from_websocket(self) -> None:
+        binary = False
+        while True:
+            try:
+                opcode, payload = await self.read_frame()
+            except asyncio.IncompleteReadError:
+                return
+            if opcode == Opcode.BINARY or (opcode == Opcode.CONTINUATION and binary):
+                binary = True
+                self.local_writer.write(payload)
+                await self.local_writer.drain()
+            elif opcode == Opcode.TEXT:
+                binary = False
+            elif opcode == Opcode.PING:
+                await self.send(Opcode.PONG, payload)
+            elif opcode == Opcode.CLOSE:
+                await self.send_close()
+                return
+
+    async def run(self) -> None:
+        to_ws = asyncio.ensure_future(self.copy_to_websocket())
+        from_ws = asyncio.ensure_future(self.copy_from_websocket())
+        try:
+            await asyncio.wait([to_ws, from_ws], return_when=asyncio.FIRST_COMPLETED)
+            if to_ws.done() and not to_ws.exception() and not from_ws.done():
+                # The local connection closed first; let the master acknowledge our close frame.
+                await asyncio.wait([from_ws], timeout=CLOSE_TIMEOUT)
+            for task in (to_ws, from_ws):
+                if task.done():
+                    task.result()
+        finally:
+            to_ws.cancel()
+            from_ws.cancel()
+
+    def close(self) -> None:
+        self.local_writer.close()
+        if self.ws_writer is not None:
+            self.ws_writer.close()
+
+
+@contextlib.contextmanager
+def tunnel_listener(
+    listeners: List[Tuple[str, int, str]],
+    proxies: Optional[Dict[str, str]],
+    headers: List[Tuple[bytes, bytes]],
+    ssl_context: Optional[ssl.SSLContext],
+    server_hostname: Optional[str],
+    coalesce_delay: float = 0.0,
+) -> Iterator[None]:
+    """
+    Forward every connection to each (local_addr, local_port, url) listener to the WebSocket at
+    url, until the context exits.
+    """
+    loop = asyncio.new_event_loop()
+    connections: Set["asyncio.Task[None]"] = set()
+
+    def handler(
+        url: str,
+    ) -> Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            task = asyncio.current_task()
+            assert task
+            connections.add(task)
+            tunnel = _Tunnel(reader, writer, coalesce_delay)
+            try:
+                try:
+                    await tunnel.connect(url, proxies, headers, ssl_context, server_hostname)
+                except (OSError, asyncio.IncompleteReadError, HandshakeError, ProxyFail) as e:
+                    print(f"Connection failed: {e}", file=sys.stderr)
+                    return
+                await tunnel.run()
+            except (OSError, asyncio.IncompleteReadError):
+                # Either side of the tunnel went away.
+                pass
+            except asyncio.CancelledError:
+                # The listener is shutting down.
+                pass
+            finally:
+                tunnel.close()
+                connections.discard(task)
+
+        return handle
+
+    async def start() -> List[asyncio.AbstractServer]:
+        return [
+            await asyncio.start_server(
+                handler(url),
+                local_addr,
+                local_port,
+                limit=MAX_READ_SIZE,
+                # On Windows, SO_REUSEADDR is a security issue:
+                # https://learn.microsoft.com/en-us/windows/win32/winsock/using-so-reuseaddr-and-so-exclusiveaddruse#application-strategies
+                reuse_address=sys.platform != "win32",
+            )
+            for local_addr, local_port, url in listeners
+        ]
+
+    async def stop(servers: List[asyncio.AbstractServer]) -> None:
+        for server in servers:
+            server.close()
+        for task in list(connections):
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        for server in servers:
+            await server.wait_closed()
+
+    # Bind in this thread, so that errors like a port already in use are raised to the caller.
+    servers = loop.run_until_complete(start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        asyncio.run_coroutine_threadsafe(stop(servers), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
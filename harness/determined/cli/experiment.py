@@ -1,4 +1,6 @@
 import base64
+import collections
+import concurrent.futures
 import distutils.util
 import json
 import numbers
@@ -8,7 +10,21 @@ import time
 from argparse import ArgumentError, FileType, Namespace
 from pathlib import Path
 from pprint import pformat
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import tabulate
 import termcolor
@@ -30,6 +46,9 @@ from .checkpoint import render_checkpoint
 from .project import project_by_name
 from .trial import logs_args_description
 
+T = TypeVar("T")
+U = TypeVar("U")
+
 # Avoid reporting BrokenPipeError when piping `tabulate` output through
 # a filter like `head`.
 FLUSH = False
@@ -128,14 +147,21 @@ def _parse_config_text_or_exit(
 def _follow_experiment_logs(sess: api.Session, exp_id: int) -> None:
     # Get the ID of this experiment's first trial (i.e., the one with the lowest ID).
     print("Waiting for first trial to begin...")
+    delays = util.backoff_intervals(0.1, 2.0)
     while True:
-        trials = bindings.get_GetExperimentTrials(sess, experimentId=exp_id).trials
+        trials = bindings.get_GetExperimentTrials(
+            sess,
+            experimentId=exp_id,
+            limit=1,
+            orderBy=bindings.v1OrderBy.ASC,
+            sortBy=bindings.v1GetExperimentTrialsRequestSortBy.ID,
+        ).trials
         if len(trials) > 0:
             break
         else:
-            time.sleep(0.1)
+            time.sleep(next(delays))
 
-    first_trial_id = sorted(t_id.id for t_id in trials)[0]
+    first_trial_id = trials[0].id
     print(f"Following first trial with ID {first_trial_id}")
     try:
         tlogs = logs.trial_logs(sess, first_trial_id, follow=True)
@@ -386,6 +412,8 @@ def describe(args: Namespace) -> None:
     if args.json:
         determined.cli.render.print_json([resp.to_json() for resp in responses])
         return
+    if args.file_format == "parquet" and not args.outdir:
+        raise CliError("--format parquet requires --outdir")
     exps = [resp.experiment for resp in responses]
 
     # Display overall experiment information.
@@ -420,8 +448,15 @@ def describe(args: Namespace) -> None:
         outfile = None
         print("Experiment:")
     else:
-        outfile = args.outdir.joinpath("experiments.csv")
-    render.tabulate_or_csv(headers, values, args.csv, outfile)
+        outfile = args.outdir.joinpath(f"experiments.{args.file_format}")
+    render.stream_table(
+        headers,
+        values,
+        args.csv,
+        outfile,
+        args.file_format,
+        [int, str, str, str, str, str, str, bool, str, str],
+    )
 
     # Display trial-related information.
 
@@ -455,60 +490,85 @@ def describe(args: Namespace) -> None:
         outfile = None
         print("\nTrials:")
     else:
-        outfile = args.outdir.joinpath("trials.csv")
-    render.tabulate_or_csv(headers, values, args.csv, outfile)
+        outfile = args.outdir.joinpath(f"trials.{args.file_format}")
+    render.stream_table(
+        headers, values, args.csv, outfile, args.file_format, [int, int, str, str, str, str]
+    )
 
     # Display workload-related information.
 
-    def get_all_workloads(trial_id: int) -> List[bindings.v1WorkloadContainer]:
-        def get_with_offset(offset: int) -> bindings.v1GetTrialWorkloadsResponse:
-            return bindings.get_GetTrialWorkloads(
-                session,
-                offset=offset,
-                trialId=trial_id,
-                limit=500,
-            )
+    # Workloads are fetched for many trials at once over a shared pool of connections, and rows
+    # are emitted trial by trial instead of holding every trial's workloads in memory.
+    with session.with_connection_pool(args.max_workers) as pooled_session:
+
+        def get_all_workloads(trial_id: int) -> List[bindings.v1WorkloadContainer]:
+            def get_with_offset(offset: int) -> bindings.v1GetTrialWorkloadsResponse:
+                return bindings.get_GetTrialWorkloads(
+                    pooled_session,
+                    offset=offset,
+                    trialId=trial_id,
+                    limit=500,
+                )
 
-        resps = api.read_paginated(get_with_offset)
-        return [w for r in resps for w in r.workloads]
+            resps = api.read_paginated(get_with_offset)
+            return [w for r in resps for w in r.workloads]
+
+        all_trials = [trial for exp in exps for trial in trials_for_experiment[exp.id]]
+
+        t_metrics_headers: List[str] = []
+        t_metrics_names: List[str] = []
+        v_metrics_headers: List[str] = []
+        v_metrics_names: List[str] = []
+        sample_workloads: Dict[int, List[bindings.v1WorkloadContainer]] = {}
+        if args.metrics:
+            # Accumulate the scalar training and validation metric names from all provided
+            # experiments.
+            sample_trials = [
+                trials_for_experiment[exp.id][0] for exp in exps if trials_for_experiment[exp.id]
+            ]
+            sample_workloads = dict(
+                zip(
+                    (t.id for t in sample_trials),
+                    _map_concurrently(
+                        lambda t: get_all_workloads(t.id), sample_trials, args.max_workers
+                    ),
+                )
+            )
+            for workloads in sample_workloads.values():
+                t_metrics_names += scalar_training_metrics_names(workloads)
+                v_metrics_names += scalar_validation_metrics_names(workloads)
+            t_metrics_names = sorted(set(t_metrics_names))
+            t_metrics_headers = [f"Training Metric: {name}" for name in t_metrics_names]
+            v_metrics_names = sorted(set(v_metrics_names))
+            v_metrics_headers = [f"Validation Metric: {name}" for name in v_metrics_names]
+
+        headers = (
+            ["Trial ID", "# of Batches", "State", "Report Time"]
+            + t_metrics_headers
+            + [
+                "Checkpoint State",
+                "Checkpoint Report Time",
+                "Validation State",
+                "Validation Report Time",
+            ]
+            + v_metrics_headers
+        )
+        column_types = (
+            [int, int, str, str]
+            + [float] * len(t_metrics_names)
+            + [str, str, str, str]
+            + [float] * len(v_metrics_names)
+        )
 
-    all_workloads = {
-        exp.id: {t.id: get_all_workloads(t.id) for t in trials_for_experiment[exp.id]}
-        for exp in exps
-    }
-
-    t_metrics_headers: List[str] = []
-    t_metrics_names: List[str] = []
-    v_metrics_headers: List[str] = []
-    v_metrics_names: List[str] = []
-    if args.metrics:
-        # Accumulate the scalar training and validation metric names from all provided experiments.
-        for exp in exps:
-            sample_trial = trials_for_experiment[exp.id][0]
-            sample_workloads = all_workloads[exp.id][sample_trial.id]
-            t_metrics_names += scalar_training_metrics_names(sample_workloads)
-            v_metrics_names += scalar_validation_metrics_names(sample_workloads)
-        t_metrics_names = sorted(set(t_metrics_names))
-        t_metrics_headers = [f"Training Metric: {name}" for name in t_metrics_names]
-        v_metrics_names = sorted(set(v_metrics_names))
-        v_metrics_headers = [f"Validation Metric: {name}" for name in v_metrics_names]
-
-    headers = (
-        ["Trial ID", "# of Batches", "State", "Report Time"]
-        + t_metrics_headers
-        + [
-            "Checkpoint State",
-            "Checkpoint Report Time",
-            "Validation State",
-            "Validation Report Time",
-        ]
-        + v_metrics_headers
-    )
+        def fetch_workloads(trial: bindings.trialv1Trial) -> List[bindings.v1WorkloadContainer]:
+            # Trials sampled for metric names have already been fetched once.
+            if trial.id in sample_workloads:
+                return sample_workloads.pop(trial.id)
+            return get_all_workloads(trial.id)
 
-    values = []
-    for exp in exps:
-        for trial in trials_for_experiment[exp.id]:
-            workloads = all_workloads[exp.id][trial.id]
+        def trial_rows(
+            trial: bindings.trialv1Trial, workloads: List[bindings.v1WorkloadContainer]
+        ) -> List[List[Any]]:
             wl_output: Dict[int, List[Any]] = {}
             for workload in workloads:
                 t_metrics_fields = []
@@ -602,15 +662,41 @@ def describe(args: Namespace) -> None:
                         )
                         wl_output[wl_detail.totalBatches] = row
 
-            # Done processing one trial's workloads, add to output values.
-            values += sorted(wl_output.values(), key=lambda a: int(a[1]))
+            return sorted(wl_output.values(), key=lambda a: int(a[1]))
 
-    if not args.outdir:
-        outfile = None
-        print("\nWorkloads:")
-    else:
-        outfile = args.outdir.joinpath("workloads.csv")
-    render.tabulate_or_csv(headers, values, args.csv, outfile)
+        workload_rows = (
+            row
+            for trial, workloads in zip(
+                all_trials, _map_concurrently(fetch_workloads, all_trials, args.max_workers)
+            )
+            for row in trial_rows(trial, workloads)
+        )
+
+        if not args.outdir:
+            outfile = None
+            print("\nWorkloads:")
+        else:
+            outfile = args.outdir.joinpath(f"workloads.{args.file_format}")
+        render.stream_table(
+            headers, workload_rows, args.csv, outfile, args.file_format, column_types
+        )
+
+
+def _map_concurrently(fn: Callable[[T], U], items: Sequence[T], max_workers: int) -> Iterator[U]:
+    """
+    Yield fn(item) for each item, in order, running up to max_workers calls at once.
+
+    At most 2 * max_workers results are buffered ahead of the consumer, so memory stays bounded
+    even when the consumer is slower than the fetches.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[concurrent.futures.Future] = collections.deque()
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 @authentication.required
@@ -687,8 +773,10 @@ def download(args: Namespace) -> None:
 
     top_level = pathlib.Path(args.output_dir)
     top_level.mkdir(parents=True, exist_ok=True)
-    for ckpt in checkpoints:
-        path = ckpt.download(str(top_level.joinpath(ckpt.uuid)))
+    paths = determined.experimental.checkpoint.download_checkpoints(
+        checkpoints, str(top_level), max_workers=args.max_workers
+    )
+    for ckpt, path in zip(checkpoints, paths):
         if args.quiet:
             print(path)
         else:
@@ -1059,6 +1147,19 @@ main_cmd = Cmd(
                     cli.output_format_args["json"],
                     Arg("--outdir", type=Path, help="directory to save output"),
                 ),
+                Arg(
+                    "--format",
+                    dest="file_format",
+                    choices=["csv", "parquet"],
+                    default="csv",
+                    help="file format of tables saved with --outdir; parquet requires pyarrow",
+                ),
+                Arg(
+                    "--max-workers",
+                    type=int,
+                    default=8,
+                    help="maximum number of trials to fetch workloads for concurrently",
+                ),
             ],
         ),
         Cmd(
@@ -1275,6 +1376,12 @@ main_cmd = Cmd(
                     "example, 'accuracy' would require passing '--smaller-is-better false'. If "
                     "--sort-by is specified, this argument must be specified.",
                 ),
+                Arg(
+                    "--max-workers",
+                    type=int,
+                    default=4,
+                    help="The maximum number of checkpoints to download concurrently.",
+                ),
                 Arg(
                     "-q",
                     "--quiet",
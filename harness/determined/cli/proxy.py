@@ -15,8 +15,16 @@ from typing import Iterator, List, Optional, Union
 
 import lomond
 
+from determined.cli import _async_tunnel
 from determined.common.api import Session, authentication, bindings, request
 
+# Set to use a pair of threads for every forwarded connection, instead of an event loop.
+PROXY_THREADS_ENV = "DET_PROXY_THREADS"
+# Milliseconds to hold small reads from a forwarded connection for, to send fewer, larger messages.
+PROXY_COALESCE_MS_ENV = "DET_PROXY_COALESCE_MS"
+# Unbuffered reads return whatever is available, up to this much.
+_CHUNK_SIZE = 256 * 1024
+
 
 @dataclass
 class ListenerConfig:
@@ -35,21 +43,24 @@ class CustomSSLWebsocketSession(lomond.session.WebsocketSession):  # type: ignor
         self, socket: lomond.WebSocket, cert_file: Union[str, bool, None], cert_name: Optional[str]
     ) -> None:
         super().__init__(socket)
-        self.ctx = ssl.create_default_context()
+        self.ctx = _ssl_context(cert_file)
         self.cert_name = cert_name
-        if cert_file is False:
-            self.ctx.check_hostname = False
-            self.ctx.verify_mode = ssl.CERT_NONE
-            return
-
-        if cert_file is not None:
-            assert isinstance(cert_file, str)
-            self.ctx.load_verify_locations(cafile=cert_file)
 
     def _wrap_socket(self, sock: socket.SocketType, host: str) -> socket.SocketType:
         return self.ctx.wrap_socket(sock, server_hostname=self.cert_name or host)
 
 
+def _ssl_context(cert_file: Union[str, bool, None]) -> ssl.SSLContext:
+    ctx = ssl.create_default_context()
+    if cert_file is False:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    elif cert_file is not None:
+        assert isinstance(cert_file, str)
+        ctx.load_verify_locations(cafile=cert_file)
+    return ctx
+
+
 def copy_to_websocket(
     ws: lomond.WebSocket, f: io.RawIOBase, ready_sem: threading.Semaphore
 ) -> None:
@@ -57,7 +68,7 @@ def copy_to_websocket(
 
     try:
         while True:
-            chunk = f.read(4096)
+            chunk = f.read(_CHUNK_SIZE)
             if not chunk:
                 break
             ws.send_binary(chunk)
@@ -73,7 +84,7 @@ def copy_to_websocket2(
 
     try:
         while True:
-            chunk = f.recv(4096)
+            chunk = f.recv(_CHUNK_SIZE)
             if not chunk:
                 break
             ws.send_binary(chunk)
@@ -243,6 +254,30 @@ def http_tunnel_listener(
     cert_name: Optional[str],
     authorization_token: Optional[str] = None,
 ) -> Iterator[None]:
+    parsed_master = request.parse_master_address(master)
+    assert parsed_master.hostname is not None, "Failed to parse master address: {}".format(master)
+    proxies = {} if urllib.request.proxy_bypass(parsed_master.hostname) else None  # type: ignore
+    urls = [
+        request.maybe_upgrade_ws_scheme(request.make_url(master, f"proxy/{tunnel.service_id}/"))
+        for tunnel in tunnels
+    ]
+    if not os.environ.get(PROXY_THREADS_ENV) and all(
+        _async_tunnel.supports(url, proxies) for url in urls
+    ):
+        headers = []
+        if authorization_token is not None:
+            headers.append((b"Authorization", f"Bearer {authorization_token}".encode()))
+        with _async_tunnel.tunnel_listener(
+            [(tunnel.local_addr, tunnel.local_port, url) for tunnel, url in zip(tunnels, urls)],
+            proxies,
+            headers,
+            _ssl_context(cert_file),
+            cert_name,
+            coalesce_delay=float(os.environ.get(PROXY_COALESCE_MS_ENV, 0)) / 1000,
+        ):
+            yield
+        return
+
     servers = [
         _http_tunnel_listener(master, tunnel, cert_file, cert_name, authorization_token)
         for tunnel in tunnels
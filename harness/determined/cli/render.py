@@ -12,6 +12,7 @@ For example, the following two lines of pseudocode return similar objects:
 """
 import csv
 import inspect
+import itertools
 import json
 import os
 import pathlib
@@ -24,6 +25,7 @@ import tabulate
 import termcolor
 
 from determined import util as det_util
+from determined.cli import errors
 from determined.common import util
 from determined.experimental import Model, Project
 
@@ -170,6 +172,85 @@ def tabulate_or_csv(
         )
 
 
+def stream_table(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    as_csv: bool,
+    outfile: Optional[pathlib.Path] = None,
+    file_format: str = "csv",
+    column_types: Optional[Sequence[type]] = None,
+) -> None:
+    """
+    Like tabulate_or_csv, but consume rows lazily.
+
+    CSV and parquet output is written as rows arrive, so callers can produce rows from a generator
+    without holding the whole table in memory. Tabulated output still needs every row up front to
+    compute column widths. column_types is only used for parquet output; columns without a type
+    are written as strings.
+    """
+    if outfile and file_format == "parquet":
+        _write_parquet(headers, rows, outfile, column_types)
+        return
+
+    if not (as_csv or outfile):
+        tabulate_or_csv(headers, list(rows), as_csv)
+        return
+
+    out = outfile.open("w", newline="") if outfile else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    finally:
+        if outfile:
+            out.close()
+
+
+_PARQUET_BATCH_SIZE = 4096
+
+
+def _write_parquet(
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    outfile: pathlib.Path,
+    column_types: Optional[Sequence[type]],
+) -> None:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise errors.CliError(f"pyarrow is required to write parquet files: {e}")
+
+    types = list(column_types or [])
+    types += [str] * (len(headers) - len(types))
+    arrow_types = {int: pyarrow.int64(), float: pyarrow.float64(), bool: pyarrow.bool_()}
+    schema = pyarrow.schema(
+        [(name, arrow_types.get(typ, pyarrow.string())) for name, typ in zip(headers, types)]
+    )
+
+    def coerce(value: Any, typ: type) -> Any:
+        if value is None:
+            return None
+        if typ not in arrow_types:
+            return str(value)
+        try:
+            return typ(value)
+        except (TypeError, ValueError):
+            return None
+
+    rows = iter(rows)
+    with pyarrow.parquet.ParquetWriter(str(outfile), schema) as writer:
+        while True:
+            batch = list(itertools.islice(rows, _PARQUET_BATCH_SIZE))
+            if not batch:
+                break
+            columns = [
+                pyarrow.array([coerce(row[i], typ) for row in batch], type=field.type)
+                for i, (typ, field) in enumerate(zip(types, schema))
+            ]
+            writer.write_table(pyarrow.Table.from_arrays(columns, schema=schema))
+
+
 def yes_or_no(prompt: str) -> bool:
     """Get a yes or no answer from the CLI user."""
     yes = ("y", "yes")
@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional
 import requests
 import urllib3
 
+import determined.common.requests
 from determined.common import util
 from determined.common.api import authentication, certs, request
 
@@ -21,6 +22,7 @@ class Session:
         self._auth = auth
         self._cert = cert
         self._max_retries = max_retries
+        self._http_session: Optional[determined.common.requests.Session] = None
 
     def _do_request(
         self,
@@ -46,6 +48,7 @@ class Session:
             timeout=timeout,
             stream=stream,
             max_retries=self._max_retries,
+            session=self._http_session,
         )
 
     def get(
@@ -110,3 +113,38 @@ class Session:
             cert=self._cert,
             max_retries=retry,
         )
+
+    def with_connection_pool(self, maxsize: int) -> "Session":
+        """Return a copy of this session which reuses up to ``maxsize`` keep-alive connections.
+
+        Requests made through a plain Session each open a new connection to the master. The
+        pooled copy is meant for issuing many requests, possibly from several threads at once.
+        """
+
+        pooled = type(self)(
+            master=self._master,
+            user=self._user,
+            auth=self._auth,
+            cert=self._cert,
+            max_retries=self._max_retries,
+        )
+        # Match the server name do_request() would use for a non-pooled request.
+        cert = self._cert if self._cert is not None else certs.cli_cert
+        pooled._http_session = determined.common.requests.Session(
+            cert.name if cert else None,
+            self._max_retries,
+            pool_maxsize=maxsize,
+        )
+        return pooled
+
+    def close(self) -> None:
+        """Close the keep-alive connections of a session from with_connection_pool()."""
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
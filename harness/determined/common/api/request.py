@@ -98,6 +98,7 @@ def do_request(
     stream: bool = False,
     timeout: Optional[Union[Tuple, float]] = None,
     max_retries: Optional[urllib3.util.retry.Retry] = None,
+    session: Optional[requests.Session] = None,
 ) -> requests.Response:
     if headers is None:
         h: Dict[str, str] = {}
@@ -151,6 +152,7 @@ def do_request(
             timeout=timeout,
             server_hostname=cert.name if cert else None,
             max_retries=max_retries,
+            session=session,
         )
     except requests.exceptions.SSLError:
         raise
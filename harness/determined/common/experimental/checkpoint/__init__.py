@@ -4,4 +4,5 @@ from determined.common.experimental.checkpoint._checkpoint import (
     CheckpointSortBy,
     CheckpointState,
     DownloadMode,
+    download_checkpoints,
 )
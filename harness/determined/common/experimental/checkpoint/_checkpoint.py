@@ -1,13 +1,15 @@
+import concurrent.futures
 import dataclasses
 import enum
 import json
 import logging
+import os
 import pathlib
 import shutil
 import sys
 import tarfile
 import warnings
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from determined import errors
 from determined.common import api, constants, storage
@@ -220,28 +222,36 @@ class Checkpoint:
         else:
             local_ckpt_dir = pathlib.Path("checkpoints", self.uuid)
 
-        # Backward compatibility: we used MLflow's MLmodel checkpoint format for
-        # serializing pytorch models. We now use our own format that contains a
-        # metadata.json file. We are checking for checkpoint existence by
-        # looking for both checkpoint formats in the output directory.
-        potential_metadata_paths = [
-            local_ckpt_dir.joinpath(f) for f in ["metadata.json", "MLmodel"]
-        ]
-        if not any(p.exists() for p in potential_metadata_paths):
-            # If the target directory doesn't already appear to contain a
-            # checkpoint, attempt to fetch one.
+        # Files listed in the resources manifest which are already present locally with the
+        # expected size are not downloaded again, so an interrupted download can be resumed.
+        complete = self._complete_local_files(local_ckpt_dir)
+        if self.resources:
+            needs_download = any(f not in complete for f in self.resources if not f.endswith("/"))
+        else:
+            # Backward compatibility: we used MLflow's MLmodel checkpoint format for
+            # serializing pytorch models. We now use our own format that contains a
+            # metadata.json file. We are checking for checkpoint existence by
+            # looking for both checkpoint formats in the output directory.
+            potential_metadata_paths = [
+                local_ckpt_dir.joinpath(f) for f in ["metadata.json", "MLmodel"]
+            ]
+            needs_download = not any(p.exists() for p in potential_metadata_paths)
+
+        if needs_download:
+            # If the target directory doesn't already appear to contain the whole
+            # checkpoint, attempt to fetch it.
             if self.training is None:
                 raise NotImplementedError("Non-training checkpoints cannot be downloaded")
 
             checkpoint_storage = self.training.experiment_config["checkpoint_storage"]
             if mode == DownloadMode.DIRECT:
-                self._download_direct(checkpoint_storage, local_ckpt_dir)
+                self._download_direct(checkpoint_storage, local_ckpt_dir, complete)
 
             elif mode == DownloadMode.MASTER:
                 self._download_via_master(self._session, self.uuid, local_ckpt_dir)
 
             elif mode == DownloadMode.AUTO:
-                self._download_auto(checkpoint_storage, local_ckpt_dir)
+                self._download_auto(checkpoint_storage, local_ckpt_dir, complete)
 
             else:
                 raise ValueError(f"Unknown download mode {mode}")
@@ -257,11 +267,27 @@ class Checkpoint:
 
         return str(local_ckpt_dir)
 
+    def _complete_local_files(self, local_ckpt_dir: pathlib.Path) -> Set[str]:
+        """Return the files of the resources manifest that exist locally with the expected size."""
+        complete = set()
+        for f, size in (self.resources or {}).items():
+            if f.endswith("/"):
+                continue
+            try:
+                if local_ckpt_dir.joinpath(f).stat().st_size == int(size):
+                    complete.add(f)
+            except OSError:
+                continue
+        return complete
+
     def _download_auto(
-        self, checkpoint_storage: Dict[str, Any], local_ckpt_dir: pathlib.Path
+        self,
+        checkpoint_storage: Dict[str, Any],
+        local_ckpt_dir: pathlib.Path,
+        complete: Optional[Set[str]] = None,
     ) -> None:
         try:
-            self._download_direct(checkpoint_storage, local_ckpt_dir)
+            self._download_direct(checkpoint_storage, local_ckpt_dir, complete)
 
         except (errors.NoDirectStorageAccess, FileNotFoundError):
             if checkpoint_storage["type"] == "azure":
@@ -277,23 +303,32 @@ class Checkpoint:
                     "but they both failed."
                 ) from e
 
-    def _shutil_copytree(self, src: str, dst: str) -> None:
+    def _shutil_copytree(self, src: str, dst: str, complete: Optional[Set[str]] = None) -> None:
+        def copy_function(src_file: str, dst_file: str) -> Any:
+            if complete and os.path.relpath(dst_file, dst) in complete:
+                return dst_file
+            return shutil.copy2(src_file, dst_file)
+
         # TODO: remove version check once we drop support for Python 3.7
         if sys.version_info.minor >= 8:
             shutil.copytree(
                 src,
                 dst,
+                copy_function=copy_function,
                 dirs_exist_ok=True,
             )  # type: ignore
         else:
             shutil.copytree(src, dst)
 
     def _download_direct(
-        self, checkpoint_storage: Dict[str, Any], local_ckpt_dir: pathlib.Path
+        self,
+        checkpoint_storage: Dict[str, Any],
+        local_ckpt_dir: pathlib.Path,
+        complete: Optional[Set[str]] = None,
     ) -> None:
         if checkpoint_storage["type"] == "shared_fs":
             src_ckpt_dir = self._find_shared_fs_path(checkpoint_storage)
-            self._shutil_copytree(str(src_ckpt_dir), str(local_ckpt_dir))
+            self._shutil_copytree(str(src_ckpt_dir), str(local_ckpt_dir), complete)
         elif checkpoint_storage["type"] == "directory":
             src_ckpt_dir = pathlib.Path(checkpoint_storage["container_path"], self.uuid)
             if not src_ckpt_dir.exists():
@@ -302,7 +337,7 @@ class Checkpoint:
                     "the same checkpoint storage directory present on the local machine as the "
                     "task runtime storage configuration.".format(self.uuid, src_ckpt_dir)
                 )
-            self._shutil_copytree(str(src_ckpt_dir), str(local_ckpt_dir))
+            self._shutil_copytree(str(src_ckpt_dir), str(local_ckpt_dir), complete)
         else:
             local_ckpt_dir.mkdir(parents=True, exist_ok=True)
             manager = storage.build(
@@ -323,7 +358,10 @@ class Checkpoint:
                     ", {} found instead".format(checkpoint_storage["type"])
                 )
 
-            manager.download(self.uuid, str(local_ckpt_dir))
+            skip = complete or set()
+            storage.cache.download(
+                manager, self.uuid, str(local_ckpt_dir), selector=lambda path: path not in skip
+            )
 
     @staticmethod
     def _download_via_master(sess: api.Session, uuid: str, local_ckpt_dir: pathlib.Path) -> None:
@@ -342,7 +380,14 @@ class Checkpoint:
             )
         # gunzip and untar. tarfile.open can detect the compression algorithm
         with tarfile.open(fileobj=resp.raw) as tf:
-            tf.extractall(local_ckpt_dir)
+            for member in tf:
+                # The master always streams the whole checkpoint, but files which are already
+                # present with the right size are not rewritten.
+                local_path = local_ckpt_dir.joinpath(member.name)
+                if member.isfile() and local_path.is_file():
+                    if local_path.stat().st_size == member.size:
+                        continue
+                tf.extract(member, local_ckpt_dir)
 
     def write_metadata_file(self, path: str) -> None:
         """
@@ -502,6 +547,41 @@ class Checkpoint:
         return ckpt
 
 
+def download_checkpoints(
+    checkpoints: Iterable[Checkpoint],
+    path: Optional[str] = None,
+    mode: DownloadMode = DownloadMode.AUTO,
+    max_workers: int = 4,
+) -> List[str]:
+    """
+    Download several checkpoints to local storage concurrently.
+
+    Like :meth:`Checkpoint.download`, files which are already present locally with the size
+    recorded in a checkpoint's ``resources`` are skipped, so an interrupted call can be repeated to
+    resume the downloads.
+
+    Arguments:
+        checkpoints (Iterable[Checkpoint]): The checkpoints to download.
+        path (string, optional): Top level directory to place the checkpoints under. Each
+            checkpoint is downloaded to ``<path>/<checkpoint_uuid>``. Defaults to
+            ``checkpoints``, relative to the current working directory.
+        mode (DownloadMode, optional): Governs how each checkpoint is downloaded. Defaults to
+            ``AUTO``.
+        max_workers (int, optional): The maximum number of checkpoints to download at once.
+            Defaults to 4.
+
+    Returns:
+        The local paths of the downloaded checkpoints, in the same order as ``checkpoints``.
+    """
+    top_level = pathlib.Path(path if path is not None else "checkpoints")
+
+    def download_one(ckpt: Checkpoint) -> str:
+        return ckpt.download(str(top_level.joinpath(ckpt.uuid)), mode=mode)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(download_one, checkpoints))
+
+
 def _metadata_update_request(
     uuid: str, metadata: Dict[str, Any]
 ) -> bindings.v1PostCheckpointMetadataRequest:
@@ -6,7 +6,7 @@ import time
 import warnings
 from typing import Any, Dict, Iterator, List, Optional, Set, Union
 
-from determined.common import api
+from determined.common import api, util
 from determined.common.api import bindings
 from determined.common.experimental import checkpoint, trial, workspace
 
@@ -37,6 +37,14 @@ class ExperimentState(enum.Enum):
         return bindings.experimentv1State(self.value)
 
 
+_FINAL_STATES = (
+    ExperimentState.COMPLETED,
+    ExperimentState.CANCELED,
+    ExperimentState.DELETED,
+    ExperimentState.ERROR,
+)
+
+
 class ExperimentSortBy(enum.Enum):
     ID = bindings.v1GetExperimentsRequestSortBy.ID
     DESCRIPTION = bindings.v1GetExperimentsRequestSortBy.DESCRIPTION
@@ -331,20 +339,63 @@ class Experiment:
             for t in r.trials:
                 yield trial.Trial._from_bindings(t, self._session)
 
-    def await_first_trial(self, interval: float = 0.1) -> trial.Trial:
+    def metrics_frame(
+        self,
+        group: str,
+        columns: Optional[List[str]] = None,
+        as_arrow: bool = False,
+        trials_per_request: int = 100,
+    ) -> Any:
+        """Fetch the metrics of every trial of this experiment as a single table.
+
+        Unlike iterating over :meth:`Trial.iter_metrics` for each trial, this streams the metrics of
+        many trials per request and collects them column by column, which is much faster and uses
+        much less memory for experiments with many trials or long metric histories.
+
+        The table has one row per metric report, with the columns ``trial_id``, ``trial_run_id``,
+        ``steps_completed`` and ``end_time`` (in UTC), followed by one column per metric. Reports
+        which do not include a metric hold ``NaN`` for it.
+
+        Requires ``pandas``, or ``pyarrow`` if ``as_arrow`` is set.
+
+        Arguments:
+            group: The metric group to fetch.  Common values are "validation" and "training",
+                but group can be any value passed to master when reporting metrics during training
+                (usually via a context's `report_metrics`).
+            columns: The metric names to include. Defaults to every metric found in the reports.
+            as_arrow: Return a ``pyarrow.Table`` instead of a ``pandas.DataFrame``.
+            trials_per_request: How many trials to request metrics for at once.
+
+        Returns:
+            A ``pandas.DataFrame``, or a ``pyarrow.Table`` if ``as_arrow`` is set.
+        """
+        trial_ids = [t.id for t in self.iter_trials()]
+        cols = trial._trials_metrics_columns(
+            self._session, trial_ids, group, columns, trials_per_request
+        )
+        return trial._metrics_frame(cols, as_arrow)
+
+    def await_first_trial(self, interval: float = 0.1, max_interval: float = 5.0) -> trial.Trial:
         """
         Wait for the first trial to be started for this experiment.
+
+        Arguments:
+            interval (float, optional): The initial interval in seconds between checks for a trial.
+            max_interval (float, optional): The interval between checks backs off exponentially
+                up to this many seconds.
         """
+        delays = util.backoff_intervals(interval, max(interval, max_interval))
         while True:
             resp = bindings.get_GetExperimentTrials(
                 self._session,
                 experimentId=self._id,
+                limit=1,
                 orderBy=bindings.v1OrderBy.ASC,
                 sortBy=bindings.v1GetExperimentTrialsRequestSortBy.START_TIME,
             )
             if len(resp.trials) > 0:
                 return trial.Trial._from_bindings(resp.trials[0], self._session)
-            time.sleep(interval)
+            time.sleep(next(delays))
 
     def kill(self) -> None:
         bindings.post_KillExperiment(self._session, id=self._id)
@@ -375,23 +426,25 @@ class Experiment:
         self.project_id = proj.id
         self.workspace_id = proj.workspace_id
 
-    def wait(self, interval: float = 5.0) -> ExperimentState:
+    def wait(self, interval: float = 5.0, max_interval: float = 60.0) -> ExperimentState:
         """
         Wait for the experiment to reach a complete or terminal state.
 
+        To wait on many experiments at once, use
+        :func:`~determined.experimental.client.wait_any` or
+        :func:`~determined.experimental.client.wait_all` instead.
+
         Arguments:
-            interval (int, optional): An interval time in seconds before checking
-                next experiment state.
+            interval (float, optional): The initial interval in seconds between checks of the
+                experiment state.
+            max_interval (float, optional): The interval between checks backs off exponentially
+                up to this many seconds.
         """
-        elapsed_time = 0.0
+        delays = util.backoff_intervals(interval, max(interval, max_interval))
+        start = last_report = time.time()
         while True:
             self.reload()
-            if self.state in (
-                ExperimentState.COMPLETED,
-                ExperimentState.CANCELED,
-                ExperimentState.DELETED,
-                ExperimentState.ERROR,
-            ):
+            if self.state in _FINAL_STATES:
                 return self.state
             elif self.state == ExperimentState.PAUSED:
                 raise ValueError(
@@ -399,12 +452,13 @@ class Experiment:
                 )
             else:
                 # ACTIVE, STOPPING_COMPLETED, etc.
-                time.sleep(interval)
-                elapsed_time += interval
-                if elapsed_time % 60 == 0:
+                time.sleep(next(delays))
+                now = time.time()
+                if now - last_report >= 60:
+                    last_report = now
                     print(
                         f"Waiting for Experiment {self.id} to complete. "
-                        f"Elapsed {elapsed_time / 60} minutes",
+                        f"Elapsed {(now - start) / 60:.1f} minutes",
                         file=sys.stderr,
                     )
 
@@ -627,6 +681,94 @@ class Experiment:
         return exp
 
 
+def _wait_for(
+    experiments: List[Experiment], count: int, interval: float, max_interval: float
+) -> List[Experiment]:
+    pending = {e.id: e for e in experiments}
+    done: List[Experiment] = []
+    if not pending:
+        return done
+    # The same experiment may be passed more than once, but it only finishes once.
+    count = min(count, len(pending))
+    session = experiments[0]._session
+    # Only ask for experiments which have stopped, so responses stay small no matter how many
+    # experiments are still running.
+    states = [s._to_bindings() for s in _FINAL_STATES + (ExperimentState.PAUSED,)]
+    delays = util.backoff_intervals(interval, max(interval, max_interval))
+    while True:
+        resp = bindings.get_GetExperiments(
+            session, experimentIdFilter_incl=list(pending), states=states, limit=-1
+        )
+        for exp_bindings in resp.experiments:
+            exp = pending.pop(exp_bindings.id, None)
+            if exp is None:
+                continue
+            exp._hydrate(exp_bindings)
+            if exp.state == ExperimentState.PAUSED:
+                raise ValueError(
+                    f"Experiment {exp.id} is in paused state. Make sure the experiment is active."
+                )
+            done.append(exp)
+        if len(done) >= count:
+            return done
+        # A deleted or nonexistent experiment never shows up as stopped, so check that the rest
+        # still exist, as Experiment.wait() would by failing to reload them.
+        _check_experiments_exist(session, list(pending))
+        time.sleep(next(delays))
+
+
+def _check_experiments_exist(session: api.Session, experiment_ids: List[int]) -> None:
+    # Counting the matches is cheap; only list them when some are missing.
+    resp = bindings.get_GetExperiments(session, experimentIdFilter_incl=experiment_ids, limit=-2)
+    if resp.pagination.total == len(experiment_ids):
+        return
+    resp = bindings.get_GetExperiments(session, experimentIdFilter_incl=experiment_ids, limit=-1)
+    missing = sorted(set(experiment_ids) - {e.id for e in resp.experiments})
+    if missing:
+        raise api.errors.NotFoundException(f"experiments not found: {missing}")
+
+
+def wait_any(
+    experiments: List[Experiment], interval: float = 5.0, max_interval: float = 60.0
+) -> List[Experiment]:
+    """
+    Wait for at least one of several experiments to reach a complete or terminal state.
+
+    Every check polls the master for all of the experiments with a single request, so this is much
+    cheaper than calling :meth:`Experiment.wait` on each experiment from its own thread. All of the
+    experiments must belong to the same master.
+
+    Arguments:
+        experiments: The experiments to wait on.
+        interval (float, optional): The initial interval in seconds between checks.
+        max_interval (float, optional): The interval between checks backs off exponentially
+            up to this many seconds.
+
+    Returns:
+        The experiments which have finished, whose ``state`` holds their final state.
+
+    Raises:
+        errors.NotFoundException: If any of the experiments does not exist, or is deleted while
+            waiting.
+    """
+    return _wait_for(experiments, 1, interval, max_interval)
+
+
+def wait_all(
+    experiments: List[Experiment], interval: float = 5.0, max_interval: float = 60.0
+) -> List[Experiment]:
+    """
+    Wait for all of several experiments to reach a complete or terminal state.
+
+    See :func:`~determined.experimental.client.wait_any` for details.
+
+    Returns:
+        The experiments in the order they were found to be finished, whose ``state`` holds their
+        final state.
+    """
+    return _wait_for(experiments, len(experiments), interval, max_interval)
+
+
 class ExperimentReference(Experiment):
     """A legacy class representing an Experiment object.
 
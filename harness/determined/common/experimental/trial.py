@@ -1,8 +1,13 @@
+import array
 import datetime
 import enum
 import inspect
+import json
+import math
 import warnings
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import requests
 
 from determined.common import api, util
 from determined.common.api import bindings, logs
@@ -589,6 +594,138 @@ def _stream_trials_metrics(
             yield metrics.TrialMetrics._from_bindings(m, group=group)
 
 
+class _MetricsColumns:
+    """
+    Accumulate metric reports column by column.
+
+    Numeric columns are kept in typed arrays rather than lists of Python objects, so that collecting
+    millions of reports costs a handful of bytes per value. A metric column which receives a
+    non-numeric value falls back to holding arbitrary objects.
+    """
+
+    def __init__(self, names: Optional[Sequence[str]]) -> None:
+        self._fixed = names is not None
+        self._len = 0
+        self.trial_id = array.array("q")
+        self.trial_run_id = array.array("q")
+        self.steps_completed = array.array("q")
+        # Timestamps are parsed all at once by numpy when the columns are finished.
+        self.end_time: List[str] = []
+        self.metrics: Dict[str, Union["array.array[float]", List[Any]]] = {
+            name: array.array("d") for name in names or []
+        }
+
+    def append(self, report: Dict[str, Any], key: str) -> None:
+        self.trial_id.append(int(report["trialId"]))
+        self.trial_run_id.append(int(report["trialRunId"]))
+        self.steps_completed.append(int(report["totalBatches"]))
+        self.end_time.append(report["endTime"].rstrip("Z"))
+
+        for name, value in (report["metrics"].get(key) or {}).items():
+            col = self.metrics.get(name)
+            if col is None:
+                if self._fixed:
+                    continue
+                # Backfill the reports which came before this metric first appeared.
+                col = self.metrics[name] = array.array("d", [math.nan]) * self._len
+            if isinstance(col, array.array):
+                if isinstance(value, (int, float)):
+                    col.append(value)
+                    continue
+                if value is None:
+                    col.append(math.nan)
+                    continue
+                # Missing values are None, rather than NaN, in a column of objects.
+                col = self.metrics[name] = [None if math.isnan(v) else v for v in col]
+            col.append(value)
+
+        self._len += 1
+        for col in self.metrics.values():
+            if len(col) == self._len:
+                continue
+            if isinstance(col, array.array):
+                col.append(math.nan)
+            else:
+                col.append(None)
+
+    def finish(self) -> Dict[str, Any]:
+        import numpy as np
+
+        out: Dict[str, Any] = {
+            "trial_id": np.frombuffer(self.trial_id, dtype=np.int64),
+            "trial_run_id": np.frombuffer(self.trial_run_id, dtype=np.int64),
+            "steps_completed": np.frombuffer(self.steps_completed, dtype=np.int64),
+            "end_time": np.array(self.end_time, dtype="datetime64[ns]"),
+        }
+        for name, col in self.metrics.items():
+            if isinstance(col, array.array):
+                out[name] = np.frombuffer(col, dtype=np.float64)
+            else:
+                out[name] = np.array(col, dtype=object)
+        return out
+
+
+def _trials_metrics_columns(
+    session: api.Session,
+    trial_ids: Sequence[int],
+    group: str,
+    columns: Optional[Sequence[str]] = None,
+    trials_per_request: int = 100,
+) -> Dict[str, Any]:
+    """
+    Collect metrics for many trials into a dict of numpy arrays.
+
+    This reads the same stream as ``bindings.get_GetMetrics``, but appends each report straight
+    from the decoded json into the columns, without building binding or TrialMetrics objects along
+    the way. Trials are requested ``trials_per_request`` at a time to bound the size of each
+    request.
+    """
+    key = "validation_metrics" if group == util._LEGACY_VALIDATION else "avg_metrics"
+    cols = _MetricsColumns(columns)
+    for start in range(0, len(trial_ids), trials_per_request):
+        resp = session._do_request(
+            method="GET",
+            path="/api/v1/trials/metrics/trial_metrics",
+            params={"group": group, "trialIds": trial_ids[start : start + trials_per_request]},
+            json=None,
+            data=None,
+            headers=None,
+            timeout=None,
+            stream=True,
+        )
+        if resp.status_code != 200:
+            raise bindings.APIHttpError("get_GetMetrics", resp)
+        try:
+            for line in resp.iter_lines(chunk_size=1024 * 1024):
+                j = json.loads(line)
+                if "error" in j:
+                    raise bindings.APIHttpStreamError(
+                        "get_GetMetrics", bindings.runtimeStreamError.from_json(j["error"])
+                    )
+                for report in j["result"]["metrics"]:
+                    cols.append(report, key)
+        except requests.exceptions.ChunkedEncodingError:
+            raise bindings.APIHttpStreamError(
+                "get_GetMetrics", bindings.runtimeStreamError(message="ChunkedEncodingError")
+            )
+    return cols.finish()
+
+
+def _metrics_frame(columns: Dict[str, Any], as_arrow: bool) -> Any:
+    if as_arrow:
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError("pyarrow is required to return metrics as an Arrow table") from e
+        return pyarrow.table(columns)
+
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError("pandas is required to return metrics as a DataFrame") from e
+    return pandas.DataFrame(columns)
+
+
 def _stream_training_metrics(
     session: api.Session, trial_ids: List[int]
 ) -> Iterable[metrics.TrainingMetrics]:
@@ -23,20 +23,36 @@ class HTTPAdapter(requests.adapters.HTTPAdapter):
 
 class Session(requests.sessions.Session):
     def __init__(
-        self, server_hostname: Optional[str], max_retries: Optional[urllib3.util.retry.Retry]
+        self,
+        server_hostname: Optional[str],
+        max_retries: Optional[urllib3.util.retry.Retry],
+        pool_maxsize: int = requests.adapters.DEFAULT_POOLSIZE,
     ) -> None:
         super().__init__()
         if max_retries is None:
             # Override the https adapter.
-            self.mount("https://", HTTPAdapter(server_hostname))
+            self.mount("https://", HTTPAdapter(server_hostname, pool_maxsize=pool_maxsize))
+            self.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize))
         else:
-            self.mount("https://", HTTPAdapter(server_hostname, max_retries=max_retries))
-            self.mount("http://", requests.adapters.HTTPAdapter(max_retries=max_retries))
+            self.mount(
+                "https://",
+                HTTPAdapter(server_hostname, max_retries=max_retries, pool_maxsize=pool_maxsize),
+            )
+            self.mount(
+                "http://",
+                requests.adapters.HTTPAdapter(max_retries=max_retries, pool_maxsize=pool_maxsize),
+            )
 
 
 def request(method: str, url: str, **kwargs: Any) -> requests.Response:
     server_hostname = kwargs.pop("server_hostname", None)
     max_retries = kwargs.pop("max_retries", None)
-    with Session(server_hostname, max_retries) as session:
+    # A caller-provided session keeps its connections alive across requests; its adapters were
+    # already configured with a server_hostname and max_retries when it was created.
+    session = kwargs.pop("session", None)
+    if session is not None:
         out = session.request(method=method, url=url, **kwargs)  # type: requests.Response
         return out
+    with Session(server_hostname, max_retries) as session:
+        out = session.request(method=method, url=url, **kwargs)
+        return out
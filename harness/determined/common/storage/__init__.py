@@ -9,9 +9,11 @@ from determined.common.storage.gcs import GCSStorageManager
 from determined.common.storage.s3 import S3StorageManager
 from determined.common.storage.shared import SharedFSStorageManager
 from determined.common.storage.directory import DirectoryStorageManager
+from determined.common.storage.cache import CheckpointCache
 
 __all__ = [
     "AzureStorageManager",
+    "CheckpointCache",
     "DirectoryStorageManager",
     "GCSStorageManager",
     "S3StorageManager",
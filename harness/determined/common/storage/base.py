@@ -1,4 +1,5 @@
 import abc
+import concurrent.futures
 import contextlib
 import copy
 import glob
@@ -140,6 +141,26 @@ class StorageManager(metaclass=abc.ABCMeta):
         """
         pass
 
+    def delete_many(
+        self, tgts: List[str], globs: List[str], max_workers: int = 1
+    ) -> Dict[str, Union[Dict[str, int], Exception]]:
+        """
+        Delete several stored checkpoints, as delete() would each one, running up to max_workers
+        deletes at once.
+
+        Returns, for each target, either the resources left after applying globs or the exception
+        that deleting it raised, so that one failed checkpoint neither stops nor hides the rest.
+        """
+
+        def delete_one(tgt: str) -> Union[Dict[str, int], Exception]:
+            try:
+                return self.delete(tgt, globs)
+            except Exception as e:
+                return e
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(tgts, executor.map(delete_one, tgts)))
+
     @staticmethod
     def _list_directory(root: Union[str, os.PathLike]) -> Dict[str, int]:
         """
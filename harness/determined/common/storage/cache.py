@@ -0,0 +1,261 @@
+"""
+An on-disk cache of checkpoint files which is shared by every process on a host.
+
+Warm-starting many trials from the same checkpoint on one node would otherwise download the same
+files from cloud storage once per trial. The cache is opt-in: set DET_CHECKPOINT_CACHE_DIR to a
+directory to enable it, and optionally DET_CHECKPOINT_CACHE_MAX_BYTES to bound its size (10 GiB by
+default).
+
+Files are keyed by checkpoint UUID and path within the checkpoint. Cached files are served by
+hardlinking them into the destination directory, falling back to a copy when that is not possible
+(for example, across filesystems). Every process coordinates through file locks, new files are moved
+into place with an atomic rename, and a file is only served if its content still matches the sha256
+digest recorded when it was cached, so a file modified in place through a hardlink is downloaded
+again instead of being served. Verifying a hit reads the cached file once, which is still far
+cheaper than fetching it from cloud storage.
+"""
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional, Set, Union
+
+import filelock
+
+from determined import util
+from determined.common.storage import base
+
+logger = logging.getLogger("determined.common.storage")
+
+CACHE_DIR_ENV = "DET_CHECKPOINT_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "DET_CHECKPOINT_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 10 * 1024**3
+
+_DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+def _digest(path: pathlib.Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_DIGEST_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class CheckpointCache:
+    """
+    A size-bounded, least-recently-used cache of checkpoint files.
+
+    The index of cached files is a json file guarded by a file lock. Downloads of the same
+    checkpoint are serialized by a second, per-checkpoint lock, so concurrent readers wait for one
+    download instead of all fetching the same files.
+    """
+
+    def __init__(self, cache_dir: Union[str, os.PathLike], max_bytes: int = DEFAULT_MAX_BYTES):
+        self._dir = pathlib.Path(cache_dir)
+        self._max_bytes = max_bytes
+        self._files_dir = self._dir.joinpath("files")
+        self._staging_dir = self._dir.joinpath("staging")
+        self._locks_dir = self._dir.joinpath("locks")
+        for d in (self._files_dir, self._staging_dir, self._locks_dir):
+            d.mkdir(parents=True, exist_ok=True)
+        self._index_path = self._dir.joinpath("index.json")
+        self._index_lock = filelock.FileLock(str(self._dir.joinpath("index.lock")))
+
+    @classmethod
+    def from_env(cls) -> Optional["CheckpointCache"]:
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+        if not cache_dir:
+            return None
+        max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+        return cls(cache_dir, max_bytes)
+
+    def download(
+        self,
+        manager: base.StorageManager,
+        src: str,
+        dst: Union[str, os.PathLike],
+        selector: Optional[base.Selector] = None,
+    ) -> None:
+        """
+        Like ``manager.download(src, dst, selector)``, but serve files from the cache where
+        possible and add newly downloaded files to the cache.
+        """
+        dst = pathlib.Path(dst)
+
+        # The selector may be expensive (restore_path coordinates every call across workers), so
+        # call it at most once per path.
+        selected: Dict[str, bool] = {}
+
+        def select(path: str) -> bool:
+            if selector is None:
+                return True
+            if path not in selected:
+                selected[path] = selector(path)
+            return selected[path]
+
+        with filelock.FileLock(str(self._locks_dir.joinpath(f"{src.replace('/', '_')}.lock"))):
+            with self._index_lock:
+                index = self._read_index()
+            # Hash outside of the index lock, so downloads of other checkpoints aren't held up.
+            # Nothing replaces this checkpoint's files meanwhile, since we hold its lock.
+            cached = self._valid_files(index, src, verify_content=True)
+            entry = index.get(src)
+            complete = bool(entry and entry["complete"] and cached == set(entry["files"]))
+
+            if not complete:
+
+                def want(path: str) -> bool:
+                    return (path.endswith("/") or path not in cached) and select(path)
+
+                staging = tempfile.mkdtemp(dir=self._staging_dir)
+                try:
+                    manager.download(src, staging, want)
+                    with self._index_lock:
+                        index = self._read_index()
+                        self._insert(index, src, pathlib.Path(staging), complete=selector is None)
+                        self._write_index(index)
+                finally:
+                    util.rmtree_nfs_safe(staging, ignore_errors=True)
+
+            with self._index_lock:
+                index = self._read_index()
+                self._link(index, src, dst, select)
+                # Evict only after linking, so that a checkpoint larger than the whole budget is
+                # still served once.
+                self._evict(index)
+                self._write_index(index)
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with self._index_path.open() as f:
+                index = json.load(f)
+                assert isinstance(index, dict)
+                return index
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self._dir, prefix="index.json.")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, self._index_path)
+
+    def _valid_files(
+        self, index: Dict[str, Any], src: str, verify_content: bool = False
+    ) -> Set[str]:
+        """
+        Return the cached files of a checkpoint which are still intact.
+
+        Without verify_content, only each file's size and modification time are checked, which
+        catches files evicted or replaced since they were verified.
+        """
+        entry = index.get(src)
+        if not entry:
+            return set()
+        valid = set()
+        for path, meta in entry["files"].items():
+            cached = self._files_dir.joinpath(src, path)
+            try:
+                st = cached.stat()
+                if st.st_size != meta["size"] or st.st_mtime_ns != meta["mtime_ns"]:
+                    continue
+                if verify_content and _digest(cached) != meta.get("sha256"):
+                    logger.debug(f"{src}/{path} was modified in the checkpoint cache")
+                    continue
+            except OSError:
+                continue
+            valid.add(path)
+        return valid
+
+    def _insert(
+        self, index: Dict[str, Any], src: str, staging: pathlib.Path, complete: bool
+    ) -> None:
+        entry = index.setdefault(src, {"complete": False, "dirs": [], "files": {}})
+        dirs = set(entry["dirs"])
+        now = time.time()
+        for path, size in base.StorageManager._list_directory(staging).items():
+            target = self._files_dir.joinpath(src, path)
+            if path.endswith("/"):
+                dirs.add(path)
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staging.joinpath(path), target)
+            entry["files"][path] = {
+                "size": size,
+                "mtime_ns": target.stat().st_mtime_ns,
+                "sha256": _digest(target),
+                "last_used": now,
+            }
+        entry["dirs"] = sorted(dirs)
+        entry["complete"] = entry["complete"] or complete
+
+    def _link(
+        self,
+        index: Dict[str, Any],
+        src: str,
+        dst: pathlib.Path,
+        selector: base.Selector,
+    ) -> None:
+        entry = index.get(src, {"dirs": [], "files": {}})
+        valid = self._valid_files(index, src)
+        dst.mkdir(parents=True, exist_ok=True)
+        for path in entry["dirs"]:
+            if selector(path):
+                dst.joinpath(path).mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        for path, meta in entry["files"].items():
+            if path not in valid or not selector(path):
+                continue
+            cached = self._files_dir.joinpath(src, path)
+            target = dst.joinpath(path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                target.unlink()
+            try:
+                os.link(cached, target)
+            except OSError:
+                shutil.copy2(cached, target)
+            meta["last_used"] = now
+
+    def _evict(self, index: Dict[str, Any]) -> None:
+        files = [
+            (meta["last_used"], src, path, meta["size"])
+            for src, entry in index.items()
+            for path, meta in entry["files"].items()
+        ]
+        total = sum(f[3] for f in files)
+        for _, src, path, size in sorted(files):
+            if total <= self._max_bytes:
+                break
+            logger.debug(f"evicting {src}/{path} from the checkpoint cache")
+            try:
+                self._files_dir.joinpath(src, path).unlink()
+            except FileNotFoundError:
+                pass
+            entry = index[src]
+            del entry["files"][path]
+            entry["complete"] = False
+            if not entry["files"]:
+                del index[src]
+                util.rmtree_nfs_safe(self._files_dir.joinpath(src), ignore_errors=True)
+            total -= size
+
+
+def download(
+    manager: base.StorageManager,
+    src: str,
+    dst: Union[str, os.PathLike],
+    selector: Optional[base.Selector] = None,
+) -> None:
+    """Download through the checkpoint cache configured by the environment, if there is one."""
+    cache = CheckpointCache.from_env()
+    if cache is None:
+        manager.download(src, dst, selector)
+    else:
+        cache.download(manager, src, dst, selector)
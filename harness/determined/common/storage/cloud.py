@@ -5,6 +5,7 @@ from typing import Iterator, Optional, Union
 
 from determined import util
 from determined.common import storage
+from determined.common.storage import cache
 
 
 class CloudStorageManager(storage.StorageManager):
@@ -15,7 +16,7 @@ class CloudStorageManager(storage.StorageManager):
         dst = os.path.join(self._base_path, src)
         os.makedirs(dst, exist_ok=True)
 
-        self.download(src, dst, selector)
+        cache.download(self, src, dst, selector)
 
         try:
             yield pathlib.Path(dst)
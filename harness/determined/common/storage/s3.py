@@ -1,8 +1,9 @@
+import concurrent.futures
 import logging
 import os
 import re
 import tempfile
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import requests
 
@@ -150,12 +151,19 @@ class S3StorageManager(storage.CloudStorageManager):
         if not found:
             raise errors.CheckpointNotFound(f"Did not find {prefix} in S3")
 
-    @util.preserve_random_state
-    def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
-        prefix = self.get_storage_prefix(tgt)
-        logger.info(f"Deleting {prefix} from S3")
+    def _plan_delete(self, tgt: str, globs: List[str]) -> Tuple[List[str], Dict[str, int]]:
+        """
+        List the objects of tgt, and return the keys to delete and the resources that globs keep.
 
-        objects = {obj.key: obj.size for obj in self.bucket.objects.filter(Prefix=prefix)}
+        This uses the S3 client, which unlike the bucket resource is safe to share between threads.
+        """
+        prefix = self.get_storage_prefix(tgt)
+        paginator = self.s3.meta.client.get_paginator("list_objects")
+        objects = {
+            obj["Key"]: obj["Size"]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        }
 
         resources = {}
         if "**/*" not in globs:  # Partial delete case.
@@ -165,9 +173,71 @@ class S3StorageManager(storage.CloudStorageManager):
                     resources[obj.replace(f"{prefix}/", "")] = objects[obj]
                     del objects[obj]
 
+        return list(objects), resources
+
+    @util.preserve_random_state
+    def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
+        logger.info(f"Deleting {self.get_storage_prefix(tgt)} from S3")
+        keys, resources = self._plan_delete(tgt, globs)
+
         # S3 delete_objects has a limit of 1000 objects.
-        for chunk in util.chunks([{"Key": o} for o in objects], 1000):
+        for chunk in util.chunks([{"Key": k} for k in keys], 1000):
             logger.debug(f"Deleting {len(chunk)} objects from S3")
             self.bucket.delete_objects(Delete={"Objects": chunk})
 
         return resources
+
+    @util.preserve_random_state
+    def delete_many(
+        self, tgts: List[str], globs: List[str], max_workers: int = 1
+    ) -> Dict[str, Union[Dict[str, int], Exception]]:
+        """
+        Like StorageManager.delete_many(), but the objects of all the targets are deleted together,
+        1000 per request, instead of in at least one request per target.
+        """
+        logger.info(f"Deleting {len(tgts)} checkpoints from S3")
+        client = self.s3.meta.client
+        results: Dict[str, Union[Dict[str, int], Exception]] = {}
+        key_to_tgt: Dict[str, str] = {}
+
+        def plan(tgt: str) -> Union[Tuple[List[str], Dict[str, int]], Exception]:
+            try:
+                return self._plan_delete(tgt, globs)
+            except Exception as e:
+                return e
+
+        def delete_chunk(keys: Sequence[str]) -> Union[List[Dict[str, Any]], Exception]:
+            logger.debug(f"Deleting {len(keys)} objects from S3")
+            try:
+                response = client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": k} for k in keys], "Quiet": True},
+                )
+            except Exception as e:
+                return e
+            failed: List[Dict[str, Any]] = response.get("Errors", [])
+            return failed
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for tgt, planned in zip(tgts, executor.map(plan, tgts)):
+                if isinstance(planned, Exception):
+                    results[tgt] = planned
+                    continue
+                keys, results[tgt] = planned
+                key_to_tgt.update((k, tgt) for k in keys)
+
+            # S3 delete_objects has a limit of 1000 objects.
+            chunks = list(util.chunks(list(key_to_tgt), 1000))
+            for chunk, outcome in zip(chunks, executor.map(delete_chunk, chunks)):
+                if isinstance(outcome, Exception):
+                    for tgt in {key_to_tgt[k] for k in chunk}:
+                        results[tgt] = outcome
+                    continue
+                for error in outcome:
+                    key = error["Key"]
+                    results[key_to_tgt[key]] = Exception(
+                        f"Failed to delete s3://{self.bucket_name}/{key}: "
+                        f"{error.get('Code')}: {error.get('Message')}"
+                    )
+
+        return results
@@ -330,6 +330,18 @@ def wait_for(
     return rv
 
 
+def backoff_intervals(initial: float, maximum: float, factor: float = 2.0) -> Iterator[float]:
+    """
+    Yield an endless sequence of polling intervals which grow exponentially from ``initial`` up to
+    ``maximum``. Each interval is jittered down by up to half of its length, so that many clients
+    polling the master do not fall into lockstep.
+    """
+    interval = initial
+    while True:
+        yield random.uniform(interval / 2, interval)
+        interval = min(interval * factor, maximum)
+
+
 U = TypeVar("U", bound=Callable[..., Any])
 
 
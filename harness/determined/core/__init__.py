@@ -4,6 +4,7 @@ from determined.core._checkpoint import (
     CheckpointContext,
     DownloadMode,
     DummyCheckpointContext,
+    _ShardStream,
 )
 from determined.core._train import (
     TrainContext,
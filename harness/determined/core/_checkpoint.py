@@ -1,3 +1,4 @@
+import concurrent.futures
 import contextlib
 import datetime
 import enum
@@ -9,7 +10,7 @@ import pathlib
 import uuid
 from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from determined import core, tensorboard
+from determined import _trace, core, tensorboard
 from determined.common import api, storage
 from determined.common.api import bindings
 
@@ -168,6 +169,75 @@ def merge_resources(
     return merged, conflicts
 
 
+class _ShardStream:
+    """
+    Upload a rank's files of a sharded checkpoint from a background thread as soon as the rank has
+    finished writing each one, so that writing its next file overlaps with uploading the last.
+
+    Files are uploaded one at a time, in the order they are submitted. Submitting does nothing
+    unless CheckpointContext._store_path_streaming() has started the stream, which it does not for
+    storage that is written in place, like shared_fs.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._futures: List["concurrent.futures.Future[None]"] = []
+        self._resources: Dict[str, int] = {}
+
+    def _start(
+        self, storage_manager: storage.StorageManager, ckpt_dir: pathlib.Path, storage_id: str
+    ) -> None:
+        self._storage_manager = storage_manager
+        self._ckpt_dir = ckpt_dir
+        self._storage_id = storage_id
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint-stream"
+        )
+
+    def submit(self, path: Union[str, os.PathLike]) -> None:
+        """Upload a file in the checkpoint directory, which must not change afterwards."""
+        if self._executor is None:
+            return
+        name = os.path.relpath(path, self._ckpt_dir)
+        if name.startswith(os.pardir):
+            raise ValueError(f"{path} is not in the checkpoint directory {self._ckpt_dir}")
+        if name in self._resources:
+            return
+
+        # Upload each parent directory along with the first file in it.
+        paths = {name}
+        parent = os.path.dirname(name)
+        while parent and parent + "/" not in self._resources:
+            paths.add(parent + "/")
+            parent = os.path.dirname(parent)
+        for p in paths:
+            self._resources[p] = 0 if p.endswith("/") else os.path.getsize(path)
+        self._futures.append(self._executor.submit(self._upload, paths))
+
+    def _upload(self, paths: Set[str]) -> None:
+        with _trace.span("checkpoint_stream_upload", "checkpoint"):
+            self._storage_manager.upload(src=self._ckpt_dir, dst=self._storage_id, paths=paths)
+
+    def _wait(self) -> Dict[str, int]:
+        """Wait for every upload, raising the first error, and return the resources uploaded."""
+        if self._executor is None:
+            return {}
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._close()
+        return self._resources
+
+    def _close(self) -> None:
+        """Cancel the uploads which have not started, and wait for the rest."""
+        if self._executor is None:
+            return
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown()
+
+
 class CheckpointContext:
     """
     ``CheckpointContext`` gives access to checkpoint-related features of a Determined cluster.
@@ -273,7 +343,8 @@ class CheckpointContext:
             resources = {key: resources[key] for key in resources if selector(key)}
             paths = set(resources)
 
-        self._storage_manager.upload(src=ckpt_dir, dst=storage_id, paths=paths)
+        with _trace.span("checkpoint_upload", "checkpoint"):
+            self._storage_manager.upload(src=ckpt_dir, dst=storage_id, paths=paths)
         self._report_checkpoint(storage_id, resources, metadata)
         return storage_id
 
@@ -341,7 +412,8 @@ class CheckpointContext:
         if want_upload:
             assert ckpt_dir
             paths = set(resources.keys())
-            self._storage_manager.upload(src=ckpt_dir, dst=storage_id, paths=paths)
+            with _trace.span("checkpoint_upload", "checkpoint"):
+                self._storage_manager.upload(src=ckpt_dir, dst=storage_id, paths=paths)
 
         # Synchronize workers.
         _ = self._dist.allgather(None)
@@ -520,11 +592,25 @@ class CheckpointContext:
             yield path, storage_id
             self._write_metadata_file(os.fspath(path), metadata or {})
             resources = self._storage_manager._list_directory(path)
+            # Cloud storage managers upload when store_path() exits.
+            upload_start = _trace.now()
+        _trace.complete("checkpoint_upload", upload_start, "checkpoint")
 
         self._report_checkpoint(storage_id, resources, metadata)
 
+    @contextlib.contextmanager
+    def _store_path_streaming(
+        self, metadata: Optional[Dict[str, Any]], stream: _ShardStream
+    ) -> Iterator[Tuple[pathlib.Path, str]]:
+        """
+        Like ``store_path(shard=True)``, but each worker may also submit files to ``stream`` as
+        soon as it has finished writing them, to be uploaded while it writes the rest. Streamed
+        files are left out of the upload when the context manager exits.
+        """
+        return self._store_path_sharded(metadata, stream)
+
     def _store_path_sharded(
-        self, metadata: Optional[Dict[str, Any]] = None
+        self, metadata: Optional[Dict[str, Any]] = None, stream: Optional[_ShardStream] = None
     ) -> Iterator[Tuple[pathlib.Path, str]]:
         logger.debug(f"Getting path for sharded storage (metadata={metadata})")
         storage_id = None
@@ -534,9 +620,17 @@ class CheckpointContext:
         assert storage_id
 
         path = self._storage_manager.pre_store_path(storage_id)
-        yield path, storage_id
+        if stream is not None and not self._storage_manager.store_path_is_direct_access():
+            stream._start(self._storage_manager, path, storage_id)
+        try:
+            yield path, storage_id
+        except BaseException:
+            if stream is not None:
+                stream._close()
+            raise
 
         ckpt_dir = os.fspath(path)
+        streamed = stream._wait() if stream is not None else {}
 
         if self._storage_manager.store_path_is_direct_access():
             # Each rank saves files directly to ckpt_dir which means there is no conflict
@@ -559,12 +653,20 @@ class CheckpointContext:
         # Decide if our rank is the lowest rank trying to upload this ckpt_dir.
         want_upload = all_file_uids.index(file_uid) == self._dist.rank
 
-        # Decide what we are going to upload.
+        # Decide what we are going to upload.  Every worker has already uploaded its own streamed
+        # files, which may be in a directory shared with other workers.
+        all_streamed = {
+            name
+            for names in self._dist.allgather([n for n in streamed if not n.endswith("/")])
+            for name in names
+        }
         if want_upload:
             assert ckpt_dir
             resources = self._storage_manager._list_directory(ckpt_dir)
+            resources = {k: v for k, v in resources.items() if k not in all_streamed}
         else:
             resources = {}
+        resources.update(streamed)
 
         # Merge resources, detect conflicts.
         all_resources = self._dist.allgather(resources)
@@ -572,13 +674,21 @@ class CheckpointContext:
         merged_resources, conflicts = merge_resources(all_resources)
         self._resolve_conflicts(resources, conflicts, ckpt_dir)
 
+        # Leave streamed files out of the final upload.  Merging metadata below synchronizes
+        # workers, so they are all gone before any worker uploads.
+        for name in streamed:
+            if not name.endswith("/"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(ckpt_dir, name))
+
         all_metadata = self._merge_metadata(metadata)
         if self._dist.rank == 0:
             self._write_metadata_file(ckpt_dir, all_metadata)
 
         if want_upload:
             # Use post_store_path to upload and clean up ckpt_dir after uploading.
-            self._storage_manager.post_store_path(src=ckpt_dir, dst=storage_id)
+            with _trace.span("checkpoint_upload", "checkpoint"):
+                self._storage_manager.post_store_path(src=ckpt_dir, dst=storage_id)
 
         if self._dist.rank == 0:
             self._report_checkpoint(storage_id, merged_resources, all_metadata)
@@ -4,7 +4,7 @@ import pathlib
 from typing import Any, Callable, Dict, List, Optional, Set
 
 import determined as det
-from determined import core, tensorboard
+from determined import _trace, core, tensorboard
 from determined.common import api, util
 from determined.common.api import bindings, errors
 
@@ -96,7 +96,10 @@ class TrainContext:
             trialRunId=self._run_id,
         )
         body = bindings.v1ReportTrialMetricsRequest(metrics=v1TrialMetrics, group=group)
-        bindings.post_ReportTrialMetrics(self._session, body=body, metrics_trialId=self._trial_id)
+        with _trace.span("report_metrics", "metrics"):
+            bindings.post_ReportTrialMetrics(
+                self._session, body=body, metrics_trialId=self._trial_id
+            )
 
         # Also sync tensorboard (all metrics, not just json-serializable ones).
         if self._tensorboard_mode == core.TensorboardMode.AUTO:
@@ -6,7 +6,7 @@ import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import urllib3
 
@@ -17,6 +17,9 @@ from determined.common.api import bindings, certs
 
 logger = logging.getLogger("determined")
 
+# How many checkpoints to update per request to the master.
+PATCH_BATCH_SIZE = 1000
+
 
 def patch_checkpoints(storage_ids_to_resources: Dict[str, Dict[str, int]]) -> None:
     info = det.ClusterInfo._from_file()
@@ -47,31 +50,49 @@ def patch_checkpoints(storage_ids_to_resources: Dict[str, Dict[str, int]]) -> No
             )
         )
 
-    bindings.patch_PatchCheckpoints(
-        sess, body=bindings.v1PatchCheckpointsRequest(checkpoints=checkpoints)
-    )
+    for batch in util.chunks(checkpoints, PATCH_BATCH_SIZE):
+        logger.info(f"Updating {len(batch)} checkpoints on the master")
+        bindings.patch_PatchCheckpoints(
+            sess, body=bindings.v1PatchCheckpointsRequest(checkpoints=list(batch))
+        )
 
 
 def delete_checkpoints(
-    manager: storage.StorageManager, to_delete: List[str], globs: List[str], dry_run: bool
-) -> Dict[str, Dict[str, int]]:
+    manager: storage.StorageManager,
+    to_delete: List[str],
+    globs: List[str],
+    dry_run: bool,
+    max_workers: int = 1,
+) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Exception]]:
     """
-    Delete some of the checkpoints associated with a single experiment.
+    Delete some of the checkpoints associated with a single experiment, up to max_workers at once.
+
+    Returns the remaining resources of each deleted checkpoint, and the error of each checkpoint
+    which could not be deleted.
     """
     logger.info(f"Deleting {len(to_delete)} checkpoints")
 
     storage_id_to_resources: Dict[str, Dict[str, int]] = {}
-    for storage_id in to_delete:
-        if not dry_run:
-            logger.info(f"Deleting checkpoint {storage_id}")
-            try:
-                storage_id_to_resources[storage_id] = manager.delete(storage_id, globs)
-            except errors.CheckpointNotFound as e:
-                logger.warn(e)
-        else:
+    storage_id_to_error: Dict[str, Exception] = {}
+    if dry_run:
+        for storage_id in to_delete:
             logger.info(f"Dry run: deleting checkpoint {storage_id}")
+        return storage_id_to_resources, storage_id_to_error
+
+    for storage_id, result in manager.delete_many(to_delete, globs, max_workers).items():
+        if isinstance(result, errors.CheckpointNotFound):
+            logger.warn(result)
+        elif isinstance(result, Exception):
+            logger.error(f"Failed to delete checkpoint {storage_id}: {result}")
+            storage_id_to_error[storage_id] = result
+        else:
+            storage_id_to_resources[storage_id] = result
 
-    return storage_id_to_resources
+    logger.info(
+        f"Deleted {len(storage_id_to_resources)} checkpoints, failed to delete "
+        f"{len(storage_id_to_error)}"
+    )
+    return storage_id_to_resources, storage_id_to_error
 
 
 def delete_tensorboards(manager: tensorboard.TensorboardManager, dry_run: bool = False) -> None:
@@ -133,6 +154,12 @@ def main(argv: List[str]) -> None:
         default=os.getenv("DET_DELETE_TENSORBOARDS", False),
         help="Delete Tensorboards from storage",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(os.getenv("DET_GC_MAX_WORKERS", 16)),
+        help="How many checkpoints to delete at once",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -158,10 +185,16 @@ def main(argv: List[str]) -> None:
     manager = storage.build(storage_config, container_path=constants.SHARED_FS_CONTAINER_PATH)
 
     if len(storage_ids) > 0:
-        storage_ids_to_resources = delete_checkpoints(
-            manager, storage_ids, globs, dry_run=args.dry_run
+        storage_ids_to_resources, storage_ids_to_errors = delete_checkpoints(
+            manager, storage_ids, globs, dry_run=args.dry_run, max_workers=args.max_workers
         )
+        # Record the checkpoints which were deleted even if others failed.
         patch_checkpoints(storage_ids_to_resources)
+        if storage_ids_to_errors:
+            raise Exception(
+                f"Failed to delete {len(storage_ids_to_errors)} of {len(storage_ids)} checkpoints: "
+                + ", ".join(sorted(storage_ids_to_errors))
+            )
 
     if args.delete_tensorboards:
         tb_manager = tensorboard.build(
@@ -1,15 +1,20 @@
 import argparse
 import base64
+import hashlib
 import io
 import json
 import logging
 import os
+import pathlib
+import shutil
 import socket
 import tarfile
+import tempfile
 import uuid
 import warnings
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import filelock
 import psutil
 import urllib3
 
@@ -26,19 +31,129 @@ def is_trial(info: det.ClusterInfo) -> bool:
     return info.task_type == "TRIAL"
 
 
+CONTEXT_CACHE_DIR_ENV = "DET_CONTEXT_CACHE_DIR"
+# A multiple of 4, so that every chunk of a base64 string decodes on its own.
+_B64_CHUNK_SIZE = 64 * 1024
+
+
+class _Base64Reader(io.RawIOBase):
+    """A file object which decodes a base64 string as it is read, instead of all at once."""
+
+    def __init__(self, b64: str) -> None:
+        self._b64 = b64
+        self._pos = 0
+        self._buf = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        while not self._buf and self._pos < len(self._b64):
+            chunk = self._b64[self._pos : self._pos + _B64_CHUNK_SIZE]
+            self._pos += len(chunk)
+            self._buf = memoryview(base64.b64decode(chunk))
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+def _context_key(b64_tgz: str) -> str:
+    h = hashlib.sha256()
+    for i in range(0, len(b64_tgz), _B64_CHUNK_SIZE):
+        h.update(b64_tgz[i : i + _B64_CHUNK_SIZE].encode("ascii"))
+    return h.hexdigest()
+
+
+def _extract_context(b64_tgz: str, path: pathlib.Path) -> None:
+    """Decode, decompress, and extract the context tarball in a single streaming pass."""
+    with tarfile.open(fileobj=_Base64Reader(b64_tgz), mode="r|gz") as context_directory:
+        for member in context_directory:
+            # Ensure all members of the tarball resolve to subdirectories.
+            if os.path.relpath(member.name).startswith("../"):
+                raise ValueError(f"'{member.name}' in tarball would expand to a parent directory")
+            context_directory.extract(member, path=path)
+
+
+def _walk_files(tree: pathlib.Path) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield each directory under tree, relative to tree, with the files and symlinks directly in it.
+    """
+    for root, dirs, files in os.walk(tree):
+        # os.walk lists symlinks to directories with the directories, but doesn't descend into them.
+        links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+        yield os.path.relpath(root, tree), files + links
+
+
+def _copy_tree(src: pathlib.Path, dst: pathlib.Path) -> None:
+    """Copy everything under src into dst, recreating symlinks as extracting the context would."""
+    for subdir, names in _walk_files(src):
+        dst.joinpath(subdir).mkdir(parents=True, exist_ok=True)
+        for name in names:
+            source = src.joinpath(subdir, name)
+            target = dst.joinpath(subdir, name)
+            if target.is_symlink() or target.is_file():
+                target.unlink()
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+            else:
+                shutil.copy2(source, target)
+
+
+def _file_stats(tree: pathlib.Path) -> Dict[str, List[int]]:
+    stats = {}
+    for subdir, names in _walk_files(tree):
+        for name in names:
+            st = os.lstat(tree.joinpath(subdir, name))
+            stats[os.path.normpath(os.path.join(subdir, name))] = [st.st_size, st.st_mtime_ns]
+    return stats
+
+
+def _cached_context(b64_tgz: str, cache_dir: pathlib.Path, dsts: List[pathlib.Path]) -> None:
+    """
+    Populate every dst from a per-node cache of extracted context directories, keyed by the
+    content hash of the context, extracting the context into the cache only on a miss.
+
+    Each dst gets its own copy of the cached tree, so tasks can't modify files other tasks use. The
+    size and modification time of every cached file are recorded, and a tree which doesn't match,
+    like one left half-extracted by a task that died, is extracted again.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = _context_key(b64_tgz)
+    tree = cache_dir.joinpath(key)
+    manifest = cache_dir.joinpath(f"{key}.json")
+    with filelock.FileLock(str(cache_dir.joinpath(f"{key}.lock"))):
+        try:
+            hit = json.loads(manifest.read_text()) == _file_stats(tree)
+        except (FileNotFoundError, json.JSONDecodeError):
+            hit = False
+        if hit:
+            logger.debug(f"using cached context directory {tree}")
+        else:
+            det.util.rmtree_nfs_safe(tree, ignore_errors=True)
+            _extract_context(b64_tgz, tree)
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, prefix=f".{key}.json.")
+            with os.fdopen(fd, "w") as f:
+                json.dump(_file_stats(tree), f)
+            os.replace(tmp, manifest)
+        for dst in dsts:
+            _copy_tree(tree, dst)
+
+
 def download_context_directory(sess: api.Session, info: det.ClusterInfo) -> None:
     b64_tgz = bindings.get_GetTaskContextDirectory(sess, taskId=info.task_id).b64Tgz
     if len(b64_tgz) == 0:
         return  # Non trials can have empty model defs.
 
-    tgz = base64.b64decode(b64_tgz)
-    with tarfile.open(fileobj=io.BytesIO(tgz), mode="r:gz") as context_directory:
-        # Ensure all members of the tarball resolve to subdirectories.
-        for path in context_directory.getnames():
-            if os.path.relpath(path).startswith("../"):
-                raise ValueError(f"'{path}' in tarball would expand to a parent directory")
-        context_directory.extractall(path=constants.MANAGED_TRAINING_MODEL_COPY)
-        context_directory.extractall(path=".")
+    model_copy = pathlib.Path(constants.MANAGED_TRAINING_MODEL_COPY)
+    cache_dir = os.environ.get(CONTEXT_CACHE_DIR_ENV)
+    if cache_dir:
+        _cached_context(b64_tgz, pathlib.Path(cache_dir), [model_copy, pathlib.Path(".")])
+    else:
+        # The working directory gets its own copy, so that writes to it can't change the model copy
+        # which checkpoints are built from.
+        _extract_context(b64_tgz, model_copy)
+        _copy_tree(model_copy, pathlib.Path("."))
 
     # pre-0.18.3 code wrote tensorboard stuff under /tmp/tensorboard
     if is_trial(info):
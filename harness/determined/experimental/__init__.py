@@ -1,4 +1,6 @@
+import importlib
 import warnings
+from typing import TYPE_CHECKING, Any
 
 with warnings.catch_warnings(record=True):
     from determined.common.experimental import (
@@ -24,6 +26,15 @@ with warnings.catch_warnings(record=True):
         model,
     )
 
-from determined.experimental._native import test_one_batch
-
 from determined.experimental import client
+
+# test_one_batch is imported on first access, since it needs the training loops and the SDK does
+# not.
+if TYPE_CHECKING:
+    from determined.experimental._native import test_one_batch
+else:
+
+    def __getattr__(name: str) -> Any:
+        if name == "test_one_batch":
+            return importlib.import_module("determined.experimental._native").test_one_batch
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
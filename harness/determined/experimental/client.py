@@ -65,6 +65,8 @@ from determined.common.experimental.experiment import (  # noqa: F401
     ExperimentOrderBy,
     ExperimentSortBy,
     ExperimentState,
+    wait_all,
+    wait_any,
 )
 from determined.common.experimental.metrics import TrainingMetrics, TrialMetrics, ValidationMetrics
 from determined.common.experimental.model import Model, ModelOrderBy, ModelSortBy  # noqa: F401
@@ -261,6 +261,30 @@ def read_pid_server_addr(addr: str) -> Union[str, int, Tuple[str, int]]:
     )
 
 
+# How often PIDServer checks on pids which it cannot watch with a pidfd.
+_PID_POLL_PERIOD = 1.0
+
+# Selector data for the pidfds of worker processes, and for file descriptors which only wake
+# PIDServer.run() up to run its health check.
+_PIDFD = "pidfd"
+_WAKEUP = "wakeup"
+
+
+def _pidfd_open(pid: int) -> Optional[int]:
+    """
+    Return a file descriptor which becomes readable when pid exits, or None where pidfds are
+    unsupported (before Linux 5.3 or Python 3.9, or on other platforms) or pid is already gone.
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        pidfd: int = pidfd_open(pid)
+        return pidfd
+    except OSError:
+        return None
+
+
 class PIDServer:
     """
     PIDServer tracks PIDs reported by a set of pid_clients which connect to it.
@@ -269,6 +293,10 @@ class PIDServer:
     exited, or it will raise an exception if any pids disappear without reporting a graceful
     shutdown.
 
+    Failures are detected as they happen: a pid_client's connection closing without a graceful
+    shutdown, or, on Linux, the pidfd of its pid becoming readable, wakes the server immediately.
+    Only pids which cannot be watched with a pidfd are polled.
+
     PIDServer lets an sshd-based launch layer keep track of its worker processes, even when the
     worker processes aren't proper child processes.
     """
@@ -285,6 +313,11 @@ class PIDServer:
         self.graceful_shutdowns = []  # type: List[int]
         # maps a connection to its pid
         self.conns = {}  # type: Dict[socket.socket, int]
+        # maps a pidfd to its pid
+        self.pidfds = {}  # type: Dict[int, int]
+        # pids which could not be watched with a pidfd, and so are polled
+        self.polled_pids = []  # type: List[int]
+        self.wakeup_fds = []  # type: List[int]
 
         self.done_accepting = False
 
@@ -321,6 +354,10 @@ class PIDServer:
         if self.listener:
             self.listener.close()
             self.listener = None
+        for fd in list(self.pidfds) + self.wakeup_fds:
+            os.close(fd)
+        self.pidfds = {}
+        self.wakeup_fds = []
         if self.sel:
             self.sel.close()
             self.sel = None
@@ -352,6 +389,13 @@ class PIDServer:
             pid = int(pid_buf)
             self.pids.append(pid)
             self.conns[conn] = pid
+            # Watch the pid itself too, in case its connection was inherited by another process.
+            pidfd = _pidfd_open(pid)
+            if pidfd is not None:
+                self.pidfds[pidfd] = pid
+                self.sel.register(pidfd, selectors.EVENT_READ, _PIDFD)
+            else:
+                self.polled_pids.append(pid)
             # Now listen for this connection to gracefully shut down (eventually)
             conn.setblocking(False)
             self.sel.register(conn, selectors.EVENT_READ)
@@ -398,13 +442,29 @@ class PIDServer:
         conn.close()
         del self.conns[conn]
 
+        if pid not in self.graceful_shutdowns:
+            raise det.errors.WorkerError("Detected that worker process died.")
+
+    def handle_pidfd(self, pidfd: int) -> None:
+        """
+        Handle a pidfd becoming readable, which means that its process exited.
+        """
+        assert self.sel
+        pid = self.pidfds.pop(pidfd)
+        self.sel.unregister(pidfd)
+        os.close(pidfd)
+        if pid not in self.graceful_shutdowns:
+            raise det.errors.WorkerError("Detected that worker process died.")
+
     def check_pids(self) -> None:
         """
         Any PIDs which exited without a graceful exit message indicates a crashed worker.
+
+        Only the PIDs without a pidfd are checked here; handle_pidfd() notices the others.
         """
         import psutil
 
-        for pid in self.pids:
+        for pid in self.polled_pids:
             if pid not in self.graceful_shutdowns:
                 pid_ok = False
                 try:
@@ -419,21 +479,39 @@ class PIDServer:
                 if not pid_ok:
                     raise det.errors.WorkerError("Detected that worker process died.")
 
-    def run(self, health_check: Optional[Callable] = None, poll_period: float = 1) -> None:
+    def run(
+        self, health_check: Optional[Callable] = None, poll_period: Optional[float] = 1
+    ) -> None:
+        """
+        The health check runs after every batch of events, and at least every poll_period seconds,
+        or only after events if poll_period is None.
+        """
         assert self.sel, "must start first"
         # Continue waiting until all workers have connected and subsequently exited gracefully.
         while self.listener or len(self.graceful_shutdowns) < self.num_clients:
+            timeout = poll_period
+            if self.polled_pids:
+                timeout = _PID_POLL_PERIOD if timeout is None else min(timeout, _PID_POLL_PERIOD)
             # Get some read events.
-            for key, mask in self.sel.select(timeout=poll_period):
+            exited = []
+            for key, mask in self.sel.select(timeout=timeout):
                 if key.fileobj == self.listener:
                     self.handle_listener(mask)
                 elif key.fileobj in self.conns:
                     conn = key.fileobj
                     assert isinstance(conn, socket.socket)
                     self.handle_conn(conn, mask)
-                else:
+                elif key.data == _PIDFD:
+                    assert isinstance(key.fileobj, int)
+                    exited.append(key.fileobj)
+                elif key.data != _WAKEUP:
                     raise AssertionError(f"unexpected key from select(): {key}")
 
+            # Handle exits after messages, so a graceful shutdown sent just before exiting counts.
+            for pidfd in exited:
+                if pidfd in self.pidfds:
+                    self.handle_pidfd(pidfd)
+
             self.check_pids()
 
             # Otherwise, run the externally-provided health check.
@@ -460,9 +538,18 @@ class PIDServer:
             if ret is not None:
                 raise HealthCheckFail(ret)
 
+        # Wake up when p exits, so the health check need not poll for it.
+        poll_period: Optional[float] = 1
+        pidfd = _pidfd_open(p.pid)
+        if pidfd is not None:
+            assert self.sel, "must start first"
+            self.wakeup_fds.append(pidfd)
+            self.sel.register(pidfd, selectors.EVENT_READ, _WAKEUP)
+            poll_period = None
+
         with det.util.forward_signals(p, signal_children=signal_children):
             try:
-                self.run(health_check)
+                self.run(health_check, poll_period)
             except HealthCheckFail as e:
                 return e.exit_code or 77
             except det.errors.WorkerError:
@@ -1,3 +1,4 @@
+import functools
 import inspect
 import json
 import logging
@@ -7,7 +8,7 @@ import random
 import sys
 import time
 from abc import abstractmethod
-from typing import Any, Dict, List, Optional, Tuple, Type, cast
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Type, cast
 
 import h5py
 import numpy as np
@@ -66,6 +67,13 @@ def is_tf2_enabled() -> bool:
         return tf.python.tf2.enabled()  # type: ignore
 
 
+@functools.lru_cache(maxsize=None)
+def _hvd_allreduce_params() -> Mapping[str, inspect.Parameter]:
+    # The signature of our horovod allreduce changed after we rebased onto 0.21. Inspecting it is
+    # slow enough to show up on every step, so only do it once.
+    return inspect.signature(hvd.allreduce).parameters
+
+
 def load_optimizer_weights(
     model: Model, h5group: Any, optimizer: tf.keras.optimizers.Optimizer
 ) -> None:
@@ -812,31 +820,57 @@ class TFKerasTrialController(det.TrialController):
         self.multiplexer._corrected_train_end()
         raise det.errors.WorkerFinishedGracefully()
 
-    def _allreduce_logs(self, logs: Dict) -> Dict:
-        if not (self.context.distributed.size > 1):
-            return logs
+    def _allreduce_logs(self, logs: Dict, counts: List[int]) -> Tuple[Dict, List[int]]:
+        """
+        Average logs and sum counts across workers.
+
+        Scalar logs and counts are packed into one float64 tensor and reduced with a single
+        allreduce, rather than one small collective per key; the few non-scalar logs Keras may
+        report are still reduced one at a time.
+        """
         # Reduce logs in key-sorted to be deterministic across workers.
         keys = sorted(logs)
         logger.debug(f"all-reducing logs on worker {hvd.rank()} for {len(keys)} keys {keys}.")
-        return {
-            key: np.array(self._hvd_allreduce(logs[key], average=True, name=key)) for key in keys
+        values = {key: self._convert_possible_tensor(logs[key]) for key in keys}
+        scalar_keys = [key for key in keys if np.ndim(values[key]) == 0]
+
+        # Averaging count * size across workers yields the sum of the counts.
+        size = self.context.distributed.size
+        packed = np.array(
+            [values[key] for key in scalar_keys] + [count * size for count in counts],
+            dtype=np.float64,
+        )
+        reduced = np.array([], dtype=np.float64)
+        if len(packed):
+            reduced = np.asarray(
+                self._convert_possible_tensor(
+                    self._hvd_allreduce(packed, average=True, name="fused_logs")
+                )
+            )
+
+        out = {
+            key: np.array(reduced[i], dtype=np.asarray(values[key]).dtype)
+            for i, key in enumerate(scalar_keys)
         }
+        for key in keys:
+            if key not in out:
+                out[key] = np.array(self._hvd_allreduce(values[key], average=True, name=key))
+        reduced_counts = [int(round(c)) for c in reduced[len(scalar_keys) :]]
+        return {key: out[key] for key in keys}, reduced_counts
 
     def _hvd_allreduce(self, value: Any, average: bool, name: str) -> Any:
-        # The signature of our horovod allreduce changed after we rebased onto 0.21.
-        hvd_sig = inspect.signature(hvd.allreduce)
         horovod_kwargs = {
             "value": value,
             "name": name,
         }  # type: Dict[str, Any]
 
-        if "op" in hvd_sig.parameters:
+        if "op" in _hvd_allreduce_params():
             horovod_kwargs["op"] = hvd.Average if average else hvd.Sum
 
             # average has not yet been removed but it's deprecated. It defaults
             # to true and horovod does not support specifying an op while having
             # average be not None.
-            if "average" in hvd_sig.parameters:
+            if "average" in _hvd_allreduce_params():
                 horovod_kwargs["average"] = None
         else:
             horovod_kwargs["average"] = average
@@ -870,17 +904,17 @@ class TFKerasTrialController(det.TrialController):
                 "issue at github.com/determined-ai/determined so we can fix this bug."
             )
 
-        if self.context.distributed.size > 1:
-            self.train_workload_inputs = self._hvd_allreduce(
-                self.train_workload_inputs, average=False, name="train_num_inputs"
-            )
-            self.train_workload_inputs = self._convert_possible_tensor(self.train_workload_inputs)
-
         # Return only the latest metrics, which is the running average for all trained batches in
         # the step (Keras does not report individual logs, only running averages at any point).
         final_metrics = self.train_workload_metrics[-1]
-        if self.env.experiment_config.average_training_metrics_enabled():
-            final_metrics = self._allreduce_logs(final_metrics)
+        if self.context.distributed.size > 1:
+            # Sum the inputs and, if enabled, average the metrics in a single collective.
+            average_metrics = self.env.experiment_config.average_training_metrics_enabled()
+            reduced_metrics, (self.train_workload_inputs,) = self._allreduce_logs(
+                final_metrics if average_metrics else {}, [self.train_workload_inputs]
+            )
+            if average_metrics:
+                final_metrics = reduced_metrics
 
         self.multiplexer._train_workload_end(final_metrics)
         self._stop_training_check()
@@ -934,15 +968,9 @@ class TFKerasTrialController(det.TrialController):
             # workers complete evaluation at different speeds.
             _ = self.context.distributed.gather(None)
 
-            num_inputs = hvd.allreduce(num_inputs, average=False, name="validation_num_inputs")
-            if isinstance(num_inputs, EagerTensor):
-                # Horovod will promote an int to a tensor in eager mode.
-                num_inputs = num_inputs.numpy()
-            num_batches = hvd.allreduce(num_batches, average=False, name="validation_num_batches")
-            if isinstance(num_batches, EagerTensor):
-                num_batches = num_batches.numpy()
-
-        metrics = self._allreduce_logs(metrics)
+            metrics, (num_inputs, num_batches) = self._allreduce_logs(
+                metrics, [num_inputs, num_batches]
+            )
         check.gt(len(metrics), 0)
 
         self.multiplexer._test_end(metrics)
@@ -3,7 +3,7 @@ import logging
 import queue
 import threading
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from enum import Enum
 from types import TracebackType
 from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, cast
@@ -807,14 +807,65 @@ class MetricsBatcherThread(threading.Thread):
             self.send_queue.put(ShutdownMessage())
 
 
+class _MetricSeries:
+    """
+    The samples of one metric in preallocated columns: float64 timestamps (seconds since the
+    epoch), float64 values, and int64 batch indices.
+
+    The columns are reused from one flush to the next, so steady-state sampling allocates nothing
+    per sample; they only grow if a flush interval holds more samples than ever before.
+    """
+
+    INITIAL_CAPACITY = 128
+
+    def __init__(self) -> None:
+        # numpy is imported lazily to keep it out of `import determined`.
+        import numpy as np
+
+        self.timestamps = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self.values = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self.batches = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self.size = 0
+
+    def add(self, timestamp: float, batch_idx: int, value: float) -> None:
+        i = self.size
+        if i == len(self.values):
+            self._grow()
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.batches[i] = batch_idx
+        self.size = i + 1
+
+    def _grow(self) -> None:
+        import numpy as np
+
+        capacity = 2 * len(self.values)
+        for name in ("timestamps", "values", "batches"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+
+    def encode(self, labels: Dict[str, Any]) -> TrialProfilerMetricsBatch:
+        """Encode the samples for the API, converting all of the timestamps at once."""
+        import numpy as np
+
+        n = self.size
+        micros = np.rint(self.timestamps[:n] * 1e6).astype(np.int64).astype("datetime64[us]")
+        timestamps = np.datetime_as_string(micros, unit="us", timezone="UTC").tolist()
+        return TrialProfilerMetricsBatch(
+            self.values[:n].tolist(), self.batches[:n].tolist(), timestamps, labels
+        )
+
+
 class MetricBatch:
     def __init__(self, trial_id: str, agent_id: str) -> None:
         self.trial_id = trial_id
         self.agent_id = agent_id
-        self.batch = {}  # type: Dict[Tuple[MetricType, str, str], List[Measurement]]
+        self.batch = {}  # type: Dict[Tuple[MetricType, str, str], _MetricSeries]
 
     def isempty(self) -> bool:
-        return len(self.batch) == 0
+        return all(series.size == 0 for series in self.batch.values())
 
     def append(
         self,
@@ -823,38 +874,50 @@ class MetricBatch:
         measurement: Measurement,
         gpu_uuid: str = "",
     ) -> None:
-        if (metric_type, metric_name, gpu_uuid) not in self.batch.keys():
-            self.batch[(metric_type, metric_name, gpu_uuid)] = []
-        self.batch[(metric_type, metric_name, gpu_uuid)].append(measurement)
+        assert (
+            measurement.timestamp.tzinfo is not None
+        ), "All datetime objects to be serialized must be timezone aware"
+        self.add(
+            metric_type,
+            metric_name,
+            measurement.timestamp.timestamp(),
+            measurement.batch_idx,
+            measurement.measurement,
+            gpu_uuid,
+        )
+
+    def add(
+        self,
+        metric_type: MetricType,
+        metric_name: str,
+        timestamp: float,
+        batch_idx: int,
+        value: float,
+        gpu_uuid: str = "",
+    ) -> None:
+        """Record one sample, given its timestamp in seconds since the epoch."""
+        key = (metric_type, metric_name, gpu_uuid)
+        series = self.batch.get(key)
+        if series is None:
+            series = self.batch[key] = _MetricSeries()
+        series.add(timestamp, batch_idx, value)
 
     def consume(self) -> List[TrialProfilerMetricsBatch]:
         trial_profiler_metrics_batches = []
 
-        for (metric_type, metric_name, gpu_uuid), measurements in self.batch.items():
-            if len(measurements) > 0:
+        for (metric_type, metric_name, gpu_uuid), series in self.batch.items():
+            if series.size > 0:
                 labels = MetricBatch.make_labels(
                     metric_name, self.trial_id, self.agent_id, metric_type.value, gpu_uuid
                 )
-                batch = MetricBatch.to_post_format(measurements, labels)
-                trial_profiler_metrics_batches.append(batch)
+                trial_profiler_metrics_batches.append(series.encode(labels))
 
         self.clear()
         return trial_profiler_metrics_batches
 
     def clear(self) -> None:
-        for key in self.batch.keys():
-            self.batch[key] = []
-
-    @staticmethod
-    def to_post_format(
-        measurements: List[Measurement], labels: Dict[str, Any]
-    ) -> TrialProfilerMetricsBatch:
-        values, batches, timestamps = [], [], []
-        for m in measurements:
-            values.append(m.measurement)
-            batches.append(m.batch_idx)
-            timestamps.append(MetricBatch.convert_to_timestamp_str(m.timestamp))
-        return TrialProfilerMetricsBatch(values, batches, timestamps, labels)
+        for series in self.batch.values():
+            series.size = 0
 
     @staticmethod
     def make_labels(
@@ -868,24 +931,6 @@ class MetricBatch:
             "metricType": metric_type,
         }
 
-    @staticmethod
-    def convert_to_timestamp_str(timestamp: datetime) -> str:
-        """
-        Convert a datetime object to the string format expected by the API. All timestamps must be
-        timezone-aware datetime.datetimes in UTC.
-        """
-        # https://docs.python.org/3/library/datetime.html#determining-if-an-object-is-aware-or-naive
-        assert (
-            timestamp.tzinfo is not None and timestamp.tzinfo.utcoffset(timestamp) is not None
-        ), "All datetime objects to be serialized must be timezone aware"
-        utcoffset = cast(timedelta, timestamp.utcoffset())
-        assert utcoffset.total_seconds() == 0, (
-            f"All datetime objects to be serialized must be in UTC, but the utcoffset was "
-            f"{utcoffset.total_seconds()}"
-        )
-
-        return timestamp.isoformat()
-
 
 class ProfilerSenderThread(threading.Thread):
     """
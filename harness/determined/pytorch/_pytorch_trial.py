@@ -9,16 +9,18 @@ import random
 import sys
 import time
 import warnings
+import zipfile
 from abc import abstractmethod
 from inspect import signature
 from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, cast
 
 import numpy as np
 import torch
+from packaging import version
 from torch import distributed as dist
 
 import determined as det
-from determined import core, profiler, pytorch, tensorboard, util
+from determined import _trace, core, profiler, pytorch, tensorboard, util
 from determined.horovod import hvd
 
 logger = logging.getLogger("determined.pytorch")
@@ -34,13 +36,58 @@ except ImportError:  # pragma: no cover
 def dataloader_next(profiler: det.profiler.ProfilerAgent, dataloader_iter: Iterator) -> Iterator:
     while True:
         try:
-            with profiler.record_timing("dataloader_next", requires_sync=False):
+            with profiler.record_timing("dataloader_next", requires_sync=False), _trace.span(
+                "dataloader_next", "data"
+            ):
                 batch = next(dataloader_iter)
         except StopIteration:
             return
         yield batch
 
 
+def _load_state_file(path: pathlib.Path) -> Tuple[Any, bool]:
+    """
+    Load a checkpoint's state file to the CPU, and report whether it was memory-mapped.
+
+    Files in the zipfile format, which torch.save has written since torch 1.6, are memory-mapped on
+    torch 2.1 and later, so tensors are read from the file only as they are copied into the model
+    instead of all being read into host memory first.
+    """
+    if version.parse(torch.__version__) >= version.parse("2.1.0") and zipfile.is_zipfile(path):
+        return torch.load(str(path), map_location="cpu", mmap=True), True  # type: ignore
+    return torch.load(str(path), map_location="cpu"), False  # type: ignore
+
+
+def _tensors(obj: Any) -> Iterator[torch.Tensor]:
+    if isinstance(obj, torch.Tensor):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _tensors(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _tensors(value)
+
+
+def _copy_mapped_optimizer_state(
+    checkpoint: Dict[str, Any], optimizers: List[torch.optim.Optimizer]
+) -> None:
+    """
+    Optimizers keep loaded state tensors that already have the right device and dtype, which would
+    leave them reading from a memory-mapped checkpoint file for the rest of training, so copy them.
+    """
+    loaded = {
+        id(t)
+        for key in ("optimizer_state_dict", "optimizers_state_dict")
+        for t in _tensors(checkpoint.get(key))
+    }
+    for optimizer in optimizers:
+        for state in optimizer.state.values():
+            for key, value in state.items():
+                if id(value) in loaded:
+                    state[key] = value.clone()
+
+
 class TrainUnit:
     """
     TrainUnit is the base class for the supported training units (Batch, Epoch) containing
@@ -323,22 +370,25 @@ class _PyTorchTrialController:
 
     def _aggregate_training_metrics(self, training_metrics: List[Dict]) -> Dict:
         # Aggregate and reduce training metrics from all the training processes.
-        if self.context.distributed.size > 1:
-            with self.prof.record_timing("average_training_metrics"):
-                batch_metrics = pytorch._combine_and_average_training_metrics(
-                    self.context.distributed, training_metrics
-                )
-        else:
-            batch_metrics = training_metrics
+        with _trace.span("reduce_training_metrics", "metrics"):
+            if self.context.distributed.size > 1:
+                with self.prof.record_timing("average_training_metrics"):
+                    batch_metrics = pytorch._combine_and_average_training_metrics(
+                        self.context.distributed, training_metrics
+                    )
+            else:
+                batch_metrics = training_metrics
 
-        metrics = det.util.make_metrics(None, batch_metrics)
+            metrics = det.util.make_metrics(None, batch_metrics)
 
-        # Ignore batch_metrics entirely for custom reducers; there's no guarantee that per-batch
-        # metrics are even logical for a custom reducer.
-        with self.prof.record_timing("reduce_metrics"):
-            metrics["avg_metrics"].update(
-                pytorch._convert_metrics_to_numpy(self.context.reduce_metrics(for_training=True))
-            )
+            # Ignore batch_metrics entirely for custom reducers; there's no guarantee that
+            # per-batch metrics are even logical for a custom reducer.
+            with self.prof.record_timing("reduce_metrics"):
+                metrics["avg_metrics"].update(
+                    pytorch._convert_metrics_to_numpy(
+                        self.context.reduce_metrics(for_training=True)
+                    )
+                )
 
         if not self.is_chief:
             return {}
@@ -412,7 +462,8 @@ class _PyTorchTrialController:
                     path,
                     storage_id,
                 ):
-                    self._save(path)
+                    with _trace.span("checkpoint_save", "checkpoint"):
+                        self._save(path)
                     uuid = storage_id
             uuid = self.context.distributed.broadcast(uuid)
             for callback in self.callbacks.values():
@@ -721,7 +772,10 @@ class _PyTorchTrialController:
             if batch_in_epoch_idx == 0:
                 self._on_epoch_start(epoch_idx)
 
-            batch_metrics = self._train_batch(batch=batch, batch_idx=batch_idx, epoch_idx=epoch_idx)
+            with _trace.span("train_batch", "train"):
+                batch_metrics = self._train_batch(
+                    batch=batch, batch_idx=batch_idx, epoch_idx=epoch_idx
+                )
             training_metrics.append(batch_metrics)
             self._step_batch()
 
@@ -1003,14 +1057,15 @@ class _PyTorchTrialController:
             for callback in self.callbacks.values():
                 callback.on_validation_epoch_end(batch_metrics)
 
-            metrics = pytorch._reduce_metrics(
-                self.context.distributed,
-                batch_metrics=batch_metrics,
-                keys=keys,
-                metrics_reducers=pytorch._prepare_metrics_reducers(
-                    self.trial.evaluation_reducer(), keys=keys
-                ),
-            )
+            with _trace.span("reduce_validation_metrics", "metrics"):
+                metrics = pytorch._reduce_metrics(
+                    self.context.distributed,
+                    batch_metrics=batch_metrics,
+                    keys=keys,
+                    metrics_reducers=pytorch._prepare_metrics_reducers(
+                        self.trial.evaluation_reducer(), keys=keys
+                    ),
+                )
 
             # Gather a list of per-worker (num_inputs, num_batches) tuples.
             input_counts = self.context.distributed.gather((num_inputs, idx + 1))
@@ -1125,10 +1180,11 @@ class _PyTorchTrialController:
         ]
 
         checkpoint: Optional[Dict[str, Any]] = None
+        mapped = False
         for ckpt_path in potential_paths:
             maybe_ckpt = load_path.joinpath(*ckpt_path)
             if maybe_ckpt.exists():
-                checkpoint = torch.load(str(maybe_ckpt), map_location="cpu")  # type: ignore
+                checkpoint, mapped = _load_state_file(maybe_ckpt)
                 break
 
         if checkpoint is None or not isinstance(checkpoint, dict):
@@ -1183,6 +1239,9 @@ class _PyTorchTrialController:
             for idx, optimizer in enumerate(self.context.optimizers):
                 optimizer.load_state_dict(checkpoint["optimizers_state_dict"][idx])
 
+        if mapped:
+            _copy_mapped_optimizer_state(checkpoint, self.context.optimizers)
+
         if "lr_scheduler" in checkpoint:
             # Backward compatible with older checkpoint format.
             if "lr_schedulers_state_dict" in checkpoint:
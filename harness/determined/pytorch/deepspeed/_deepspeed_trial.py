@@ -5,9 +5,10 @@ import os
 import pathlib
 import pickle
 import random
+import re
 import time
 import warnings
-from typing import Any, Callable, Dict, Iterator, List, Optional, Type, Union, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type, Union, cast
 
 import deepspeed
 import numpy as np
@@ -15,7 +16,7 @@ import torch
 from deepspeed.runtime import dataloader as ds_loader
 
 import determined as det
-from determined import layers, pytorch, util, workload
+from determined import core, layers, pytorch, util, workload
 from determined.pytorch import deepspeed as det_ds
 from determined.pytorch import dsat
 
@@ -33,6 +34,99 @@ def get_length(self: ds_loader.RepeatingLoader) -> int:
 
 ds_loader.RepeatingLoader.__len__ = get_length
 
+# Checkpoint files which each rank writes for itself: ZeRO's per-rank optimizer (and, with ZeRO-3,
+# model) states, the per-model-parallel-rank model states, and Determined's own per-rank state.
+_ZERO_SHARD = re.compile(r"(?:bf16_)?zero_pp_rank_(\d+)_mp_rank_(\d+)_?(optim|model)_states\.pt")
+_MP_SHARD = re.compile(r"mp_rank_(\d+)_model_states\.pt")
+_DET_SHARD = re.compile(r"det_state_dict_rank(\d+)\.pth")
+
+
+def _shard_key(name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Identify the shard a checkpoint file belongs to, or return None if it is not a shard.
+
+    Model states are keyed without their model parallel rank, since DeepSpeed's load_checkpoint()
+    globs every model parallel rank's model states and merges or splits them to fit its own.
+    """
+    match = _ZERO_SHARD.fullmatch(os.path.basename(name))
+    if match:
+        dp_rank, mp_rank, kind = match.groups()
+        return ("zero", dp_rank, "*" if kind == "model" else mp_rank, kind)
+    if _MP_SHARD.fullmatch(os.path.basename(name)):
+        return ("mp", "*")
+    match = _DET_SHARD.fullmatch(os.path.basename(name))
+    if match:
+        return ("det", *match.groups())
+    return None
+
+
+def _shard_selector(models: List[Any], rank: int) -> Optional[Callable[[str], bool]]:
+    """
+    Build a selector for restoring a checkpoint saved by DeepSpeedTrial.save(), which skips the
+    shards that DeepSpeedTrial.load() would not read on this rank, or return None to restore the
+    whole checkpoint if the model engines cannot say which shards they read.
+    """
+    # tag -> the keys of the shards this rank reads from the tag's directory.
+    wanted: Dict[str, Set[Optional[Tuple[str, ...]]]] = {}
+    elastic = set()
+    try:
+        for i, model in enumerate(models):
+            tag = f"model{i}"
+            wanted[tag] = {_shard_key(model._get_ckpt_name("", tag))}
+            if model.zero_optimization():
+                wanted[tag].add(_shard_key(model._get_zero_ckpt_name("", tag)))
+                if model.zero_elastic_checkpoint():
+                    elastic.add(tag)
+    except AttributeError as e:
+        logger.debug(f"Restoring all checkpoint shards, as engines cannot name theirs: {e}")
+        return None
+
+    def selector(path: str) -> bool:
+        key = _shard_key(path)
+        if key is None:
+            return True
+        if key[0] == "det":
+            return int(key[1]) == rank
+        tag = path.split("/")[0]
+        if tag not in wanted or (key[0] == "zero" and tag in elastic):
+            return True
+        return key in wanted[tag]
+
+    return selector
+
+
+@contextlib.contextmanager
+def _stream_engine_saves(models: List[Any], stream: core._ShardStream) -> Iterator[None]:
+    """
+    Submit every file that the model engines save to stream as soon as it is written, by wrapping
+    their checkpoint engines' save().  Checkpoint engines which may finish writing files after
+    save() returns, like Nebula's, are left alone.
+    """
+    try:
+        from deepspeed.runtime.checkpoint_engine import nebula_checkpoint_engine
+
+        async_engines: Tuple[type, ...] = (nebula_checkpoint_engine.NebulaCheckpointEngine,)
+    except ImportError:
+        async_engines = ()
+
+    wrapped = []
+    for model in models:
+        ckpt_engine = getattr(model, "checkpoint_engine", None)
+        if ckpt_engine is None or isinstance(ckpt_engine, async_engines) or ckpt_engine in wrapped:
+            continue
+
+        def save(state_dict: Any, path: str, save: Callable = ckpt_engine.save) -> None:
+            save(state_dict, path)
+            stream.submit(path)
+
+        ckpt_engine.save = save
+        wrapped.append(ckpt_engine)
+    try:
+        yield
+    finally:
+        for ckpt_engine in wrapped:
+            del ckpt_engine.save
+
 
 class DeepSpeedTrialController(det.TrialController):
     def __init__(self, trial_inst: det.LegacyTrial, *args: Any, **kwargs: Any) -> None:
@@ -286,8 +380,11 @@ class DeepSpeedTrialController(det.TrialController):
             # If a load path is provided load weights and restore the data location.
             if self.env.latest_checkpoint is not None:
                 logger.info(f"Restoring trial from checkpoint {self.env.latest_checkpoint}")
+                selector = None
+                if not util.is_overridden(self.trial.load, DeepSpeedTrial):
+                    selector = _shard_selector(self.context.models, self.context.distributed.rank)
                 with self.context._core.checkpoint.restore_path(
-                    self.env.latest_checkpoint
+                    self.env.latest_checkpoint, selector=selector
                 ) as load_path:
                     self._load(load_path)
 
@@ -345,11 +442,12 @@ class DeepSpeedTrialController(det.TrialController):
                         "framework": f"torch-{torch.__version__}",
                         "format": "pickle",
                     }
-                    with self.context._core.checkpoint.store_path(metadata, shard=True) as (
+                    stream = core._ShardStream()
+                    with self.context._core.checkpoint._store_path_streaming(metadata, stream) as (
                         path,
                         storage_id,
                     ):
-                        self._save(path)
+                        self._save(path, stream)
                     response = {"uuid": storage_id}
                     for callback in self.callbacks.values():
                         callback.on_checkpoint_upload_end(uuid=storage_id)
@@ -626,10 +724,6 @@ class DeepSpeedTrialController(det.TrialController):
             )
 
     def _load(self, load_path: pathlib.Path) -> None:
-        # Right now we will load all checkpoint shards on each node regardless of which
-        # checkpoints are needed.
-        # TODO (Liam): revisit later to optimize sharded checkpoint loading.
-
         # Load stateful things tracked by Determined on all slots.
         ckpt_path = f"det_state_dict_rank{self.context.distributed.rank}.pth"
         maybe_ckpt = load_path.joinpath(ckpt_path)
@@ -691,7 +785,7 @@ class DeepSpeedTrialController(det.TrialController):
             with wlsq_path.open("rb") as f:
                 self.wlsq.load_state(pickle.load(f))
 
-    def _save(self, path: pathlib.Path) -> None:
+    def _save(self, path: pathlib.Path, stream: core._ShardStream) -> None:
         if self.context.distributed.local_rank == 0:
             path.mkdir(parents=True, exist_ok=True)
         _ = self.context.distributed.gather_local(None)  # sync
@@ -732,10 +826,13 @@ class DeepSpeedTrialController(det.TrialController):
 
         ckpt_name = f"det_state_dict_rank{self.context.distributed.rank}.pth"
         torch.save(checkpoint, str(path.joinpath(ckpt_name)))
+        stream.submit(path.joinpath(ckpt_name))
 
         # We allow users to override save behavior if needed, but we default to using
-        # the save method provided by DeepSpeed.
-        self.trial.save(self.context, path)
+        # the save method provided by DeepSpeed.  Either way, each file the model engines save is
+        # uploaded while they save the next.
+        with _stream_engine_saves(self.context.models, stream):
+            self.trial.save(self.context, path)
 
         for callback in self.callbacks.values():
             # TODO(DET-7912): remove on_checkpoint_end once it has been deprecated long enough.
@@ -21,6 +21,21 @@ from determined.util import merge_dicts
 logger = logging.getLogger("determined.pytorch")
 
 
+class _Lineage:
+    """
+    Views of a lineage tree which are shared by all of its trials and kept current as trials are
+    added and report results, instead of being recomputed by walking the tree.
+    """
+
+    def __init__(self) -> None:
+        # Dicts are used as insertion-ordered sets.
+        self.trials: Dict["DSATTrial", None] = {}
+        self.trials_with_metric: Dict["DSATTrial", None] = {}
+        self.num_completed = 0
+        # The best trial in the lineage, keyed by smaller_is_better.
+        self.best: Dict[bool, Optional["DSATTrial"]] = {}
+
+
 class DSATTrial:
     """Encapsulation of DeepSpeed Autotune Trials.
 
@@ -52,16 +67,22 @@ class DSATTrial:
 
         # Other attrs which are updated during training:
 
-        self.metric: Union[float, Dict[str, Any]] = {}
-        self.error = False
-        self.running = False
+        self._metric: Union[float, Dict[str, Any]] = {}
+        self._error = False
+        self._running = False
         self.children: Set["DSATTrial"] = set()
+        # Set when the trial is registered with a DSATTrialTracker, which indexes trials by state.
+        self._tracker: Optional["DSATTrialTracker"] = None
 
         # If a parent was specified, register the current Trial as the parent's child.
         if self.parent is not None:
             self.parent.children.add(self)
+            if self.parent._tracker is not None:
+                self.parent._tracker._reindex(self.parent)
 
         self.lineage_root: DSATTrial = self if self.parent is None else self.parent.lineage_root
+        self._lineage: _Lineage = _Lineage() if self.parent is None else self.parent._lineage
+        self._lineage.trials[self] = None
 
         # The DS config json file may either be in the specified model directory or in the base of
         # the workdir, if it was added as an `--include` arg.
@@ -72,27 +93,82 @@ class DSATTrial:
 
         self._error_in_direct_history = False
 
+    @property
+    def metric(self) -> Union[float, Dict[str, Any]]:
+        return self._metric
+
+    @metric.setter
+    def metric(self, metric: Union[float, Dict[str, Any]]) -> None:
+        was_completed = self.completed
+        self._metric = metric
+        lineage = self._lineage
+        if self.searcher_metric_val is not None:
+            lineage.trials_with_metric[self] = None
+        else:
+            lineage.trials_with_metric.pop(self, None)
+        lineage.best.clear()
+        self._on_state_change(was_completed, metric_changed=True)
+
+    @property
+    def error(self) -> bool:
+        return self._error
+
+    @error.setter
+    def error(self, error: bool) -> None:
+        was_completed = self.completed
+        self._error = error
+        self._on_state_change(was_completed)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @running.setter
+    def running(self, running: bool) -> None:
+        self._running = running
+        self._on_state_change(self.completed)
+
+    def _on_state_change(self, was_completed: bool, metric_changed: bool = False) -> None:
+        self._lineage.num_completed += int(self.completed) - int(was_completed)
+        if self._tracker is not None:
+            self._tracker._reindex(self, metric_changed)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Trials pickled by older versions store their state as plain attributes; their lineage
+        # views are rebuilt by the DSATTrialTracker which holds them.
+        for name in ("metric", "error", "running"):
+            if name in state:
+                state[f"_{name}"] = state.pop(name)
+        state.setdefault("_tracker", None)
+        self.__dict__.update(state)
+
     @property
     def completed(self) -> bool:
         return bool(self.error or self.metric)
 
     @property
     def lineage_set(self) -> Set["DSATTrial"]:
-        """Computes set of trials in lineage tree."""
-        root = self.lineage_root
-        trials_set = {root}
-        children = set(root.children)
-        while children:
-            random_child = children.pop()
-            trials_set.add(random_child)
-            children |= random_child.children
-        return trials_set
+        """Returns the set of trials in the lineage tree."""
+        return set(self._lineage.trials)
 
     @property
     def num_completed_trials_in_lineage(self) -> int:
-        """Computes total number of trials in lineage tree."""
-        num_trials = sum(trial.completed for trial in self.lineage_set)
-        return num_trials
+        """Returns the total number of completed trials in the lineage tree."""
+        return self._lineage.num_completed
+
+    @property
+    def lineage_trials_with_metric(self) -> List["DSATTrial"]:
+        """Returns the trials in the lineage tree which have reported the searcher metric."""
+        return list(self._lineage.trials_with_metric)
+
+    def best_trial_in_lineage(self, smaller_is_better: bool) -> Optional["DSATTrial"]:
+        """Returns the trial in the lineage tree with the best searcher metric, if any."""
+        lineage = self._lineage
+        if smaller_is_better not in lineage.best:
+            lineage.best[smaller_is_better] = _best_by_searcher_metric_val(
+                lineage.trials_with_metric, smaller_is_better
+            )
+        return lineage.best[smaller_is_better]
 
     @property
     def error_in_direct_history(self) -> bool:
@@ -110,7 +186,7 @@ class DSATTrial:
         """
         Returns the set of all `train_micro_batch_size_per_gpu` (mbs) used in the Trial's lineage.
         """
-        mbs_in_lineage = {t.mbs for t in self.lineage_set}
+        mbs_in_lineage = {t.mbs for t in self._lineage.trials}
         return mbs_in_lineage
 
     @property
@@ -160,6 +236,24 @@ class DSATTrial:
         return val
 
 
+def _best_by_searcher_metric_val(
+    trials: Iterable[DSATTrial], smaller_is_better: bool
+) -> Optional[DSATTrial]:
+    trials_with_metrics = [t for t in trials if t.searcher_metric_val is not None]
+    if not trials_with_metrics:
+        return None
+    min_or_max = min if smaller_is_better else max
+    return min_or_max(
+        trials_with_metrics,
+        key=lambda t: t.searcher_metric_val is not None and t.searcher_metric_val,
+    )
+
+
+def _hparams_key(hparams: Dict[str, Any]) -> str:
+    # Equal hparams have equal keys, so only trials with the same key need to be compared.
+    return json.dumps(hparams, sort_keys=True, default=repr)
+
+
 class DSATModelProfileInfoTrial(DSATTrial):
     """
     Super class for differentiating the model profiling info run.
@@ -206,6 +300,41 @@ class DSATTrialTracker:
         self._mem_per_gpu_per_stage: Optional[Dict[int, int]] = None
         self._approx_max_mbs_per_stage: Optional[Dict[int, int]] = None
 
+        self._init_indices()
+
+    def _init_indices(self) -> None:
+        # Registered trials indexed by state, kept current by `_reindex` as trials change state so
+        # that the search methods' per-event queries do not scan every trial.
+        self._registration_order: Dict[uuid.UUID, int] = {}
+        self._running_trials: Dict[uuid.UUID, DSATTrial] = {}
+        self._completed_trials: Dict[uuid.UUID, DSATTrial] = {}
+        self._errored_trials: Dict[uuid.UUID, DSATTrial] = {}
+        self._leaf_trials: Dict[uuid.UUID, DSATTrial] = {}
+        # Completed trials by their hparams (see `_hparams_key`), for finding duplicate trials.
+        self._hparams_keys: Dict[uuid.UUID, str] = {}
+        self._completed_trials_by_hparams: Dict[str, Dict[uuid.UUID, DSATTrial]] = defaultdict(dict)
+        # Trials which are candidates for the best trial, by zero stage.
+        self._trials_with_metric_by_stage: Dict[int, Dict[uuid.UUID, DSATTrial]] = defaultdict(dict)
+        # A stage which is missing from this cache is recomputed on the next access.
+        self._best_trials_by_stage: Dict[int, Optional[DSATTrial]] = {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if "_registration_order" not in state:
+            # Pickled by an older version, without indices.
+            self._init_indices()
+            for trial in self._all_trials_dict.values():
+                if not hasattr(trial, "_lineage"):
+                    root = trial.lineage_root
+                    if not hasattr(root, "_lineage"):
+                        root._lineage = _Lineage()
+                    trial._lineage = root._lineage
+                    trial._lineage.trials[trial] = None
+                    trial._lineage.num_completed += trial.completed
+                    if trial.searcher_metric_val is not None:
+                        trial._lineage.trials_with_metric[trial] = None
+                self._register(trial)
+
     def __len__(self) -> int:
         return len(self._all_trials_dict)
 
@@ -219,7 +348,7 @@ class DSATTrialTracker:
         if isinstance(item, uuid.UUID):
             return item in self._all_trials_dict
         elif isinstance(item, DSATTrial):
-            return item in self._all_trials_dict.values()
+            return self._all_trials_dict.get(item.request_id) is item
         else:
             raise ValueError(
                 f"Expected a `uuid.UUID` or `DSATTrial` instance, instead received an object of"
@@ -281,14 +410,60 @@ class DSATTrialTracker:
         tracking all trials.
         """
         # Verify that the given trial was not previously completed.
-        for other_trial in self.completed_trials:
+        hparams_key = _hparams_key(trial.hparams)
+        for other_trial in self._completed_trials_by_hparams[hparams_key].values():
             if trial.hparams == other_trial.hparams:
                 logger.warning(
                     f"Skipping attempt to queue Trial identical to {other_trial.request_id}"
                 )
         self._all_trials_dict[trial.request_id] = trial
+        self._register(trial)
         self.queue.append(trial)
 
+    def _register(self, trial: DSATTrial) -> None:
+        trial._tracker = self
+        self._registration_order.setdefault(trial.request_id, len(self._registration_order))
+        self._hparams_keys[trial.request_id] = _hparams_key(trial.hparams)
+        self._reindex(trial, metric_changed=True)
+
+    def _reindex(self, trial: DSATTrial, metric_changed: bool = False) -> None:
+        """Updates the indices after a registered trial changes state."""
+        request_id = trial.request_id
+        for index, member in (
+            (self._running_trials, trial.running),
+            (self._completed_trials, trial.completed),
+            (self._errored_trials, trial.error),
+            (self._leaf_trials, not trial.children),
+            (self._completed_trials_by_hparams[self._hparams_keys[request_id]], trial.completed),
+        ):
+            if member:
+                index[request_id] = trial
+            else:
+                index.pop(request_id, None)
+
+        if not metric_changed:
+            return
+        stage = trial.stage
+        stage_trials = self._trials_with_metric_by_stage[stage]
+        if self._best_trial_fn([trial]) is trial:
+            stage_trials[request_id] = trial
+        else:
+            stage_trials.pop(request_id, None)
+
+        if stage not in self._best_trials_by_stage:
+            return
+        best = self._best_trials_by_stage[stage]
+        if best is trial:
+            # The best trial's own metric changed; recompute the stage on the next access.
+            del self._best_trials_by_stage[stage]
+        elif request_id in stage_trials:
+            candidates = [trial] if best is None else [best, trial]
+            self._best_trials_by_stage[stage] = self._best_trial_fn(self._in_order(candidates))
+
+    def _in_order(self, trials: Iterable[DSATTrial]) -> List[DSATTrial]:
+        # The first of several equally good trials is the best, as when every trial was scanned.
+        return sorted(trials, key=lambda trial: self._registration_order[trial.request_id])
+
     def enforce_consistent_batch_config(self, hparams: Dict[str, Any]) -> None:
         """Enforces a consistent batch size configuration by altering `hparams` in-place."""
         try:
@@ -449,13 +624,22 @@ class DSATTrialTracker:
         )
         return best_trial
 
+    def trials_with_metric_in_stage(self, stage: int) -> List["DSATTrial"]:
+        """
+        Returns the registered autotuning trials of the given zero stage which have reported the
+        searcher metric.
+        """
+        return list(self._trials_with_metric_by_stage[stage].values())
+
     @property
     def best_trials_by_stage(self) -> Dict[int, Optional["DSATTrial"]]:
         _best_trials_by_stage: Dict[int, Optional["DSATTrial"]] = {}
         for stage in range(4):
-            trials_to_check = [trial for _, trial in self if trial.stage == stage]
-            best_trial = self._best_trial_fn(trials_to_check)
-            _best_trials_by_stage[stage] = best_trial
+            if stage not in self._best_trials_by_stage:
+                self._best_trials_by_stage[stage] = self._best_trial_fn(
+                    self._in_order(self._trials_with_metric_by_stage[stage].values())
+                )
+            _best_trials_by_stage[stage] = self._best_trials_by_stage[stage]
         return _best_trials_by_stage
 
     @property
@@ -465,21 +649,26 @@ class DSATTrialTracker:
         )
         return best_trial
 
+    @property
+    def leaf_trials(self) -> List[DSATTrial]:
+        """Returns the registered trials which have no children, i.e. the latest in each lineage."""
+        return list(self._leaf_trials.values())
+
     @property
     def running_trials(self) -> List[DSATTrial]:
-        return [trial for _, trial in self if trial.running]
+        return list(self._running_trials.values())
 
     @property
     def completed_trials(self) -> List[DSATTrial]:
-        return [trial for _, trial in self if trial.completed]
+        return list(self._completed_trials.values())
 
     @property
     def num_running_trials(self) -> int:
-        return len(self.running_trials)
+        return len(self._running_trials)
 
     @property
     def num_completed_trials(self) -> int:
-        return len(self.completed_trials)
+        return len(self._completed_trials)
 
     @property
     def max_trials_queued(self) -> bool:
@@ -494,11 +683,16 @@ class DSATTrialTracker:
         model_profile_info_trial_failed = (
             self.model_profile_info_trial is not None and self.model_profile_info_trial.error
         )
-        every_autotuning_trial_failed = all(
-            trial.error
-            for _, trial in self
-            if trial.completed and not isinstance(trial, DSATModelProfileInfoTrial)
-        )
+        # Errored trials are always completed, so every completed autotuning trial failed when
+        # the only completed trial which did not error is the model profile info trial, if any.
+        num_succeeded = len(self._completed_trials) - len(self._errored_trials)
+        if (
+            self.model_profile_info_trial is not None
+            and self.model_profile_info_trial.request_id in self._completed_trials
+            and not self.model_profile_info_trial.error
+        ):
+            num_succeeded -= 1
+        every_autotuning_trial_failed = num_succeeded == 0
         return model_profile_info_trial_failed or every_autotuning_trial_failed
 
     @property
@@ -877,8 +1071,8 @@ class RandomDSATSearchMethod(BaseDSATSearchMethod):
             and trial.search_data
             and any(
                 other_trial.mbs >= trial.search_data.hi
-                for _, other_trial in self.trial_tracker
-                if other_trial.stage == trial.stage and other_trial.searcher_metric_val is not None
+                for other_trial in self.trial_tracker.trials_with_metric_in_stage(trial.stage)
+                if other_trial.searcher_metric_val is not None
             )
         )
 
@@ -923,9 +1117,8 @@ class RandomDSATSearchMethod(BaseDSATSearchMethod):
             new_search_data.lo = best_trial_for_stage.mbs + 1
             largest_successful_batch_size_for_stage = max(
                 t.mbs
-                for t in self.trial_tracker.completed_trials
-                if t.stage == best_trial_for_stage.stage
-                and isinstance(t.metric, dict)
+                for t in self.trial_tracker.trials_with_metric_in_stage(best_trial_for_stage.stage)
+                if isinstance(t.metric, dict)
                 and t.metric.get(self.trial_tracker.searcher_metric) is not None
             )
             new_search_data.hi = max(
@@ -1228,9 +1421,8 @@ class ASHADSATSearchMethod(BaseDSATSearchMethod):
         """
         lineage_root_set = [
             trial
-            for _, trial in self.trial_tracker
+            for trial in self.trial_tracker.leaf_trials
             if not isinstance(trial, DSATModelProfileInfoTrial)
-            and self.get_latest_trial_in_lineage(trial) == trial
             and trial.search_data is not None
             and isinstance(trial.search_data, ASHADSATSearchData)
         ]
@@ -1303,21 +1495,18 @@ class ASHADSATSearchMethod(BaseDSATSearchMethod):
     def get_best_trial_in_lineage(
         self, trial: DSATTrial, max_rung_idx: Optional[int] = None
     ) -> Optional[DSATTrial]:
-        trials_with_metrics = [t for t in trial.lineage_set if t.searcher_metric_val is not None]
-        if max_rung_idx is not None:
-            filtered_trials_with_metrics: List[DSATTrial] = []
-            for t in trials_with_metrics:
-                assert t.search_data
-                assert isinstance(t.search_data, ASHADSATSearchData)
-                if t.search_data.curr_rung <= max_rung_idx:
-                    filtered_trials_with_metrics.append(t)
-            trials_with_metrics = filtered_trials_with_metrics
-        if not trials_with_metrics:
-            return None
-        min_or_max = min if self.trial_tracker.smaller_is_better else max
-        return min_or_max(
-            trials_with_metrics,
-            key=lambda t: t.searcher_metric_val is not None and t.searcher_metric_val,
+        if max_rung_idx is None:
+            return trial.best_trial_in_lineage(self.trial_tracker.smaller_is_better)
+        # Rungs are not cached with the lineage, since a trial's curr_rung can change after it
+        # reports its metric.
+        filtered_trials_with_metrics: List[DSATTrial] = []
+        for t in trial.lineage_trials_with_metric:
+            assert t.search_data
+            assert isinstance(t.search_data, ASHADSATSearchData)
+            if t.search_data.curr_rung <= max_rung_idx:
+                filtered_trials_with_metrics.append(t)
+        return _best_by_searcher_metric_val(
+            filtered_trials_with_metrics, self.trial_tracker.smaller_is_better
         )
 
     def get_latest_trial_in_lineage(self, trial: DSATTrial) -> DSATTrial:
@@ -0,0 +1,172 @@
+"""
+The work queue behind torch_batch_process's dynamic sharding.
+
+The dataset's batches are grouped into chunks of consecutive batches. The chief serves the chunks
+that are not yet completed, in order, from a background thread, and every rank (the chief included)
+asks it for the next chunk whenever it runs out of work, so a rank that is slowed down by expensive
+items simply takes fewer chunks. Ranks report each chunk they have finished and flushed, and the
+chief records those chunks in its checkpoints, so a resumed job skips exactly the finished chunks.
+"""
+import collections
+import math
+import threading
+from typing import Any, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class ChunkScheduler:
+    """Hand out chunks in order, and track which chunks ranks have completed."""
+
+    def __init__(self, num_chunks: int, completed: Iterable[int] = ()) -> None:
+        self.num_chunks = num_chunks
+        self._completed = set(completed)
+        self._pending = collections.deque(c for c in range(num_chunks) if c not in self._completed)
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def request(self, done: List[int], want_chunk: bool = True) -> Optional[int]:
+        """Record done chunks as completed, and return the next chunk, or None if there is none."""
+        with self._lock:
+            self._completed.update(done)
+            if not want_chunk or self._stopped or not self._pending:
+                return None
+            return self._pending.popleft()
+
+    def stop(self) -> None:
+        """Stop handing out chunks, e.g. because the task is being preempted."""
+        with self._lock:
+            self._stopped = True
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    @property
+    def num_completed(self) -> int:
+        return len(self._completed)
+
+    def completed(self) -> List[int]:
+        with self._lock:
+            return sorted(self._completed)
+
+
+def to_ranges(chunks: List[int]) -> List[List[int]]:
+    """Compress sorted chunk ids into [start, end) ranges, for storing in a checkpoint."""
+    ranges: List[List[int]] = []
+    for c in chunks:
+        if ranges and ranges[-1][1] == c:
+            ranges[-1][1] = c + 1
+        else:
+            ranges.append([c, c + 1])
+    return ranges
+
+
+def from_ranges(ranges: List[List[int]]) -> Set[int]:
+    return {c for start, end in ranges for c in range(start, end)}
+
+
+class ChunkServer:
+    """Serve a ChunkScheduler to ChunkClients over ZMQ, from a background thread."""
+
+    def __init__(self, scheduler: ChunkScheduler) -> None:
+        import zmq
+
+        self._scheduler = scheduler
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.REP)
+        self.port = self._socket.bind_to_random_port("tcp://*")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="chunk-server", daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            if self._socket.poll(100) == 0:
+                continue
+            done, want_chunk = self._socket.recv_pyobj()
+            self._socket.send_pyobj(self._scheduler.request(done, want_chunk))
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._socket.close(linger=0)
+        self._context.term()
+
+    def __enter__(self) -> "ChunkServer":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class ChunkClient:
+    def __init__(self, chief_ip: str, port: int) -> None:
+        import zmq
+
+        self._context = zmq.Context()
+        self._socket = self._context.socket(zmq.REQ)
+        self._socket.connect(f"tcp://{chief_ip}:{port}")
+
+    def request(self, done: List[int], want_chunk: bool = True) -> Optional[int]:
+        self._socket.send_pyobj((done, want_chunk))
+        chunk = self._socket.recv_pyobj()
+        assert chunk is None or isinstance(chunk, int)
+        return chunk
+
+    def close(self) -> None:
+        self._socket.close(linger=0)
+        self._context.term()
+
+    def __enter__(self) -> "ChunkClient":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class ChunkBatchSampler:
+    """
+    A batch sampler which yields the batches of each chunk the chief hands out, until the chief has
+    no more chunks to give.
+
+    Batch b holds dataset indices [b * batch_size, (b + 1) * batch_size), so batches are the same
+    whichever rank processes them. Since a DataLoader may sample ahead of the batches it returns,
+    batches records (chunk, batch_idx, is_last_batch_of_chunk) for every batch sampled, in order.
+    """
+
+    def __init__(
+        self,
+        client: ChunkClient,
+        dataset_len: int,
+        batch_size: int,
+        num_batches: int,
+        batches_per_chunk: int,
+    ) -> None:
+        self._client = client
+        self._dataset_len = dataset_len
+        self._batch_size = batch_size
+        self._num_batches = num_batches
+        self._batches_per_chunk = batches_per_chunk
+        self.batches: Deque[Tuple[int, int, bool]] = collections.deque()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        while True:
+            chunk = self._client.request([])
+            if chunk is None:
+                return
+            first = chunk * self._batches_per_chunk
+            last = min(first + self._batches_per_chunk, self._num_batches) - 1
+            for batch_idx in range(first, last + 1):
+                self.batches.append((chunk, batch_idx, batch_idx == last))
+                start = batch_idx * self._batch_size
+                yield list(range(start, min(start + self._batch_size, self._dataset_len)))
+
+
+def num_chunks(num_batches: int, batches_per_chunk: int) -> int:
+    return math.ceil(num_batches / batches_per_chunk)
+
+
+def chunk_batches(chunks: Iterable[int], num_batches: int, batches_per_chunk: int) -> int:
+    """The number of batches in the given chunks; only the final chunk may be short."""
+    return sum(
+        min((c + 1) * batches_per_chunk, num_batches) - c * batches_per_chunk for c in chunks
+    )
@@ -1,4 +1,6 @@
 import abc
+import concurrent.futures
+import contextlib
 import json
 import logging
 import math
@@ -6,7 +8,20 @@ import os
 import pathlib
 import uuid
 import warnings
-from typing import TYPE_CHECKING, Any, ContextManager, Dict, Optional, Set, Sized, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Sized,
+    Tuple,
+    Type,
+)
 
 import torch
 import torch.distributed as dist
@@ -14,7 +29,8 @@ from torch import nn
 from torch.utils import data
 
 import determined as det
-from determined import common, core, pytorch
+from determined import _trace, common, core, pytorch
+from determined.pytorch.experimental import _chunk_queue
 
 if TYPE_CHECKING:
     # These modules are only needed for type checking and
@@ -26,6 +42,8 @@ logger = logging.getLogger("determined.pytorch")
 common.set_logger(False)
 
 DEFAULT_BATCH_SIZE = 1
+# Written into each checkpoint of a dynamically sharded run.
+CHUNKS_COMPLETED_FILE = "chunks_completed.json"
 
 
 class TorchBatchProcessorContext(pytorch._PyTorchReducerContext):
@@ -180,15 +198,16 @@ def _initialize_distributed_backend() -> Optional[core.DistributedContext]:
 
 def _initialize_default_inference_context(
     distributed_context: Optional[core.DistributedContext],
+    preempt_mode: core.PreemptMode = core.PreemptMode.WorkersAskChief,
 ) -> core.Context:
     if distributed_context is None:
         distributed_context = _initialize_distributed_backend()
     # Use WorkerAskChief mode to ensure synchronize correctly across worker
     # Using WorkerAskMaster mode could lead to some workers exiting when others
     # are waiting for synchronization.
-    return det.core.init(
-        distributed=distributed_context, preempt_mode=core.PreemptMode.WorkersAskChief
-    )
+    # With dynamic sharding, workers do not run in step; the chief alone checks for preemption
+    # and stops handing out work.
+    return det.core.init(distributed=distributed_context, preempt_mode=preempt_mode)
 
 
 class TorchBatchProcessor(metaclass=abc.ABCMeta):
@@ -237,11 +256,69 @@ def _load_state(checkpoint_directory: pathlib.Path) -> Any:
         return metadata
 
 
+class _ProgressCheckpointer:
+    """
+    Create the chief's progress checkpoints on a background thread, so that ranks keep processing
+    while a checkpoint uploads, and measure how long each rank is blocked at checkpoint intervals.
+
+    At most one checkpoint is in flight: submitting another first waits for the previous one, as
+    does leaving the with block. A checkpoint only records batches which every rank has already
+    flushed, so if the job crashes before an upload finishes, it resumes from the previous one.
+    """
+
+    def __init__(self) -> None:
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._in_flight: Optional["concurrent.futures.Future[None]"] = None
+        self.blocked_seconds = 0.0
+        self.intervals = 0
+
+    def submit(self, store: Callable[[], None]) -> None:
+        self.wait()
+        self._in_flight = self._executor.submit(store)
+
+    def wait(self) -> None:
+        """Wait for the checkpoint in flight, if any, raising any error from creating it."""
+        future, self._in_flight = self._in_flight, None
+        if future is not None:
+            future.result()
+
+    @contextlib.contextmanager
+    def interval(self) -> Iterator[None]:
+        """Count the body as time this rank spent blocked at a checkpoint interval."""
+        start = _trace.now()
+        try:
+            yield
+        finally:
+            _trace.complete("progress_checkpoint", start, "checkpoint")
+            blocked = (_trace.now() - start) / 1e9
+            self.blocked_seconds += blocked
+            self.intervals += 1
+            logger.debug(f"Blocked for {blocked:.3f}s at checkpoint interval")
+
+    def __enter__(self) -> "_ProgressCheckpointer":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+        if self.intervals > 0:
+            logger.info(
+                f"Blocked for {self.blocked_seconds:.2f}s in total at {self.intervals} "
+                "checkpoint intervals"
+            )
+
+
 def _synchronize_and_checkpoint(
-    core_context: core.Context, steps_completed: int, default_output_uuid: str
+    core_context: core.Context,
+    steps_completed: int,
+    default_output_uuid: str,
+    checkpointer: _ProgressCheckpointer,
 ) -> None:
     """
-    Synchronize the workers and create checkpoint to record steps completed
+    Synchronize the workers, then have the chief create a checkpoint in the background to record
+    steps completed
     """
     if core_context.distributed.get_rank() == 0:
         steps_completed_list = core_context.distributed.gather(steps_completed)
@@ -249,15 +326,67 @@ def _synchronize_and_checkpoint(
             return
         min_steps_completed = min(steps_completed_list)
 
+        def store() -> None:
+            checkpoint_metadata = {
+                "steps_completed": min_steps_completed,
+                "default_output_uuid": default_output_uuid,
+            }
+            with core_context.checkpoint.store_path(checkpoint_metadata) as (path, uuid):
+                with open(os.path.join(path, "batch_completed.json"), "w") as file_obj:
+                    json.dump({"batch_completed": min_steps_completed}, file_obj)
+
+        checkpointer.submit(store)
+    else:
+        core_context.distributed.gather(steps_completed)
+
+
+def _checkpoint_chunks(
+    core_context: core.Context,
+    checkpointer: _ProgressCheckpointer,
+    completed: List[int],
+    batch_size: int,
+    num_batches: int,
+    batches_per_chunk: int,
+    default_output_uuid: str,
+) -> int:
+    """
+    Create a checkpoint in the background recording the chunks completed so far by a dynamically
+    sharded run, and return the number of batches in those chunks. Only the chief calls this.
+    """
+    steps_completed = _chunk_queue.chunk_batches(completed, num_batches, batches_per_chunk)
+
+    def store() -> None:
         checkpoint_metadata = {
-            "steps_completed": min_steps_completed,
+            "steps_completed": steps_completed,
             "default_output_uuid": default_output_uuid,
+            "dynamic_sharding": True,
         }
-        with core_context.checkpoint.store_path(checkpoint_metadata) as (path, uuid):
-            with open(os.path.join(path, "batch_completed.json"), "w") as file_obj:
-                json.dump({"batch_completed": min_steps_completed}, file_obj)
-    else:
-        core_context.distributed.gather(steps_completed)
+        with core_context.checkpoint.store_path(checkpoint_metadata) as (path, _):
+            with open(os.path.join(path, CHUNKS_COMPLETED_FILE), "w") as file_obj:
+                json.dump(
+                    {
+                        "batch_size": batch_size,
+                        "batches_per_chunk": batches_per_chunk,
+                        "chunks_completed": _chunk_queue.to_ranges(completed),
+                    },
+                    file_obj,
+                )
+
+    checkpointer.submit(store)
+    return steps_completed
+
+
+def _load_completed_chunks(
+    checkpoint_directory: pathlib.Path, batch_size: int, batches_per_chunk: int
+) -> Set[int]:
+    with pathlib.Path(checkpoint_directory, CHUNKS_COMPLETED_FILE).open("r") as f:
+        state = json.load(f)
+    if (state["batch_size"], state["batches_per_chunk"]) != (batch_size, batches_per_chunk):
+        raise ValueError(
+            f"The checkpoint was created with batch_size={state['batch_size']} and "
+            f"batches_per_chunk={state['batches_per_chunk']}, which cannot change when resuming."
+        )
+    return _chunk_queue.from_ranges(state["chunks_completed"])
 
 
 def _report_progress_to_master(
@@ -363,6 +492,130 @@ def _reduce_metrics(
             core_context.distributed.gather(gatherables)
 
 
+def _flush(per_batch_processor: TorchBatchProcessor, core_context: core.Context) -> None:
+    per_batch_processor.on_checkpoint_start()
+    if core_context._tensorboard_manager is not None:
+        core_context._tensorboard_manager.sync()
+
+
+def _process_dynamic(
+    core_context: core.Context,
+    per_batch_processor: TorchBatchProcessor,
+    dataset: data.Dataset,
+    dataset_len: int,
+    batch_size: int,
+    num_batches: int,
+    batches_per_chunk: int,
+    checkpoint_interval: int,
+    dataloader_kwargs: Dict[str, Any],
+    completed_chunks: Set[int],
+    default_output_uuid: str,
+    searcher_op: Optional[core.DummySearcherOperation],
+    checkpointer: _ProgressCheckpointer,
+) -> Tuple[int, bool]:
+    """
+    Process the dataset with dynamic sharding: each rank pulls chunks of batches from a queue
+    served by the chief until none are left.
+
+    Every checkpoint_interval batches, a rank flushes its outputs (on_checkpoint_start) and reports
+    the chunks it has finished since the last flush to the chief, and the chief checks for
+    preemption, upon which it stops handing out chunks. Between its own batches, the chief creates
+    a checkpoint of the reported chunks whenever enough new ones have been reported. Returns the
+    number of batches completed and whether the run was preempted.
+    """
+    distributed = core_context.distributed
+    rank = distributed.get_rank()
+    scheduler = None
+    server = None
+    if rank == 0:
+        scheduler = _chunk_queue.ChunkScheduler(
+            _chunk_queue.num_chunks(num_batches, batches_per_chunk), completed_chunks
+        )
+        server = _chunk_queue.ChunkServer(scheduler)
+        distributed.broadcast(server.port)
+        chief_ip, port = "127.0.0.1", server.port
+    else:
+        assert distributed._chief_ip is not None
+        chief_ip, port = distributed._chief_ip, distributed.broadcast(None)
+
+    try:
+        with _chunk_queue.ChunkClient(chief_ip, port) as client:
+            sampler = _chunk_queue.ChunkBatchSampler(
+                client, dataset_len, batch_size, num_batches, batches_per_chunk
+            )
+            dataloader = data.DataLoader(dataset, batch_sampler=sampler, **dataloader_kwargs)
+
+            # Chunks this rank has finished since its last flush.
+            processed: List[int] = []
+            batches_since_flush = 0
+            # The chief checkpoints about as often as static sharding would: once every worker
+            # could have finished checkpoint_interval more batches.
+            checkpoint_chunks = max(checkpoint_interval * distributed.size // batches_per_chunk, 1)
+            checkpointed_chunks = len(completed_chunks)
+            for batch in dataloader:
+                chunk, batch_idx, last_batch_of_chunk = sampler.batches.popleft()
+                per_batch_processor.process_batch(batch=batch, batch_idx=batch_idx)
+                if last_batch_of_chunk:
+                    processed.append(chunk)
+                batches_since_flush += 1
+
+                if batches_since_flush == checkpoint_interval:
+                    with checkpointer.interval():
+                        _flush(per_batch_processor, core_context)
+                        client.request(processed, want_chunk=False)
+                        processed, batches_since_flush = [], 0
+                        if scheduler is not None and core_context.preempt.should_preempt():
+                            scheduler.stop()
+
+                if (
+                    scheduler is not None
+                    and scheduler.num_completed - checkpointed_chunks >= checkpoint_chunks
+                ):
+                    with checkpointer.interval():
+                        completed = scheduler.completed()
+                        checkpointed_chunks = len(completed)
+                        steps_completed = _checkpoint_chunks(
+                            core_context,
+                            checkpointer,
+                            completed,
+                            batch_size,
+                            num_batches,
+                            batches_per_chunk,
+                            default_output_uuid,
+                        )
+                        logger.info(f"Completed steps:  {steps_completed} and checkpointing")
+                        if searcher_op is not None:
+                            searcher_op.report_progress(steps_completed / num_batches)
+
+            if batches_since_flush > 0:
+                _flush(per_batch_processor, core_context)
+
+        # Collect the chunks every rank finished after its last report.
+        all_processed = distributed.gather(processed)
+        if scheduler is None:
+            steps_completed, preempted = distributed.broadcast(None)
+            return steps_completed, preempted
+
+        for done in all_processed or []:
+            scheduler.request(done, want_chunk=False)
+        steps_completed = _checkpoint_chunks(
+            core_context,
+            checkpointer,
+            scheduler.completed(),
+            batch_size,
+            num_batches,
+            batches_per_chunk,
+            default_output_uuid,
+        )
+        logger.info(f"Completed steps:  {steps_completed} and checkpointing")
+        checkpointer.wait()
+        distributed.broadcast((steps_completed, scheduler.stopped))
+        return steps_completed, scheduler.stopped
+    finally:
+        if server is not None:
+            server.close()
+
+
 def torch_batch_process(
     batch_processor_cls: Type[TorchBatchProcessor],
     dataset: data.Dataset,
@@ -371,6 +624,8 @@ def torch_batch_process(
     checkpoint_interval: int = 5,
     dataloader_kwargs: Optional[Dict[str, Any]] = None,
     distributed_context: Optional[core.DistributedContext] = None,
+    dynamic_sharding: bool = False,
+    batches_per_chunk: int = 1,
 ) -> None:
     """
     ```torch_batch_process``` shard and iterate through the provided dataset and process the dataset
@@ -385,8 +640,22 @@ def torch_batch_process(
             of batches processed)
         dataloader_kwargs: Kwargs to pass to PyTorch dataloader
         distributed_context: Distributed context to initialize core context
+        dynamic_sharding: Instead of splitting the dataset evenly across workers up front, have
+            each worker pull chunks of ``batches_per_chunk`` batches from a queue on the chief as
+            it runs out of work, so that workers which get expensive items do not hold up the
+            others. Checkpoints record exactly which chunks were completed, and ``batch_idx`` is
+            the index of the batch in the whole dataset. ``max_batches`` still counts batches per
+            worker; it caps the total at ``max_batches`` times the number of workers.
+        batches_per_chunk: The number of consecutive batches a worker takes from the queue at a
+            time, with ``dynamic_sharding``
     """
-    with _initialize_default_inference_context(distributed_context) as core_context:
+    preempt_mode = (
+        core.PreemptMode.ChiefOnly if dynamic_sharding else core.PreemptMode.WorkersAskChief
+    )
+    # Progress checkpoints are created in the background; exiting waits for the one in flight.
+    with _initialize_default_inference_context(
+        distributed_context, preempt_mode
+    ) as core_context, _ProgressCheckpointer() as checkpointer:
         """
         (1) Set up necessary variables to run batch processing
         """
@@ -394,6 +663,8 @@ def torch_batch_process(
         # Validate argument inputs
         if checkpoint_interval <= 0:
             raise ValueError("checkpoint_interval should be a positive integer")
+        if batches_per_chunk <= 0:
+            raise ValueError("batches_per_chunk should be a positive integer")
 
         if dataloader_kwargs is None:
             dataloader_kwargs = {}
@@ -426,6 +697,7 @@ def torch_batch_process(
         rank = core_context.distributed.get_rank()
         latest_checkpoint = info.latest_checkpoint
         skip = 0
+        completed_chunks: Set[int] = set()
 
         # Synchronize default output uuid
         if rank == 0:
@@ -442,6 +714,13 @@ def torch_batch_process(
                 skip = metadata["steps_completed"]
                 logger.info(f"Previous run completed {skip} steps")
                 default_output_uuid = metadata["default_output_uuid"]
+                if metadata.get("dynamic_sharding", False) != dynamic_sharding:
+                    raise ValueError(
+                        "dynamic_sharding must match the setting of the run which created "
+                        f"checkpoint {latest_checkpoint}"
+                    )
+                if dynamic_sharding:
+                    completed_chunks = _load_completed_chunks(path, batch_size, batches_per_chunk)
 
         output_uuid_with_rank = default_output_uuid + f"/rank_{rank}"
 
@@ -451,71 +730,113 @@ def torch_batch_process(
             context=batch_processor_context,
         )
 
-        dataloader = pytorch.DataLoader(
-            dataset=dataset, batch_size=batch_size, shuffle=False, **dataloader_kwargs
-        ).get_data_loader(repeat=False, skip=skip, num_replicas=total_worker, rank=rank)
-
         # Create dummy searcher op to report progress to master
         dummy_searcher_op = None
         # Initialize dummy searcher for progress report
         if rank == 0:
             dummy_searcher_op = core.DummySearcherOperation(1, True)
 
-        dataloader_iterator = iter(dataloader)
-
-        # Enumerate over dataloader directly may cause some workers to iterate for 1 more time
-        # than others when drop_last = False. If those workers synchronize on the last batch_idx,
-        # they would hang forever as other workers never hit that last batch_idx.
-        # To avoid the issue, we calculate and take the ceiling of the iteration count to ensure
-        # all workers iterate for the same number of times.
-        dist_dataset_batch_count = math.ceil(dataset_len / batch_size / total_worker)
-        iterate_length = _validate_iterate_length(max_batches, dist_dataset_batch_count)
-
-        last_checkpoint_idx = -1
-        batch_idx = skip
-        steps_completed = skip
-
         """
         (2) Run batch processing
         """
-        for batch_idx in range(skip, iterate_length):
-            X = next(dataloader_iterator, None)
-            if X is not None:
-                per_batch_processor.process_batch(batch=X, batch_idx=batch_idx)
-            steps_completed = batch_idx + 1
-
-            # Checkpoint and check preemption
-            if (batch_idx + 1) % checkpoint_interval == 0:
-                logger.info(f"Completed steps:  {steps_completed} and checkpointing")
-
+        if dynamic_sharding:
+            # drop_last applies to the batches the chunks are made of.
+            drop_last = dataloader_kwargs.pop("drop_last", False)
+            num_batches = (
+                dataset_len // batch_size if drop_last else math.ceil(dataset_len / batch_size)
+            )
+            num_batches = _validate_iterate_length(
+                None if max_batches is None else max_batches * total_worker, num_batches
+            )
+            steps_completed, preempted = _process_dynamic(
+                core_context,
+                per_batch_processor,
+                dataset,
+                dataset_len,
+                batch_size,
+                num_batches,
+                batches_per_chunk,
+                checkpoint_interval,
+                dataloader_kwargs,
+                completed_chunks,
+                default_output_uuid,
+                dummy_searcher_op,
+                checkpointer,
+            )
+            if preempted:
+                _reduce_metrics(batch_processor_context, core_context, rank, steps_completed)
+                return
+        else:
+            dataloader = pytorch.DataLoader(
+                dataset=dataset, batch_size=batch_size, shuffle=False, **dataloader_kwargs
+            ).get_data_loader(repeat=False, skip=skip, num_replicas=total_worker, rank=rank)
+
+            dataloader_iterator = iter(dataloader)
+
+            # Enumerate over dataloader directly may cause some workers to iterate for 1 more time
+            # than others when drop_last = False. If those workers synchronize on the last
+            # batch_idx, they would hang forever as other workers never hit that last batch_idx.
+            # To avoid the issue, we calculate and take the ceiling of the iteration count to
+            # ensure all workers iterate for the same number of times.
+            dist_dataset_batch_count = math.ceil(dataset_len / batch_size / total_worker)
+            iterate_length = _validate_iterate_length(max_batches, dist_dataset_batch_count)
+
+            last_checkpoint_idx = -1
+            batch_idx = skip
+            steps_completed = skip
+
+            for batch_idx in range(skip, iterate_length):
+                X = next(dataloader_iterator, None)
+                if X is not None:
+                    per_batch_processor.process_batch(batch=X, batch_idx=batch_idx)
+                steps_completed = batch_idx + 1
+
+                # Checkpoint and check preemption
+                if (batch_idx + 1) % checkpoint_interval == 0:
+                    with checkpointer.interval():
+                        logger.info(f"Completed steps:  {steps_completed} and checkpointing")
+
+                        per_batch_processor.on_checkpoint_start()
+                        if core_context._tensorboard_manager is not None:
+                            core_context._tensorboard_manager.sync()
+                        _synchronize_and_checkpoint(
+                            core_context, steps_completed, default_output_uuid, checkpointer
+                        )
+                        last_checkpoint_idx = batch_idx
+
+                        # Report progress can only be done accurately with synchronization
+                        # when rank == 0, dummy_searcher_op will be initialized, but lint is
+                        # complaining therefore, adding additional check here
+                        if rank == 0 and dummy_searcher_op is not None:
+                            _report_progress_to_master(
+                                dummy_searcher_op,
+                                batch_idx,
+                                total_worker,
+                                batch_size,
+                                dataset_len,
+                            )
+
+                        should_preempt = core_context.preempt.should_preempt()
+
+                    # Check preemption
+                    if should_preempt:
+                        # Finish reducing metrics and report to not lose state before preempting
+                        _reduce_metrics(
+                            batch_processor_context, core_context, rank, steps_completed
+                        )
+                        return
+
+            if batch_idx > last_checkpoint_idx:
                 per_batch_processor.on_checkpoint_start()
-                if core_context._tensorboard_manager is not None:
-                    core_context._tensorboard_manager.sync()
-                _synchronize_and_checkpoint(core_context, steps_completed, default_output_uuid)
-                last_checkpoint_idx = batch_idx
-
-                # Report progress can only be done accurately with synchronization
-                # when rank == 0, dummy_searcher_op will be initialized, but lint is complaining
-                # therefore, adding additional check here
-                if rank == 0 and dummy_searcher_op is not None:
-                    _report_progress_to_master(
-                        dummy_searcher_op, batch_idx, total_worker, batch_size, dataset_len
-                    )
-
-                # Check preemption
-                if core_context.preempt.should_preempt():
-                    # Finish reducing metrics and report to not lose state before preempting
-                    _reduce_metrics(batch_processor_context, core_context, rank, steps_completed)
-                    return
+                logger.info(f"Completed steps:  {steps_completed} and checkpointing")
+                _synchronize_and_checkpoint(
+                    core_context, iterate_length, default_output_uuid, checkpointer
+                )
+            checkpointer.wait()
 
         """
         (3) Finish up after batch processing
         """
-        if batch_idx > last_checkpoint_idx:
-            per_batch_processor.on_checkpoint_start()
-            logger.info(f"Completed steps:  {steps_completed} and checkpointing")
-            _synchronize_and_checkpoint(core_context, iterate_length, default_output_uuid)
-
         _reduce_metrics(batch_processor_context, core_context, rank, steps_completed)
         # Finish any tensorboard uploads remaining
         if core_context._tensorboard_manager is not None:
@@ -2,6 +2,8 @@ import json
 import logging
 import os
 import pickle
+import shutil
+import tempfile
 import time
 import uuid
 from pathlib import Path
@@ -12,6 +14,8 @@ from determined.common.api import bindings, errors
 from determined.experimental import client
 
 EXPERIMENT_ID_FILE = "experiment_id.txt"
+_JOURNAL_FILE = "journal.jsonl"
+_TMP_PREFIX = ".tmp_event_"
 logger = logging.getLogger("determined.searcher")
 
 
@@ -20,6 +24,10 @@ class _ExperimentInactiveException(Exception):
         self.exp_state = exp_state
 
 
+def _operations_to_json(operations: List[searcher.Operation]) -> List[Dict[str, Any]]:
+    return [op._to_searcher_operation().to_json() for op in operations]
+
+
 class SearchRunner:
     def __init__(
         self,
@@ -132,54 +140,62 @@ class SearchRunner:
                 if not events:
                     continue
                 logger.info(json.dumps([SearchRunner._searcher_event_as_dict(e) for e in events]))
-                # the first event is an event we have already processed and told master about it
-                # however, we may not have saved the state after that event if we crashed
-                # after POSTing operations but before saving state
+                # Handle every pending event before posting the operations of all of them in one
+                # request, triggered by the last event handled, which acknowledges all of them.
+                # Events up to last_event_id were already handled before a restart; their
+                # operations were saved but may not have reached the master, so they are
+                # resubmitted instead of being handled again.
                 last_event_id = self.state.last_event_id
-                first_event = True
+                operations: List[searcher.Operation] = []
+                triggering_event: Optional[bindings.v1SearcherEvent] = None
                 for event in events:
                     if (
-                        first_event
-                        and last_event_id != 0
+                        last_event_id != 0
                         and last_event_id >= event.id >= 0
                         and prior_operations is not None
                     ):
-                        logger.info(f"Resubmitting operations for event.id={event.id}")
-                        operations = prior_operations
-                    else:
-                        if event.experimentInactive:
-                            logger.info(
-                                f"experiment {self.state.experiment_id} is "
-                                f"inactive; state={event.experimentInactive.experimentState}"
-                            )
-                            if (
-                                event.experimentInactive.experimentState
-                                == bindings.experimentv1State.COMPLETED
-                            ):
-                                self.state.experiment_completed = True
-                            elif (
-                                event.experimentInactive.experimentState
-                                == bindings.experimentv1State.ERROR
-                            ):
-                                self.state.experiment_failed = True
-
-                            if (
-                                event.experimentInactive.experimentState
-                                == bindings.experimentv1State.PAUSED
-                            ):
-                                self._show_experiment_paused_msg()
-                            else:
-                                experiment_is_active = False
-                            break
-
-                        operations = self._get_operations(event)
-
-                        # save state
-                        self.state.last_event_id = event.id
-                        self.save_state(experiment_id, operations)
-
-                    first_event = False
-                    self.post_operations(session, experiment_id, event, operations)
+                        if triggering_event is None:
+                            logger.info(f"Resubmitting operations for event.id={last_event_id}")
+                            operations.extend(prior_operations)
+                        triggering_event = event
+                        continue
+
+                    if event.experimentInactive:
+                        logger.info(
+                            f"experiment {self.state.experiment_id} is "
+                            f"inactive; state={event.experimentInactive.experimentState}"
+                        )
+                        if (
+                            event.experimentInactive.experimentState
+                            == bindings.experimentv1State.COMPLETED
+                        ):
+                            self.state.experiment_completed = True
+                        elif (
+                            event.experimentInactive.experimentState
+                            == bindings.experimentv1State.ERROR
+                        ):
+                            self.state.experiment_failed = True
+
+                        if (
+                            event.experimentInactive.experimentState
+                            == bindings.experimentv1State.PAUSED
+                        ):
+                            self._show_experiment_paused_msg()
+                        else:
+                            experiment_is_active = False
+                        break
+
+                    event_operations = self._get_operations(event)
+                    operations.extend(event_operations)
+
+                    # save state
+                    self.state.last_event_id = event.id
+                    self._save_event_state(experiment_id, event, event_operations, operations)
+                    triggering_event = event
+
+                if triggering_event is not None:
+                    self.post_operations(session, experiment_id, triggering_event, operations)
+                    prior_operations = None
 
         except KeyboardInterrupt:
             print("Runner interrupted")
@@ -231,6 +247,20 @@ class SearchRunner:
     def save_state(self, experiment_id: int, operations: List[searcher.Operation]) -> None:
         pass
 
+    def _save_event_state(
+        self,
+        experiment_id: int,
+        event: bindings.v1SearcherEvent,
+        event_operations: List[searcher.Operation],
+        operations: List[searcher.Operation],
+    ) -> None:
+        """
+        Called after each event is handled. ``event_operations`` are the operations returned for
+        the event, and ``operations`` are all of the operations which have not been posted yet,
+        including those.
+        """
+        self.save_state(experiment_id, operations)
+
     def _show_experiment_paused_msg(self) -> None:
         pass
 
@@ -247,16 +277,51 @@ class LocalSearchRunner(SearchRunner):
     reacts to event notifications coming from the running experiments by forwarding
     them to event handler methods in your ``SearchMethod`` implementation and sending
     the returned operations back to the experiment.
+
+    The state of the search is saved as snapshots in ``searcher_dir``, from which an interrupted
+    search is resumed by running it again with the same ``searcher_dir``. By default a snapshot is
+    taken after every event. With ``snapshot_every_events`` or ``snapshot_every_seconds``,
+    snapshots are taken less often, and the events handled since the last snapshot are appended to
+    a journal instead. On resumption they are replayed through the ``SearchMethod``, which must
+    therefore return the same operations as the first time, including the request IDs of any
+    trials it creates; for example, by deriving request IDs from a random number generator whose
+    state it saves in ``save_method_state()``. Resumption fails if the replayed operations differ.
+
+    Args:
+        search_method (SearchMethod): the search method to run.
+        searcher_dir (pathlib.Path, optional): the directory in which to save the state of the
+            search. (default: the current working directory)
+        snapshot_every_events (int, optional): take a snapshot after this many events.
+            (default: ``1``)
+        snapshot_every_seconds (float, optional): take a snapshot after the first event handled
+            this many seconds after the previous snapshot. (default: ``None``)
+        max_snapshots (int): the number of most recent snapshots to keep. (default: ``2``)
     """
 
     def __init__(
         self,
         search_method: searcher.SearchMethod,
         searcher_dir: Optional[Path] = None,
+        *,
+        snapshot_every_events: Optional[int] = 1,
+        snapshot_every_seconds: Optional[float] = None,
+        max_snapshots: int = 2,
     ):
         super().__init__(search_method)
         self.state_path = None
 
+        if snapshot_every_events is None and snapshot_every_seconds is None:
+            raise ValueError(
+                "at least one of snapshot_every_events or snapshot_every_seconds must be set"
+            )
+        if max_snapshots < 1:
+            raise ValueError(f"max_snapshots must be at least 1, not {max_snapshots}")
+        self.snapshot_every_events = snapshot_every_events
+        self.snapshot_every_seconds = snapshot_every_seconds
+        self.max_snapshots = max_snapshots
+        self._events_since_snapshot = 0
+        self._last_snapshot_time = time.monotonic()
+
         self.searcher_dir = searcher_dir or Path.cwd()
         if not self.searcher_dir.exists():
             self.searcher_dir.mkdir(parents=True)
@@ -324,22 +389,46 @@ class LocalSearchRunner(SearchRunner):
         )
         with state_path.joinpath("ops").open("rb") as f:
             operations = pickle.load(f)
+
+        # Replay the events which were handled after the snapshot was taken.
+        for event, journaled_operations, new_batch in self._read_journal(experiment_searcher_dir):
+            if event.id <= self.state.last_event_id:
+                continue
+            logger.info(f"Replaying event.id={event.id}")
+            event_operations = self._get_operations(event)
+            operations = event_operations if new_batch else operations + event_operations
+            if _operations_to_json(event_operations) != journaled_operations:
+                raise RuntimeError(
+                    f"Replaying event.id={event.id} returned different operations than when it "
+                    "was first handled. The SearchMethod must be deterministic to be used with "
+                    "snapshot_every_events or snapshot_every_seconds."
+                )
+            self.state.last_event_id = event.id
+        if experiment_searcher_dir.joinpath(_JOURNAL_FILE).exists():
+            # Compact the replayed events into a new snapshot, which also drops any partially
+            # written journal entry before new events are appended after it.
+            self.save_state(experiment_id, operations)
         return loaded_experiment_id, operations
 
     def save_state(self, experiment_id: int, operations: List[searcher.Operation]) -> None:
         experiment_searcher_dir = self._get_state_path(experiment_id)
         state_path = experiment_searcher_dir.joinpath(f"event_{self.state.last_event_id}")
 
-        if not state_path.exists():
-            state_path.mkdir(parents=True)
-
+        # Write the snapshot to a temporary directory and move it into place once it is complete,
+        # so that a crash mid-write never leaves a partial snapshot behind under its final name.
+        tmp_path = Path(tempfile.mkdtemp(dir=experiment_searcher_dir, prefix=_TMP_PREFIX))
         self.search_method.save(
             self.state,
-            state_path,
+            tmp_path,
             experiment_id=experiment_id,
         )
-        with state_path.joinpath("ops").open("wb") as ops_file:
+        with tmp_path.joinpath("ops").open("wb") as ops_file:
             pickle.dump(operations, ops_file)
+        if state_path.exists():
+            # Only possible when an event is handled again after a crash; the previous snapshot
+            # is not referenced by event_id in that case.
+            shutil.rmtree(state_path)
+        os.replace(tmp_path, state_path)
 
         # commit
         event_id_path = experiment_searcher_dir.joinpath("event_id")
@@ -348,6 +437,74 @@ class LocalSearchRunner(SearchRunner):
             f.write(str(self.state.last_event_id))
         os.replace(event_id_new_path, event_id_path)
 
+        # Events up to this snapshot no longer need to be replayed.
+        try:
+            experiment_searcher_dir.joinpath(_JOURNAL_FILE).unlink()
+        except FileNotFoundError:
+            pass
+        self._events_since_snapshot = 0
+        self._last_snapshot_time = time.monotonic()
+        self._prune_snapshots(experiment_searcher_dir)
+
+    def _save_event_state(
+        self,
+        experiment_id: int,
+        event: bindings.v1SearcherEvent,
+        event_operations: List[searcher.Operation],
+        operations: List[searcher.Operation],
+    ) -> None:
+        self._events_since_snapshot += 1
+        if (
+            self.snapshot_every_events is not None
+            and self._events_since_snapshot >= self.snapshot_every_events
+        ) or (
+            self.snapshot_every_seconds is not None
+            and time.monotonic() - self._last_snapshot_time >= self.snapshot_every_seconds
+        ):
+            self.save_state(experiment_id, operations)
+            return
+        journal_path = self._get_state_path(experiment_id).joinpath(_JOURNAL_FILE)
+        entry = {
+            "event": event.to_json(),
+            "operations": _operations_to_json(event_operations),
+            # Whether the operations posted after this event start with this event's.
+            "newBatch": len(operations) == len(event_operations),
+        }
+        with journal_path.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def _read_journal(
+        self, experiment_searcher_dir: Path
+    ) -> List[Tuple[bindings.v1SearcherEvent, List[Dict[str, Any]], bool]]:
+        entries = []
+        try:
+            with experiment_searcher_dir.joinpath(_JOURNAL_FILE).open("r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last line may have been cut short by a crash while it was written,
+                        # before the event's operations were posted.
+                        logger.warning("Ignoring a partially written searcher journal entry")
+                        break
+                    event = bindings.v1SearcherEvent.from_json(entry["event"])
+                    entries.append((event, entry["operations"], entry["newBatch"]))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _prune_snapshots(self, experiment_searcher_dir: Path) -> None:
+        snapshots = []
+        for path in experiment_searcher_dir.iterdir():
+            if path.name.startswith(_TMP_PREFIX):
+                # Left behind by a crash during save_state().
+                shutil.rmtree(path, ignore_errors=True)
+            elif path.name.startswith("event_") and path.name[len("event_") :].isdigit():
+                snapshots.append((int(path.name[len("event_") :]), path))
+        snapshots.sort()
+        for _, path in snapshots[: -self.max_snapshots]:
+            shutil.rmtree(path, ignore_errors=True)
+
     def _get_state_path(self, experiment_id: int) -> Path:
         return self.searcher_dir.joinpath(f"exp_{experiment_id}")
 
@@ -27,6 +27,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     SupportsFloat,
     Tuple,
@@ -156,12 +157,16 @@ def merge_dicts(base_dict: Dict[Any, Any], source_dict: Dict[Any, Any]) -> Dict[
 
 
 def validate_batch_metrics(batch_metrics: List[Dict[str, Any]]) -> None:
-    metric_dict = _list_to_dict(batch_metrics)
+    _validate_batch_metrics(_list_to_dict(batch_metrics), batch_metrics)
+
 
+def _validate_batch_metrics(
+    metric_dict: Dict[str, List[Any]], batch_metrics: List[Dict[str, Any]]
+) -> None:
     # We expect that all batches have the same set of metrics.
     metric_dict_keys = metric_dict.keys()
-    for idx, metric_dict in zip(range(len(batch_metrics)), batch_metrics):
-        keys = metric_dict.keys()
+    for idx, batch in zip(range(len(batch_metrics)), batch_metrics):
+        keys = batch.keys()
         if metric_dict_keys == keys:
             continue
 
@@ -173,7 +178,7 @@ def make_metrics(num_inputs: Optional[int], batch_metrics: List[Dict[str, Any]])
     import numpy as np
 
     metric_dict = _list_to_dict(batch_metrics)
-    validate_batch_metrics(batch_metrics)
+    _validate_batch_metrics(metric_dict, batch_metrics)
 
     avg_metrics = {}  # type: Dict[str, Optional[float]]
     for name, values in metric_dict.items():
@@ -196,6 +201,96 @@ def make_metrics(num_inputs: Optional[int], batch_metrics: List[Dict[str, Any]])
     return metrics
 
 
+def _jsonable(obj: Any) -> Any:
+    """Convert obj, recursively, into types which json.dumps can encode as they are."""
+    import numpy as np
+
+    if isinstance(obj, (str, bool, type(None))):
+        # Needs no fancy encoding.
+        return obj
+    if isinstance(obj, numbers.Integral):
+        # int, np.int64, etc.
+        return int(obj)
+    if isinstance(obj, numbers.Number):
+        obj = cast(SupportsFloat, obj)
+        # float, np.float64, etc.  Serialize nan/±infinity as strings.
+        if math.isnan(obj):
+            return "NaN"
+        if math.isinf(obj):
+            return "Infinity" if float(obj) > 0.0 else "-Infinity"
+        return float(obj)
+    if isinstance(obj, bytes):
+        # Assume bytes are utf8 (json can't encode arbitrary binary data).
+        return obj.decode("utf8")
+    if isinstance(obj, (list, tuple)):
+        # Recurse into lists.
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, dict):
+        # Recurse into dicts.
+        return {k: _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, np.ndarray):
+        # Expand arrays into lists, then recurse.
+        return _jsonable(obj.tolist())
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.name
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    # Objects that provide their own custom JSON serialization.
+    if hasattr(obj, "__json__"):
+        return obj.__json__()
+    raise TypeError("Unserializable object {} of type {}".format(obj, type(obj)))
+
+
+def _jsonable_fast(obj: Any) -> Any:
+    """
+    Like _jsonable, but dispatch on exact types and convert numpy data in bulk.
+
+    Plain Python values are returned after a single type check, numpy arrays are expanded with one
+    tolist() each, and lists of same-keyed dicts, like batch metrics, are converted one column at a
+    time, so a column of numpy scalars becomes a single numpy array.  Anything else, including nan
+    and ±infinity floats, goes through _jsonable, so the result is always the same as _jsonable's.
+    """
+    import numpy as np
+
+    t = type(obj)
+    if t is str or t is int or t is bool or obj is None:
+        return obj
+    if t is float:
+        return obj if math.isfinite(obj) else _jsonable(obj)
+    if t is dict:
+        return {k: _jsonable_fast(v) for k, v in obj.items()}
+    if t is list or t is tuple:
+        if len(obj) > 1 and type(obj[0]) is dict and obj[0]:
+            keys = tuple(obj[0])
+            if all(type(d) is dict and tuple(d) == keys for d in obj):
+                columns = [_jsonable_column([d[k] for d in obj]) for k in keys]
+                return [dict(zip(keys, row)) for row in zip(*columns)]
+        return _jsonable_column(obj)
+    if t is np.ndarray:
+        if obj.dtype.kind in "iub":
+            return obj.tolist()
+        # np.longdouble.tolist() would not produce Python floats.
+        if obj.dtype.kind == "f" and obj.dtype.itemsize <= 8 and np.isfinite(obj).all():
+            return obj.tolist()
+    return _jsonable(obj)
+
+
+def _jsonable_column(values: Sequence[Any]) -> List[Any]:
+    import numpy as np
+
+    if len(values) > 1:
+        t = type(values[0])
+        if issubclass(t, (np.integer, np.floating)) and all(type(v) is t for v in values):
+            arr = np.array(values)
+            if arr.dtype.kind in "iu" or (arr.dtype.kind == "f" and np.isfinite(arr).all()):
+                # np.longdouble.tolist() would not produce Python floats.
+                if arr.dtype.itemsize <= 8:
+                    return arr.tolist()  # type: ignore
+    return [_jsonable_fast(v) for v in values]
+
+
 def json_encode(obj: Any, indent: Optional[str] = None, sort_keys: bool = False) -> str:
     """
     Encode things as json, with an extra preprocessing step to handle some non-standard types.
@@ -203,47 +298,7 @@ def json_encode(obj: Any, indent: Optional[str] = None, sort_keys: bool = False)
     Note: json has a "default" argument that accepts something like our preprocessing step,
     except it is only invoked for non-native types (i.e. no catching nan or inf floats).
     """
-    import numpy as np
-
-    def jsonable(obj: Any) -> Any:
-        if isinstance(obj, (str, bool, type(None))):
-            # Needs no fancy encoding.
-            return obj
-        if isinstance(obj, numbers.Integral):
-            # int, np.int64, etc.
-            return int(obj)
-        if isinstance(obj, numbers.Number):
-            obj = cast(SupportsFloat, obj)
-            # float, np.float64, etc.  Serialize nan/±infinity as strings.
-            if math.isnan(obj):
-                return "NaN"
-            if math.isinf(obj):
-                return "Infinity" if float(obj) > 0.0 else "-Infinity"
-            return float(obj)
-        if isinstance(obj, bytes):
-            # Assume bytes are utf8 (json can't encode arbitrary binary data).
-            return obj.decode("utf8")
-        if isinstance(obj, (list, tuple)):
-            # Recurse into lists.
-            return [jsonable(v) for v in obj]
-        if isinstance(obj, dict):
-            # Recurse into dicts.
-            return {k: jsonable(v) for k, v in obj.items()}
-        if isinstance(obj, np.ndarray):
-            # Expand arrays into lists, then recurse.
-            return jsonable(obj.tolist())
-        if isinstance(obj, datetime.datetime):
-            return obj.isoformat()
-        if isinstance(obj, enum.Enum):
-            return obj.name
-        if isinstance(obj, uuid.UUID):
-            return str(obj)
-        # Objects that provide their own custom JSON serialization.
-        if hasattr(obj, "__json__"):
-            return obj.__json__()
-        raise TypeError("Unserializable object {} of type {}".format(obj, type(obj)))
-
-    return json.dumps(jsonable(obj), indent=indent, sort_keys=sort_keys)
+    return json.dumps(_jsonable_fast(obj), indent=indent, sort_keys=sort_keys)
 
 
 def write_user_code(path: pathlib.Path, on_cluster: bool) -> None:
@@ -0,0 +1,190 @@
+"""
+Measure how long DeepSpeedTrial's ZeRO checkpoints take to save with each shard uploaded while the
+next is written, against uploading the whole directory after saving, and how much each node
+downloads to restore one with and without skipping other ranks' shards.
+
+Ranks run as threads with --engines mocked ZeRO-3 model engines each, and every engine writes one
+shard of model states and one of optimizer states per rank, at --write-mbps. Checkpoint storage is
+a local directory which takes as long to upload to and download from as a link of --link-mbps per
+transfer would. DeepSpeed must be installed, but no GPU is needed.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_deepspeed_checkpoint --ranks 8 --nodes 2 --shard-mb 64
+"""
+import argparse
+import logging
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import torch
+
+from determined import core
+from determined.common import storage
+from determined.pytorch.deepspeed import _deepspeed_trial
+from tests import parallel
+
+MB = 1024 * 1024
+
+
+class ThrottledStorageManager(storage.CloudStorageManager):
+    """Keep checkpoints in a local directory, but transfer files at a limited bandwidth."""
+
+    def __init__(self, base_path: str, remote: pathlib.Path, mbps: float) -> None:
+        super().__init__(base_path)
+        self.remote = remote
+        self.mbps = mbps
+        self.downloaded = 0
+        self.lock = threading.Lock()
+
+    def _transfer(self, src: pathlib.Path, dst: pathlib.Path) -> None:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dst)
+        time.sleep(src.stat().st_size / MB / self.mbps)
+
+    def upload(
+        self, src: Union[str, os.PathLike], dst: str, paths: Optional[storage.Paths] = None
+    ) -> None:
+        for name in sorted(paths if paths is not None else self._list_directory(src)):
+            if not name.endswith("/"):
+                self._transfer(pathlib.Path(src, name), self.remote.joinpath(dst, name))
+
+    def download(
+        self,
+        src: str,
+        dst: Union[str, os.PathLike],
+        selector: Optional[storage.Selector] = None,
+    ) -> None:
+        for name, size in self._list_directory(self.remote.joinpath(src)).items():
+            if name.endswith("/") or (selector is not None and not selector(name)):
+                continue
+            self._transfer(self.remote.joinpath(src, name), pathlib.Path(dst, name))
+            with self.lock:
+                self.downloaded += size
+
+    def delete(self, tgt: str, globs: List[str]) -> Dict[str, int]:
+        shutil.rmtree(self.remote.joinpath(tgt))
+        return {}
+
+
+class ThrottledCheckpointEngine:
+    def __init__(self, mbps: float) -> None:
+        self.mbps = mbps
+
+    def save(self, state_dict: Dict[str, torch.Tensor], path: str) -> None:
+        torch.save(state_dict, path)
+        size = sum(t.numel() * t.element_size() for t in state_dict.values())
+        time.sleep(size / MB / self.mbps)
+
+
+class MockZeroEngine:
+    """One rank's ZeRO-3 model engine, as far as checkpointing goes."""
+
+    def __init__(self, args: argparse.Namespace, dp_rank: int) -> None:
+        self.args = args
+        self.dp_rank = dp_rank
+        self.checkpoint_engine = ThrottledCheckpointEngine(args.write_mbps)
+
+    def zero_optimization(self) -> bool:
+        return True
+
+    def zero_elastic_checkpoint(self) -> bool:
+        return False
+
+    def _get_ckpt_name(self, path: str, tag: str) -> str:
+        return os.path.join(path, tag, f"zero_pp_rank_{self.dp_rank}_mp_rank_00_model_states.pt")
+
+    def _get_zero_ckpt_name(self, path: str, tag: str) -> str:
+        return os.path.join(path, tag, f"zero_pp_rank_{self.dp_rank}_mp_rank_00_optim_states.pt")
+
+    def save_checkpoint(self, path: str, tag: str) -> None:
+        os.makedirs(os.path.join(path, tag), exist_ok=True)
+        model = torch.zeros(self.args.model_mb * MB, dtype=torch.uint8)
+        self.checkpoint_engine.save({"module": model}, self._get_ckpt_name(path, tag))
+        shard = torch.zeros(self.args.shard_mb * MB, dtype=torch.uint8)
+        self.checkpoint_engine.save({"optimizer": shard}, self._get_zero_ckpt_name(path, tag))
+
+
+def run(args: argparse.Namespace, stream: bool, tmp: pathlib.Path) -> Tuple[float, Dict[bool, int]]:
+    """Save a checkpoint, then restore it; return the save time and bytes downloaded per mode."""
+    remote = tmp.joinpath("remote")
+    downloaded = {}
+    with parallel.Execution(args.ranks, local_size=args.ranks // args.nodes) as pex:
+
+        @pex.run
+        def save() -> Tuple[float, str]:
+            # Each node has its own local directory.
+            node_manager = ThrottledStorageManager(
+                str(tmp.joinpath(f"local{pex.cross_rank}")), remote, args.link_mbps
+            )
+            checkpoint = core.DummyCheckpointContext(pex.distributed, node_manager)
+            engines = [MockZeroEngine(args, pex.rank) for _ in range(args.engines)]
+            metadata = {"steps_completed": 1}
+            # The stream only uploads anything if store_path is streaming.
+            shards = core._ShardStream()
+            start = time.perf_counter()
+            if stream:
+                store_path = checkpoint._store_path_streaming(metadata, shards)
+            else:
+                store_path = checkpoint.store_path(metadata, shard=True)
+            with store_path as (path, storage_id):
+                if pex.local_rank == 0:
+                    path.mkdir(parents=True, exist_ok=True)
+                _ = pex.distributed.gather_local(None)
+                with _deepspeed_trial._stream_engine_saves(engines, shards):
+                    for i, engine in enumerate(engines):
+                        engine.save_checkpoint(str(path), f"model{i}")
+            return time.perf_counter() - start, storage_id
+
+        elapsed = max(t for t, _ in save)
+        storage_id = save[0][1]
+
+        for select in (False, True):
+
+            @pex.run
+            def restore() -> int:
+                node_manager = ThrottledStorageManager(
+                    str(tmp.joinpath(f"restore{pex.cross_rank}")), remote, args.link_mbps
+                )
+                checkpoint = core.DummyCheckpointContext(pex.distributed, node_manager)
+                selector = None
+                if select:
+                    engines = [MockZeroEngine(args, pex.rank) for _ in range(args.engines)]
+                    selector = _deepspeed_trial._shard_selector(engines, pex.rank)
+                with checkpoint.restore_path(storage_id, selector=selector):
+                    pass
+                return node_manager.downloaded
+
+            downloaded[select] = sum(restore)
+    return elapsed, downloaded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ranks", type=int, default=4)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--engines", type=int, default=2)
+    parser.add_argument("--model-mb", type=int, default=8, help="model states per rank")
+    parser.add_argument("--shard-mb", type=int, default=16, help="optimizer states per rank")
+    parser.add_argument("--write-mbps", type=float, default=200.0)
+    parser.add_argument("--link-mbps", type=float, default=100.0)
+    args = parser.parse_args()
+
+    logging.getLogger("determined").setLevel(logging.ERROR)
+    print(f"{'uploads':<11} {'save time':>10}")
+    for stream in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            elapsed, downloaded = run(args, stream, pathlib.Path(tmp))
+        print(f"{'streamed' if stream else 'inline':<11} {elapsed:>9.2f}s")
+    print(f"{'restore':<11} {'downloaded':>10}")
+    for select, size in downloaded.items():
+        print(f"{'own shards' if select else 'all':<11} {size / MB:>8.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measure the DeepSpeed Autotune search methods' per-event cost as the number of trials grows, by
+driving a search method through synthetic searcher events: each trial the method creates either
+reports a random metric or exits early with an error, and is then closed.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_dsat_tracker --search-method random --trials 5000
+"""
+import argparse
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from typing import Deque, List
+
+from determined import searcher
+from determined.pytorch.dsat import _defaults, _utils
+from determined.pytorch.dsat._run_dsat import (
+    get_custom_dsat_exp_conf_from_args,
+    get_search_method_class,
+)
+from tests.experiment.pytorch.test_deepspeed_autotuning import (
+    CONFIG_PATH,
+    MODEL_DIR,
+    MODEL_INFO_PROFILE_METRIC_FIXTURE,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--search-method",
+        default="random",
+        choices=[m for m in _defaults.ALL_SEARCH_METHOD_NAMES if not m.startswith("_")],
+    )
+    parser.add_argument("--trials", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Duplicate configurations are expected when sampling this many trials.
+    logging.getLogger("determined.pytorch").setLevel(logging.ERROR)
+
+    dsat_argv = [
+        args.search_method,
+        str(CONFIG_PATH),
+        str(MODEL_DIR),
+        "--max-trials",
+        str(args.trials),
+        "--max-concurrent-trials",
+        str(args.concurrency),
+    ]
+    if args.search_method == "random":
+        dsat_argv += ["--early-stopping", str(args.trials)]
+    dsat_args = _utils.get_full_parser().parse_args(dsat_argv)
+    dsat_args.experiment_id = 0
+    exp_config = get_custom_dsat_exp_conf_from_args(dsat_args)
+    search_method = get_search_method_class(args.search_method)(dsat_args, exp_config)
+    searcher_state = searcher.SearcherState()
+    rng = random.Random(0)
+
+    pending: Deque[uuid.UUID] = deque()
+
+    def enqueue(ops: List[searcher.Operation]) -> None:
+        pending.extend(op.request_id for op in ops if isinstance(op, searcher.Create))
+
+    enqueue(search_method.initial_operations(searcher_state))
+    profile_request_id = pending.popleft()
+    search_method.on_validation_completed(
+        searcher_state, profile_request_id, MODEL_INFO_PROFILE_METRIC_FIXTURE, 1
+    )
+    enqueue(search_method.on_trial_closed(searcher_state, profile_request_id))
+
+    events = 0
+    start = time.perf_counter()
+    while pending and not search_method.should_shutdown():
+        request_id = pending.popleft()
+        if rng.random() < args.error_rate:
+            search_method.on_trial_exited_early(
+                searcher_state, request_id, searcher.ExitedReason.ERRORED
+            )
+        else:
+            metric = {search_method.trial_tracker.searcher_metric: rng.random()}
+            search_method.on_validation_completed(searcher_state, request_id, metric, 1)
+        searcher_state.trials_closed.add(request_id)
+        enqueue(search_method.on_trial_closed(searcher_state, request_id))
+        events += 2
+    elapsed = time.perf_counter() - start
+
+    trial_tracker = search_method.trial_tracker
+    print(f"trials: {len(trial_tracker)}, completed: {trial_tracker.num_completed_trials}")
+    print(f"elapsed: {elapsed:.2f} s, {elapsed / events * 1e3:.3f} ms/event")
+
+
+if __name__ == "__main__":
+    main()
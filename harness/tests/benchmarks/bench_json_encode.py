@@ -0,0 +1,68 @@
+"""
+Measure util.json_encode on a training metrics payload with many per-batch entries of numpy
+scalars, like the ones which PyTorchTrial reports to the master, against the previous encoder which
+converted the whole payload in pure Python before encoding it.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_json_encode --batches 10000 --metrics 8
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from determined import util
+
+
+def make_payload(batches: int, metrics: int, nan: bool) -> Any:
+    rng = np.random.default_rng(0)
+    batch_metrics = [
+        {f"metric_{m}": np.float32(v) for m, v in enumerate(rng.random(metrics))}
+        for _ in range(batches)
+    ]
+    if nan:
+        batch_metrics[-1]["metric_0"] = np.float32("nan")
+    avg_metrics = util.make_metrics(None, batch_metrics)["avg_metrics"]
+    return {
+        "metrics": {
+            "trialId": 1,
+            "trialRunId": 1,
+            "stepsCompleted": batches,
+            "metrics": {"avgMetrics": avg_metrics, "batchMetrics": batch_metrics},
+        },
+        "group": "training",
+    }
+
+
+def measure(encode: Callable[[Any], str], payload: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(payload)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batches", type=int, default=10000)
+    parser.add_argument("--metrics", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for nan in (False, True):
+        payload = make_payload(args.batches, args.metrics, nan)
+        assert util.json_encode(payload) == json.dumps(util._jsonable(payload))
+        previous = measure(lambda p: json.dumps(util._jsonable(p)), payload, args.repeat)
+        current = measure(util.json_encode, payload, args.repeat)
+        print(
+            f"nan={nan}: previous {previous * 1e3:.1f} ms, json_encode {current * 1e3:.1f} ms"
+            f" ({previous / current:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare the latency of reducing TFKerasTrial training logs one key at a time against reducing them
+with the controller's single fused collective.
+
+This needs horovod built with Gloo and tensorflow, but no GPUs. Run it from the harness directory:
+
+    horovodrun --gloo -np 4 python -m tests.benchmarks.bench_keras_allreduce --metrics 32
+"""
+import argparse
+import inspect
+import time
+import types
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from determined.horovod import hvd
+from determined.keras import _tf_keras_trial
+
+
+def per_key_allreduce(logs: Dict[str, Any], num_inputs: int) -> None:
+    """The reduction as it was before it was fused: one collective per key and for the inputs."""
+
+    def allreduce(value: Any, average: bool, name: str) -> Any:
+        kwargs: Dict[str, Any] = {"value": value, "name": name}
+        if "op" in inspect.signature(hvd.allreduce).parameters:
+            kwargs["op"] = hvd.Average if average else hvd.Sum
+            kwargs["average"] = None
+        else:
+            kwargs["average"] = average
+        return hvd.allreduce(**kwargs)
+
+    allreduce(num_inputs, average=False, name="train_num_inputs")
+    for key in sorted(logs):
+        np.array(allreduce(logs[key], average=True, name=key))
+
+
+def fused_allreduce() -> Callable[[Dict[str, Any], int], None]:
+    """The controller's fused reduction, bound to a stand-in for the controller."""
+    controller = types.SimpleNamespace(
+        context=types.SimpleNamespace(distributed=types.SimpleNamespace(size=hvd.size()))
+    )
+    cls = _tf_keras_trial.TFKerasTrialController
+    for name in ("_convert_possible_tensor", "_hvd_allreduce"):
+        setattr(controller, name, getattr(cls, name).__get__(controller))
+
+    def reduce(logs: Dict[str, Any], num_inputs: int) -> None:
+        cls._allreduce_logs(controller, logs, [num_inputs])  # type: ignore
+
+    return reduce
+
+
+def time_it(fn: Callable[[Dict[str, Any], int], None], logs: Dict[str, Any], iters: int) -> float:
+    for _ in range(5):
+        fn(logs, 64)
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn(logs, 64)
+    return (time.perf_counter() - start) / iters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--metrics", type=int, default=32, help="number of scalar logs")
+    parser.add_argument("--iters", type=int, default=200)
+    args = parser.parse_args()
+
+    hvd.require_horovod_type("tensorflow.keras", "benchmarking log reduction")
+    hvd.init()
+
+    logs = {f"metric_{i}": np.float32(i) for i in range(args.metrics)}
+    per_key = time_it(per_key_allreduce, logs, args.iters)
+    fused = time_it(fused_allreduce(), logs, args.iters)
+    if hvd.rank() == 0:
+        print(f"workers: {hvd.size()}, scalar logs: {args.metrics}")
+        print(f"per-key allreduce: {per_key * 1e3:8.3f} ms/step")
+        print(f"fused allreduce:   {fused * 1e3:8.3f} ms/step ({per_key / fused:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
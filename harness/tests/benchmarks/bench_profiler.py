@@ -0,0 +1,57 @@
+"""
+Measure the profiler's own overhead per sample: recording samples into a MetricBatch, encoding them
+at flush time, and handing them to a ProfilerSenderThread whose sender only serializes the batches
+to json instead of posting them to the master.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_profiler --series 16 --samples 100 --flushes 200
+"""
+import argparse
+import json
+import queue
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from determined import profiler
+from determined.common.api import TrialProfilerMetricsBatch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=16, help="metrics sampled per interval")
+    parser.add_argument("--samples", type=int, default=100, help="samples per series per flush")
+    parser.add_argument("--flushes", type=int, default=200)
+    args = parser.parse_args()
+
+    sent_bytes = 0
+
+    def send_batch(master_url: str, batches: List[TrialProfilerMetricsBatch]) -> None:
+        nonlocal sent_bytes
+        sent_bytes += len(json.dumps({"batches": [b.__dict__ for b in batches]}))
+
+    send_queue: queue.Queue = queue.Queue()
+    sender = profiler.ProfilerSenderThread(send_queue, "", 1, send_batch)
+    sender.start()
+
+    batch = profiler.MetricBatch("1", "agent")
+    names = [f"metric_{i}" for i in range(args.series)]
+    start = time.perf_counter()
+    for flush in range(args.flushes):
+        for sample in range(args.samples):
+            measurement = profiler.Measurement(datetime.now(timezone.utc), sample, 0.5)
+            for name in names:
+                batch.append(profiler.MetricType.SYSTEM, name, measurement)
+        send_queue.put(batch.consume())
+    send_queue.put(profiler.ShutdownMessage())
+    sender.join()
+    elapsed = time.perf_counter() - start
+
+    total = args.series * args.samples * args.flushes
+    print(f"samples: {total}, sent: {sent_bytes / 1e6:.1f} MB")
+    print(f"overhead: {elapsed / total * 1e6:.3f} us/sample")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measure the throughput of det's tunnel listener (the one behind `det shell`, `det tunnel --listener`
+and `det e create --publish`) against a local fake master that echoes everything back, with both the
+event-loop and the thread-per-connection implementations.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_proxy --megabytes 64 --connections 1 16 64
+"""
+import argparse
+import os
+import threading
+import time
+from typing import List, Tuple
+
+from tests.cli.test_proxy import EchoMaster, echo, listener
+
+
+def measure(port: int, connections: int, size: int) -> Tuple[float, int]:
+    """Return the elapsed time and the peak number of threads the tunnel listener started."""
+    data = os.urandom(size)
+    ok: List[bool] = []
+    done = threading.Event()
+    before = set(threading.enumerate())
+    peak = [0]
+
+    def run() -> None:
+        ok.append(echo(port, data) == data)
+
+    def monitor() -> None:
+        while not done.wait(0.01):
+            tunnel_threads = [
+                t
+                for t in threading.enumerate()
+                if t not in before and not t.name.startswith(("bench-", "echo-"))
+            ]
+            peak[0] = max(peak[0], len(tunnel_threads))
+
+    clients = [threading.Thread(target=run, name="bench-client") for _ in range(connections)]
+    monitor_thread = threading.Thread(target=monitor, name="bench-monitor")
+    monitor_thread.start()
+    start = time.perf_counter()
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    elapsed = time.perf_counter() - start
+    done.set()
+    monitor_thread.join()
+    assert all(ok) and len(ok) == connections
+    return elapsed, peak[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=int, default=64, help="data echoed per run")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--coalesce-ms", type=int, default=0)
+    args = parser.parse_args()
+
+    for var in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"):
+        os.environ.pop(var, None)
+
+    master = EchoMaster()
+    try:
+        for threads in (True, False):
+            name = "threads" if threads else "asyncio"
+            with listener(master, threads, args.coalesce_ms) as port:
+                for connections in args.connections:
+                    size = args.megabytes * 1024 * 1024 // connections
+                    elapsed, threads_used = measure(port, connections, size)
+                    mb = size * connections / 1024 / 1024
+                    print(
+                        f"{name}: {connections} connections, {mb:.0f} MB each way in"
+                        f" {elapsed:.2f} s: {mb / elapsed:.1f} MB/s, up to {threads_used} threads"
+                    )
+    finally:
+        master.close()
+
+
+if __name__ == "__main__":
+    main()
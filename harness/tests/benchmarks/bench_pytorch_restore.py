@@ -0,0 +1,120 @@
+"""
+Measure how long PyTorchTrial takes to restore a model and its Adam state from a checkpoint on the
+CPU, and the process's peak memory while doing so, with the checkpoint memory-mapped and, for
+comparison, read eagerly.
+
+Each mode restores in a fresh process. Peak RSS counts the mapped checkpoint's pages, which the
+kernel can drop at will, so peak anonymous RSS, sampled every millisecond, is reported alongside
+it. The checkpoint is freshly written, so it is read from the page cache.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_pytorch_restore --layers 32 --width 2048
+"""
+import argparse
+import multiprocessing
+import pathlib
+import tempfile
+import threading
+import time
+from typing import Dict, Tuple
+
+import torch
+
+from determined.pytorch import _pytorch_trial
+
+
+def build(args: argparse.Namespace) -> Tuple[torch.nn.Module, torch.optim.Optimizer]:
+    model = torch.nn.Sequential(
+        *(torch.nn.Linear(args.width, args.width) for _ in range(args.layers))
+    )
+    return model, torch.optim.Adam(model.parameters())
+
+
+def status() -> Dict[str, int]:
+    """The process's memory counters from /proc/self/status, in bytes."""
+    out = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                out[key] = int(value.split()[0]) * 1024
+    return out
+
+
+def restore(args: argparse.Namespace, path: pathlib.Path, mmap: bool) -> Tuple[float, int, int]:
+    """Restore the checkpoint; return the time taken, peak RSS, and peak anonymous RSS."""
+    model, optimizer = build(args)
+    # Start from the memory the model and optimizer already use.
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+    peak_anon = status()["RssAnon"]
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak_anon
+        while not done.wait(0.001):
+            peak_anon = max(peak_anon, status()["RssAnon"])
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    if mmap:
+        checkpoint, _ = _pytorch_trial._load_state_file(path)
+    else:
+        checkpoint = torch.load(str(path), map_location="cpu")
+    model.load_state_dict(checkpoint["models_state_dict"][0])
+    optimizer.load_state_dict(checkpoint["optimizers_state_dict"][0])
+    if mmap:
+        _pytorch_trial._copy_mapped_optimizer_state(checkpoint, [optimizer])
+    del checkpoint
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    return elapsed, status()["VmHWM"], peak_anon
+
+
+def child(
+    args: argparse.Namespace, path: pathlib.Path, mmap: bool, queue: multiprocessing.Queue
+) -> None:
+    queue.put(restore(args, path, mmap))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--layers", type=int, default=32)
+    parser.add_argument("--width", type=int, default=2048)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    mb = 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "state_dict.pth")
+        model, optimizer = build(args)
+        model(torch.zeros(1, args.width)).sum().backward()
+        optimizer.step()
+        torch.save(
+            {
+                "models_state_dict": [model.state_dict()],
+                "optimizers_state_dict": [optimizer.state_dict()],
+            },
+            path,
+        )
+        del model, optimizer
+        print(f"checkpoint: {path.stat().st_size / mb:.0f} MB")
+        print(f"{'restore':<8} {'time':>8} {'peak RSS':>10} {'peak anon RSS':>14}")
+        for mmap in (False, True):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=child, args=(args, path, mmap, queue))
+            proc.start()
+            elapsed, peak_rss, peak_anon = queue.get()
+            proc.join()
+            print(
+                f"{'mmap' if mmap else 'eager':<8} {elapsed:>7.2f}s {peak_rss / mb:>8.0f}MB "
+                f"{peak_anon / mb:>12.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Measure checkpoint upload, download, and delete throughput of the storage managers, each against an
+in-process stand-in for its service: fake S3, GCS, and Azure endpoints, and a shared_fs directory on
+tmpfs. Along with throughput, report how many requests of each kind every phase sent.
+
+Layouts are COUNTxSIZE, e.g. 2000x16K for many small files or 4x512M for a few large shards.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_storage --layout 2000x16K --layout 4x128M --backend s3
+"""
+import argparse
+import collections
+import contextlib
+import os
+import pathlib
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Callable, Counter, Dict, Iterator, List, Optional, Tuple
+
+from determined.common import storage
+from tests.storage import fake_cloud
+
+BACKENDS = ["shared_fs", "s3", "gcs", "azure"]
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+# Files per subdirectory of the checkpoint.
+_FILES_PER_DIR = 100
+
+
+def parse_layout(layout: str) -> Tuple[int, int]:
+    match = re.fullmatch(r"(\d+)[xX](\d+)([KMG]?)", layout.upper())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"expected COUNTxSIZE, like 100x1M, not {layout}")
+    return int(match.group(1)), int(match.group(2)) * _UNITS[match.group(3)]
+
+
+def format_size(size: int) -> str:
+    for unit in "GMK":
+        if size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+
+def create_checkpoint(path: pathlib.Path, count: int, size: int) -> None:
+    # Random data, so that nothing along the way can compress it, but generated only once.
+    block = os.urandom(min(size, 1024 * 1024))
+    for i in range(count):
+        subdir = path.joinpath(f"dir{i // _FILES_PER_DIR}")
+        subdir.mkdir(parents=True, exist_ok=True)
+        with subdir.joinpath(f"file{i}").open("wb") as f:
+            for offset in range(0, size, len(block)):
+                f.write(block[: size - offset])
+
+
+@contextlib.contextmanager
+def backend(
+    name: str, tmp_dir: pathlib.Path
+) -> Iterator[Tuple[storage.StorageManager, Optional[fake_cloud.FakeCloud]]]:
+    if name == "shared_fs":
+        base_path = tmp_dir.joinpath("shared_fs")
+        base_path.mkdir()
+        try:
+            yield storage.SharedFSStorageManager(str(base_path)), None
+        finally:
+            shutil.rmtree(base_path)
+    elif name == "s3":
+        with fake_cloud.FakeS3() as s3:
+            yield storage.S3StorageManager(
+                bucket="bench",
+                access_key="access",
+                secret_key="secret",
+                endpoint_url=s3.url,
+                prefix=None,
+                temp_dir=str(tmp_dir),
+            ), s3
+    elif name == "gcs":
+        with fake_cloud.FakeGCS() as gcs:
+            old = os.environ.get("STORAGE_EMULATOR_HOST")
+            os.environ["STORAGE_EMULATOR_HOST"] = gcs.url
+            try:
+                yield storage.GCSStorageManager(
+                    bucket="bench", prefix=None, temp_dir=str(tmp_dir)
+                ), gcs
+            finally:
+                if old is None:
+                    del os.environ["STORAGE_EMULATOR_HOST"]
+                else:
+                    os.environ["STORAGE_EMULATOR_HOST"] = old
+    elif name == "azure":
+        with fake_cloud.FakeAzure() as azure:
+            yield storage.AzureStorageManager(
+                container="bench", account_url=azure.account_url, temp_dir=str(tmp_dir)
+            ), azure
+    else:
+        raise ValueError(f"unknown backend {name}")
+
+
+def format_counts(counts: Counter[str]) -> str:
+    return ", ".join(f"{op}={n}" for op, n in sorted(counts.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--layout",
+        type=parse_layout,
+        action="append",
+        help="COUNTxSIZE; may be repeated (default: 1000x16K and 4x64M)",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, action="append")
+    parser.add_argument(
+        "--tmp-dir",
+        type=pathlib.Path,
+        default=pathlib.Path("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()),
+        help="where to write checkpoints and the shared_fs store (default: /dev/shm)",
+    )
+    args = parser.parse_args()
+    layouts: List[Tuple[int, int]] = args.layout or [
+        parse_layout("1000x16K"),
+        parse_layout("4x64M"),
+    ]
+
+    print(f"{'backend':<10} {'layout':<12} {'phase':<9} {'MB/s':>9} {'files/s':>9} {'reqs':>6}")
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        tmp_dir = pathlib.Path(tmp)
+        for count, size in layouts:
+            label = f"{count}x{format_size(size)}"
+            src = tmp_dir.joinpath("src")
+            create_checkpoint(src, count, size)
+            for name in args.backend or BACKENDS:
+                with backend(name, tmp_dir) as (manager, fake):
+                    storage_id = str(uuid.uuid4())
+                    dst = tmp_dir.joinpath("dst")
+                    phases: Dict[str, Callable[[], object]] = {
+                        "upload": lambda: manager.upload(src, storage_id),
+                        "download": lambda: manager.download(storage_id, dst),
+                        "delete": lambda: manager.delete(storage_id, ["**/*"]),
+                    }
+                    request_counts: Dict[str, Counter[str]] = {}
+                    for phase, run in phases.items():
+                        if fake is not None:
+                            fake.reset_counts()
+                        start = time.perf_counter()
+                        run()
+                        elapsed = time.perf_counter() - start
+                        counts = fake.reset_counts() if fake is not None else collections.Counter()
+                        request_counts[phase] = counts
+                        print(
+                            f"{name:<10} {label:<12} {phase:<9} "
+                            f"{count * size / elapsed / 1e6:>9.1f} {count / elapsed:>9.1f} "
+                            f"{sum(counts.values()):>6}"
+                        )
+                    shutil.rmtree(dst)
+                for phase, counts in request_counts.items():
+                    if counts:
+                        print(f"    {phase}: {format_counts(counts)}")
+            shutil.rmtree(src)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Compare torch_batch_process's static and dynamic sharding on a synthetic workload with skewed
+per-item costs, run with one thread per rank, by wall time and by the recomputation a crash would
+cost.
+
+Items cost a lognormally distributed amount of (sleeping) time, so a few items are much more
+expensive than the rest, like long documents or large images. For a crash at time t, the wasted
+recomputation is the cost of the items which were processed by t but are not covered by the latest
+checkpoint created by t, and so would be processed again on resume; it is averaged over crash times
+spread evenly across the run.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_torch_batch_process --ranks 8 --items 4000 --sigma 1.5
+"""
+import argparse
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import unittest.mock
+from typing import Any, List, Set, Tuple
+
+import numpy as np
+from torch.utils import data
+
+from determined import core
+from determined.pytorch import experimental
+from determined.pytorch.experimental import _chunk_queue, _torch_batch_process
+from tests import parallel
+from tests.launch import test_util
+
+CRASH_POINTS = 50
+
+# (rank, batch_idx, items, time.time() when processed)
+_Batch = Tuple[int, int, List[int], float]
+
+
+class CostData(data.Dataset):
+    def __init__(self, costs: np.ndarray) -> None:
+        self.costs = costs
+
+    def __len__(self) -> int:
+        return len(self.costs)
+
+    def __getitem__(self, idx: int) -> int:
+        return idx
+
+
+def run(
+    costs: np.ndarray, args: argparse.Namespace, dynamic: bool, storage_path: pathlib.Path
+) -> Tuple[float, float, List[_Batch]]:
+    """Run torch_batch_process; return its start time, wall time, and every batch it processed."""
+    batches: List[_Batch] = []
+    lock = threading.Lock()
+
+    class Processor(experimental.TorchBatchProcessor):
+        def __init__(self, context: experimental.TorchBatchProcessorContext) -> None:
+            self.rank = context.get_distributed_rank()
+
+        def process_batch(self, batch: Any, batch_idx: int) -> None:
+            items = batch.tolist()
+            time.sleep(float(costs[items].sum()))
+            with lock:
+                batches.append((self.rank, batch_idx, items, time.time()))
+
+    with parallel.Execution(args.ranks) as pex:
+
+        def init_context(_: Any, preempt_mode: core.PreemptMode) -> core.Context:
+            return core._dummy_init(
+                distributed=pex.distributed,
+                checkpoint_storage=str(storage_path),
+                preempt_mode=preempt_mode,
+            )
+
+        def worker() -> None:
+            experimental.torch_batch_process(
+                dataset=CostData(costs),
+                batch_processor_cls=Processor,
+                batch_size=args.batch_size,
+                checkpoint_interval=args.checkpoint_interval,
+                dynamic_sharding=dynamic,
+                batches_per_chunk=args.batches_per_chunk,
+            )
+
+        with unittest.mock.patch.object(
+            _torch_batch_process, "_initialize_default_inference_context", init_context
+        ), test_util.set_mock_cluster_info(["0.0.0.12"], 0, args.ranks):
+            start = time.time()
+            pex.run(worker)
+            elapsed = time.time() - start
+    return start, elapsed, batches
+
+
+def covered(
+    checkpoint: pathlib.Path, dynamic: bool, batches: List[_Batch], batches_per_chunk: int
+) -> Set[int]:
+    """The items which resuming from the checkpoint would skip."""
+    if dynamic:
+        with checkpoint.joinpath(_torch_batch_process.CHUNKS_COMPLETED_FILE).open() as f:
+            chunks = _chunk_queue.from_ranges(json.load(f)["chunks_completed"])
+        return {i for _, b, items, _ in batches if b // batches_per_chunk in chunks for i in items}
+    # Static sharding resumes every rank after the minimum number of batches completed by any rank.
+    with checkpoint.joinpath("metadata.json").open() as f:
+        steps_completed = json.load(f)["steps_completed"]
+    return {i for _, b, items, _ in batches if b < steps_completed for i in items}
+
+
+def wasted_on_crash(
+    costs: np.ndarray,
+    start: float,
+    elapsed: float,
+    batches: List[_Batch],
+    dynamic: bool,
+    storage_path: pathlib.Path,
+    batches_per_chunk: int,
+) -> Tuple[float, float]:
+    """Average the items and cost lost to a crash, over crash times spread across the run."""
+    checkpoints = sorted(
+        (os.stat(p).st_mtime, p.parent) for p in storage_path.glob("*/metadata.json")
+    )
+    coverage = [(t, covered(p, dynamic, batches, batches_per_chunk)) for t, p in checkpoints]
+    lost_items = []
+    lost_cost = []
+    for k in range(1, CRASH_POINTS + 1):
+        crash = start + elapsed * k / (CRASH_POINTS + 1)
+        done = {i for _, _, items, t in batches if t <= crash for i in items}
+        saved = next((c for t, c in reversed(coverage) if t <= crash), set())
+        lost = list(done - saved)
+        lost_items.append(len(lost))
+        lost_cost.append(costs[lost].sum())
+    return float(np.mean(lost_items)), float(np.mean(lost_cost))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ranks", type=int, default=8)
+    parser.add_argument("--items", type=int, default=4000)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--checkpoint-interval", type=int, default=10)
+    parser.add_argument("--batches-per-chunk", type=int, default=1)
+    parser.add_argument("--item-ms", type=float, default=1.0, help="mean cost of an item")
+    parser.add_argument("--sigma", type=float, default=1.5, help="skew of the item costs")
+    args = parser.parse_args()
+
+    logging.getLogger("determined").setLevel(logging.ERROR)
+    rng = np.random.default_rng(0)
+    costs = rng.lognormal(0, args.sigma, args.items)
+    costs *= args.item_ms / 1000 / costs.mean()
+    ideal = costs.sum() / args.ranks
+    print(f"total cost: {costs.sum():.2f} s, {ideal:.2f} s per rank if perfectly balanced")
+    print(f"{'mode':<8} {'wall time':>10} {'lost items/crash':>17} {'lost cost/crash':>16}")
+
+    for dynamic in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            storage_path = pathlib.Path(tmp)
+            start, elapsed, batches = run(costs, args, dynamic, storage_path)
+            assert sorted(i for _, _, items, _ in batches for i in items) == list(range(args.items))
+            lost_items, lost_cost = wasted_on_crash(
+                costs, start, elapsed, batches, dynamic, storage_path, args.batches_per_chunk
+            )
+        print(
+            f"{'dynamic' if dynamic else 'static':<8} {elapsed:>9.2f}s {lost_items:>17.1f} "
+            f"{lost_cost:>15.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
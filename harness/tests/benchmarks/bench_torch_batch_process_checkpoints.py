@@ -0,0 +1,141 @@
+"""
+Measure how long torch_batch_process's ranks are blocked at each checkpoint interval when progress
+checkpoints are slow to upload, with uploads in the background and, for comparison, inline.
+
+Ranks run as threads against shared_fs checkpoint storage, and every upload is padded to take
+--upload-ms. A rank's blocked time at an interval is the gap between finishing the interval's last
+batch and starting the next one.
+
+Run it from the harness directory:
+
+    python -m tests.benchmarks.bench_torch_batch_process_checkpoints --ranks 8 --upload-ms 200
+"""
+import argparse
+import contextlib
+import logging
+import pathlib
+import statistics
+import tempfile
+import threading
+import time
+import unittest.mock
+from typing import Any, Dict, Iterator, List, Tuple
+
+from torch.utils import data
+
+from determined import core
+from determined.pytorch import experimental
+from determined.pytorch.experimental import _torch_batch_process
+from tests import parallel
+from tests.launch import test_util
+
+
+class IndexData(data.Dataset):
+    def __init__(self, length: int) -> None:
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, idx: int) -> int:
+        return idx
+
+
+def run(
+    args: argparse.Namespace, background: bool, storage_path: pathlib.Path
+) -> Tuple[float, List[float]]:
+    """Run torch_batch_process; return its wall time and every rank's blocked time per interval."""
+    # rank -> [(batch_idx, start, end)]
+    batches: Dict[int, List[Tuple[int, float, float]]] = {}
+    lock = threading.Lock()
+
+    class Processor(experimental.TorchBatchProcessor):
+        def __init__(self, context: experimental.TorchBatchProcessorContext) -> None:
+            self.rank = context.get_distributed_rank()
+            with lock:
+                batches[self.rank] = []
+
+        def process_batch(self, batch: Any, batch_idx: int) -> None:
+            start = time.perf_counter()
+            time.sleep(args.batch_ms / 1000)
+            batches[self.rank].append((batch_idx, start, time.perf_counter()))
+
+    with parallel.Execution(args.ranks) as pex:
+
+        def init_context(*_: Any) -> core.Context:
+            core_context = core._dummy_init(
+                distributed=pex.distributed, checkpoint_storage=str(storage_path)
+            )
+            store_path = core_context.checkpoint.store_path
+
+            @contextlib.contextmanager
+            def slow_store_path(*args_: Any, **kwargs: Any) -> Iterator[Any]:
+                with store_path(*args_, **kwargs) as out:
+                    yield out
+                    time.sleep(args.upload_ms / 1000)
+
+            core_context.checkpoint.store_path = slow_store_path  # type: ignore
+            return core_context
+
+        def worker() -> None:
+            experimental.torch_batch_process(
+                dataset=IndexData(args.ranks * args.batches),
+                batch_processor_cls=Processor,
+                batch_size=1,
+                checkpoint_interval=args.checkpoint_interval,
+            )
+
+        def submit_inline(self: Any, store: Any) -> None:
+            store()
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch.object(
+                    _torch_batch_process, "_initialize_default_inference_context", init_context
+                )
+            )
+            stack.enter_context(test_util.set_mock_cluster_info(["0.0.0.12"], 0, args.ranks))
+            if not background:
+                stack.enter_context(
+                    unittest.mock.patch.object(
+                        _torch_batch_process._ProgressCheckpointer, "submit", submit_inline
+                    )
+                )
+            start = time.perf_counter()
+            pex.run(worker)
+            elapsed = time.perf_counter() - start
+
+    blocked = []
+    for rank_batches in batches.values():
+        for (batch_idx, _, end), (_, next_start, _) in zip(rank_batches, rank_batches[1:]):
+            if (batch_idx + 1) % args.checkpoint_interval == 0:
+                blocked.append(next_start - end)
+    return elapsed, blocked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ranks", type=int, default=4)
+    parser.add_argument("--batches", type=int, default=100, help="batches per rank")
+    parser.add_argument("--batch-ms", type=float, default=10.0)
+    parser.add_argument("--checkpoint-interval", type=int, default=10)
+    parser.add_argument("--upload-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    logging.getLogger("determined").setLevel(logging.ERROR)
+    compute = args.batches * args.batch_ms / 1000
+    print(
+        f"{compute:.2f} s of batches per rank, {args.batches // args.checkpoint_interval} intervals"
+    )
+    print(f"{'uploads':<11} {'wall time':>10} {'blocked/interval':>17} {'max blocked':>12}")
+    for background in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            elapsed, blocked = run(args, background, pathlib.Path(tmp))
+        print(
+            f"{'background' if background else 'inline':<11} {elapsed:>9.2f}s "
+            f"{statistics.mean(blocked) * 1000:>15.1f}ms {max(blocked) * 1000:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
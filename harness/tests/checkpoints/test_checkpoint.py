@@ -7,6 +7,12 @@ from responses import matchers
 
 from determined.common import api
 from determined.common.experimental import Checkpoint
+from determined.common.experimental.checkpoint import (
+    CheckpointState,
+    DownloadMode,
+    download_checkpoints,
+)
+from determined.common.experimental.checkpoint._checkpoint import CheckpointTrainingMetadata
 
 
 def get_long_str(approx_len: int) -> str:
@@ -84,3 +90,47 @@ def test_checkpoint_download_via_master(tmp_path: Path) -> None:
         checkpoint_path,
     )
     verify_test_checkpoint(checkpoint_path)
+
+
+def make_directory_checkpoint(storage_path: Path, uuid: str) -> Checkpoint:
+    setup_mock_checkpoint(storage_path / uuid)
+    ckpt = Checkpoint(
+        api.Session(master="https://dummy-master.none", user=None, auth=None, cert=None), uuid
+    )
+    ckpt.state = CheckpointState.COMPLETED
+    ckpt.metadata = {}
+    ckpt.resources = {
+        k if v else k + "/": str(len(v.encode("utf-8"))) for k, v in mock_content.items()
+    }
+    ckpt.training = CheckpointTrainingMetadata(
+        experiment_config={
+            "checkpoint_storage": {"type": "directory", "container_path": str(storage_path)}
+        },
+        experiment_id=1,
+        trial_id=1,
+        hparams={},
+        validation_metrics={},
+    )
+    return ckpt
+
+
+def test_download_checkpoints_resumes(tmp_path: Path) -> None:
+    storage_path = tmp_path / "storage"
+    ckpts = [make_directory_checkpoint(storage_path, f"uuid-{i}") for i in range(3)]
+    output_dir = tmp_path / "output"
+
+    # Simulate an interrupted download of the first checkpoint: one file is complete (its content
+    # is altered so that we can tell whether it was copied again) and another one is truncated.
+    partial = output_dir / "uuid-0"
+    partial.joinpath("lib").mkdir(parents=True)
+    complete_data = "X" * len(mock_content["data.txt"])
+    partial.joinpath("data.txt").write_text(complete_data)
+    partial.joinpath("lib/big-data.txt").write_text("truncated")
+
+    paths = download_checkpoints(ckpts, str(output_dir), mode=DownloadMode.DIRECT, max_workers=2)
+
+    assert paths == [str(output_dir / c.uuid) for c in ckpts]
+    for path in paths[1:]:
+        verify_test_checkpoint(Path(path))
+    assert partial.joinpath("data.txt").read_text() == complete_data
+    assert partial.joinpath("lib/big-data.txt").read_text() == mock_content["lib/big-data.txt"]
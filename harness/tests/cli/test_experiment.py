@@ -1,4 +1,6 @@
+import csv
 import dataclasses
+import pathlib
 import unittest.mock
 
 import pytest
@@ -60,3 +62,116 @@ def test_wait_returns_error_code_when_experiment_errors(
     with pytest.raises(SystemExit) as e:
         determined.cli.experiment.wait(args)
     assert e.value.code == 1
+
+
+@dataclasses.dataclass
+class DescribeArgs:
+    master: str
+    experiment_ids: str
+    outdir: pathlib.Path
+    user: str = "test"
+    password: str = "test"
+    json: bool = False
+    csv: bool = False
+    metrics: bool = True
+    file_format: str = "csv"
+    max_workers: int = 4
+
+
+def sample_get_trial_workloads(trial_id: int) -> bindings.v1GetTrialWorkloadsResponse:
+    workloads = [
+        bindings.v1WorkloadContainer(
+            training=bindings.v1MetricsWorkload(
+                metrics=bindings.v1Metrics(avgMetrics={"loss": trial_id + batches / 100}),
+                numInputs=batches * 10,
+                totalBatches=batches,
+                endTime="2023-01-01T00:00:00Z",
+            )
+        )
+        for batches in (100, 200)
+    ]
+    return bindings.v1GetTrialWorkloadsResponse(
+        workloads=workloads,
+        pagination=bindings.v1Pagination(endIndex=2, limit=500, offset=0, startIndex=0, total=2),
+    )
+
+
+def mock_describe_responses(
+    requests_mock: mock.Mocker,
+) -> bindings.v1GetExperimentTrialsResponse:
+    exp = api_responses.sample_get_experiment(id=1)
+    trials = api_responses.sample_get_experiment_trials()
+    requests_mock.get("/api/v1/experiments/1", status_code=200, json=exp.to_json())
+    requests_mock.get("/api/v1/experiments/1/trials", status_code=200, json=trials.to_json())
+    for trial in trials.trials:
+        requests_mock.get(
+            f"/api/v1/trials/{trial.id}/workloads",
+            status_code=200,
+            json=sample_get_trial_workloads(trial.id).to_json(),
+        )
+    return trials
+
+
+@unittest.mock.patch("determined.common.api.authentication.Authentication")
+def test_describe_fetches_workloads_concurrently(
+    auth_mock: unittest.mock.MagicMock,
+    requests_mock: mock.Mocker,
+    tmp_path: pathlib.Path,
+) -> None:
+    auth_mock.return_value = mock_det_auth()
+    args = DescribeArgs(master="http://localhost:8888", experiment_ids="1", outdir=tmp_path)
+    trials = mock_describe_responses(requests_mock)
+
+    determined.cli.experiment.describe(args)
+
+    # Every trial's workloads are fetched exactly once, including the trial sampled for metric
+    # names.
+    workload_calls = [r for r in requests_mock.request_history if r.path.endswith("/workloads")]
+    assert len(workload_calls) == len(trials.trials)
+
+    with (tmp_path / "workloads.csv").open() as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:5] == [
+        "Trial ID",
+        "# of Batches",
+        "State",
+        "Report Time",
+        "Training Metric: loss",
+    ]
+    expected = [(str(t.id), str(b)) for t in trials.trials for b in (100, 200)]
+    assert [(row[0], row[1]) for row in rows[1:]] == expected
+    assert float(rows[1][4]) == trials.trials[0].id + 1.0
+
+
+@unittest.mock.patch("determined.common.api.authentication.Authentication")
+def test_describe_writes_parquet(
+    auth_mock: unittest.mock.MagicMock,
+    requests_mock: mock.Mocker,
+    tmp_path: pathlib.Path,
+) -> None:
+    parquet = pytest.importorskip("pyarrow.parquet")
+    auth_mock.return_value = mock_det_auth()
+    args = DescribeArgs(
+        master="http://localhost:8888",
+        experiment_ids="1",
+        outdir=tmp_path,
+        file_format="parquet",
+    )
+    trials = mock_describe_responses(requests_mock)
+
+    determined.cli.experiment.describe(args)
+
+    table = parquet.read_table(tmp_path / "trials.parquet")
+    assert table.column("Trial ID").to_pylist() == [t.id for t in trials.trials]
+    assert table.column("Experiment ID").to_pylist() == [1] * len(trials.trials)
+
+    # Columns are typed, and missing values are nulls rather than empty strings.
+    table = parquet.read_table(tmp_path / "workloads.parquet")
+    assert str(table.schema.field("Trial ID").type) == "int64"
+    assert str(table.schema.field("Training Metric: loss").type) == "double"
+    expected = [(t.id, b) for t in trials.trials for b in (100, 200)]
+    assert list(zip(*(table.column(c).to_pylist() for c in ("Trial ID", "# of Batches")))) == (
+        expected
+    )
+    assert table.column("Training Metric: loss").to_pylist()[0] == trials.trials[0].id + 1.0
+    assert table.column("Checkpoint Report Time").to_pylist()[0] is None
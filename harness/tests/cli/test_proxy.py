@@ -0,0 +1,184 @@
+import asyncio
+import base64
+import contextlib
+import hashlib
+import os
+import socket
+import struct
+import threading
+from typing import Any, Iterator, List, Optional
+
+import pytest
+from lomond.constants import WS_KEY
+from lomond.frame import Frame
+from lomond.mask import mask_payload
+from lomond.opcode import Opcode
+
+from determined.cli import proxy
+
+
+class EchoMaster:
+    """A fake master whose proxied services echo back everything they are sent."""
+
+    def __init__(self, reject: bool = False) -> None:
+        self.reject = reject
+        self.headers: List[bytes] = []
+        self.frames_received = 0
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            asyncio.start_server(self.handle, "127.0.0.1", 0, limit=1024 * 1024)
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        request = await reader.readuntil(b"\r\n\r\n")
+        self.headers.append(request)
+        if self.reject:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            writer.close()
+            return
+        key = next(
+            line.split(b":", 1)[1].strip()
+            for line in request.split(b"\r\n")
+            if line.lower().startswith(b"sec-websocket-key:")
+        )
+        accept = base64.b64encode(hashlib.sha1(key + WS_KEY).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        try:
+            while True:
+                byte0, byte1 = await reader.readexactly(2)
+                length = byte1 & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", await reader.readexactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", await reader.readexactly(8))
+                masking_key = await reader.readexactly(4)
+                payload = bytearray(await reader.readexactly(length))
+                mask_payload(masking_key, payload)
+                opcode = byte0 & 0x0F
+                if opcode == Opcode.CLOSE:
+                    writer.write(Frame.build(Opcode.CLOSE, bytes(payload), mask=False))
+                    break
+                self.frames_received += 1
+                writer.write(Frame.build(opcode, bytes(payload), mask=False))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        assert isinstance(port, int)
+        return port
+
+
+@contextlib.contextmanager
+def listener(
+    master: EchoMaster, threads: bool, coalesce_ms: int = 0, token: Optional[str] = None
+) -> Iterator[int]:
+    port = free_port()
+    env = {proxy.PROXY_COALESCE_MS_ENV: str(coalesce_ms)}
+    if threads:
+        env[proxy.PROXY_THREADS_ENV] = "1"
+    old_env = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    try:
+        with proxy.http_tunnel_listener(
+            f"http://127.0.0.1:{master.port}",
+            [proxy.ListenerConfig(service_id="svc", local_port=port, local_addr="127.0.0.1")],
+            None,
+            None,
+            token,
+        ):
+            yield port
+    finally:
+        for k, v in old_env.items():
+            if v is None:
+                del os.environ[k]
+            else:
+                os.environ[k] = v
+
+
+def echo(port: int, data: bytes) -> bytes:
+    with socket.create_connection(("127.0.0.1", port)) as s:
+        sender = threading.Thread(target=s.sendall, args=(data,), name="echo-sender")
+        sender.start()
+        received = bytearray()
+        while len(received) < len(data):
+            chunk = s.recv(1024 * 1024)
+            if not chunk:
+                break
+            received += chunk
+        sender.join()
+        return bytes(received)
+
+
+@pytest.fixture(autouse=True)
+def no_proxy(monkeypatch: Any) -> None:
+    for var in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"):
+        monkeypatch.delenv(var, raising=False)
+
+
+@pytest.fixture
+def master() -> Iterator[EchoMaster]:
+    master = EchoMaster()
+    yield master
+    master.close()
+
+
+@pytest.mark.parametrize("threads", [False, True])
+def test_tunnel_listener(master: EchoMaster, threads: bool) -> None:
+    payloads = [os.urandom(n) for n in (1, 4096, 3 * 1024 * 1024)]
+    with listener(master, threads, token="token") as port:
+        results: List[bytes] = [b""] * len(payloads)
+
+        def run(i: int) -> None:
+            results[i] = echo(port, payloads[i])
+
+        clients = [threading.Thread(target=run, args=(i,)) for i in range(len(payloads))]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+    assert results == payloads
+    assert all(b"Authorization: Bearer token" in h for h in master.headers)
+    assert all(h.startswith(b"GET /proxy/svc/ HTTP/1.1") for h in master.headers)
+
+
+def test_tunnel_listener_coalesces_small_writes(master: EchoMaster) -> None:
+    with listener(master, threads=False, coalesce_ms=200) as port:
+        with socket.create_connection(("127.0.0.1", port)) as s:
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            for _ in range(10):
+                s.sendall(b"x" * 10)
+            received = b""
+            while len(received) < 100:
+                received += s.recv(100)
+    assert received == b"x" * 100
+    assert master.frames_received < 10
+
+
+def test_tunnel_listener_rejected(capsys: Any) -> None:
+    master = EchoMaster(reject=True)
+    try:
+        with listener(master, threads=False) as port:
+            with socket.create_connection(("127.0.0.1", port)) as s:
+                s.sendall(b"hello")
+                assert s.recv(1024) == b""
+    finally:
+        master.close()
+    assert "Connection failed" in capsys.readouterr().err
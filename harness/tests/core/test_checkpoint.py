@@ -7,6 +7,7 @@ import pytest
 import requests
 
 from determined import core
+from determined.common import storage
 from tests import parallel
 
 
@@ -145,6 +146,51 @@ def test_checkpoint_context(dummy: bool, mode: core.DownloadMode, tmp_path: path
             storage_manager.restore_path.reset_mock()
 
 
+def test_store_path_streaming(tmp_path: pathlib.Path) -> None:
+    ckpt_dir = tmp_path.joinpath("store-path")
+    ckpt_dir.mkdir()
+    uploads: List[List[str]] = []
+
+    storage_manager = mock.MagicMock()
+    storage_manager.pre_store_path.return_value = ckpt_dir
+    storage_manager.store_path_is_direct_access.return_value = False
+    storage_manager._list_directory.side_effect = storage.StorageManager._list_directory
+    storage_manager.upload.side_effect = lambda src, dst, paths: uploads.append(sorted(paths))
+    storage_manager.post_store_path.side_effect = lambda src, dst: uploads.append(
+        sorted(storage.StorageManager._list_directory(src))
+    )
+
+    # Both workers share the checkpoint directory, and each streams its own shard.
+    with parallel.Execution(2, local_size=2) as pex, mock.patch.object(
+        core.DummyCheckpointContext, "_report_checkpoint"
+    ) as report:
+
+        @pex.run
+        def do_test() -> None:
+            checkpoint_context = core.DummyCheckpointContext(pex.distributed, storage_manager)
+            stream = core._ShardStream()
+            with checkpoint_context._store_path_streaming({"steps_completed": 1}, stream) as (
+                path,
+                _,
+            ):
+                path.joinpath("model0").mkdir(exist_ok=True)
+                shard = path.joinpath("model0", f"shard{pex.rank}")
+                shard.write_text("x" * (pex.rank + 1))
+                stream.submit(shard)
+                if pex.rank == 0:
+                    path.joinpath("latest").write_text("model0")
+
+    # Streamed shards are uploaded once, by the worker that wrote them, and left out of the final
+    # upload of the directory.
+    assert sorted(uploads) == [
+        ["latest", "metadata.json", "model0/"],
+        ["model0/", "model0/shard0"],
+        ["model0/", "model0/shard1"],
+    ]
+    (_, resources, _), _ = report.call_args
+    assert resources == {"latest": 6, "model0/": 0, "model0/shard0": 1, "model0/shard1": 2}
+
+
 @pytest.mark.parametrize(
     "resources,expected_merged,expected_conflicts",
     [
@@ -1,7 +1,9 @@
 import base64
+import json
 import math
 import os
-from typing import Callable
+import urllib.parse
+from typing import Any, Callable, Dict, List, Tuple
 from unittest import mock
 
 import pytest
@@ -100,6 +102,115 @@ def test_wait_raises_exception_when_experiment_is_paused(
         expref.wait()
 
 
+def get_existing_experiments(
+    query: Dict[str, List[str]], existing: List[int]
+) -> Tuple[int, Dict[str, str], str]:
+    """Answer an unfiltered GetExperiments request for the experiments which exist."""
+    template = api_responses.sample_get_experiment().experiment
+    found = []
+    for exp_id in existing:
+        if str(exp_id) in query["experimentIdFilter.incl"]:
+            template.id = exp_id
+            found.append(template.to_json())
+    pagination = bindings.v1Pagination(total=len(found)).to_json()
+    if query["limit"] == ["-2"]:
+        found = []
+    return 200, {}, json.dumps({"experiments": found, "pagination": pagination})
+
+
+@responses.activate
+def test_wait_all_polls_experiments_together(standard_session: api.Session) -> None:
+    exps = [experiment.Experiment(i, standard_session) for i in (1, 2, 3)]
+    template = api_responses.sample_get_experiment().experiment
+    # Experiments 2, then 3, then 1 finish, one per poll.
+    finish_order = [2, 3, 1]
+    polls: List[Dict[str, List[str]]] = []
+
+    def get_experiments(request: requests.PreparedRequest) -> Tuple[int, Dict[str, str], str]:
+        assert request.url
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        if "states" not in query:
+            return get_existing_experiments(query, [1, 2, 3])
+        polls.append(query)
+        finished = []
+        for exp_id in finish_order[: len(polls)]:
+            if str(exp_id) in query["experimentIdFilter.incl"]:
+                template.id = exp_id
+                template.state = bindings.experimentv1State.COMPLETED
+                finished.append(template.to_json())
+        resp = {
+            "experiments": finished,
+            "pagination": api_responses.empty_get_pagination().to_json(),
+        }
+        return 200, {}, json.dumps(resp)
+
+    responses.add_callback(responses.GET, f"{_MASTER}/api/v1/experiments", callback=get_experiments)
+
+    done = experiment.wait_any(exps, interval=0.01)
+    assert [e.id for e in done] == [2]
+    assert exps[1].state == experiment.ExperimentState.COMPLETED
+
+    polls.clear()
+    done = experiment.wait_all(exps, interval=0.01)
+    assert sorted(e.id for e in done) == [1, 2, 3]
+    assert all(e.state == experiment.ExperimentState.COMPLETED for e in exps)
+    # Every poll asks about all still-pending experiments at once, and only for stopped ones.
+    assert polls[0]["experimentIdFilter.incl"] == ["1", "2", "3"]
+    assert polls[1]["experimentIdFilter.incl"] == ["1", "3"]
+    assert "STATE_ACTIVE" not in polls[0]["states"]
+    assert "STATE_COMPLETED" in polls[0]["states"]
+
+
+@responses.activate
+def test_wait_all_returns_with_duplicate_experiments(standard_session: api.Session) -> None:
+    exp = experiment.Experiment(1, standard_session)
+    other = experiment.Experiment(2, standard_session)
+    template = api_responses.sample_get_experiment().experiment
+
+    def get_experiments(request: requests.PreparedRequest) -> Tuple[int, Dict[str, str], str]:
+        assert request.url
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        # An empty filter would list every experiment on the cluster.
+        assert query.get("experimentIdFilter.incl")
+        if "states" not in query:
+            return get_existing_experiments(query, [1, 2])
+        finished = []
+        for exp_id in query["experimentIdFilter.incl"]:
+            template.id = int(exp_id)
+            template.state = bindings.experimentv1State.COMPLETED
+            finished.append(template.to_json())
+        resp = {
+            "experiments": finished,
+            "pagination": api_responses.empty_get_pagination().to_json(),
+        }
+        return 200, {}, json.dumps(resp)
+
+    responses.add_callback(responses.GET, f"{_MASTER}/api/v1/experiments", callback=get_experiments)
+
+    done = experiment.wait_all([exp, other, exp], interval=0.01)
+    assert sorted(e.id for e in done) == [1, 2]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_wait_all_raises_for_missing_experiments(standard_session: api.Session) -> None:
+    exps = [experiment.Experiment(i, standard_session) for i in (1, 2, 3)]
+
+    def get_experiments(request: requests.PreparedRequest) -> Tuple[int, Dict[str, str], str]:
+        assert request.url
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        if "states" not in query:
+            # Experiment 2 was deleted.
+            return get_existing_experiments(query, [1, 3])
+        resp = {"experiments": [], "pagination": api_responses.empty_get_pagination().to_json()}
+        return 200, {}, json.dumps(resp)
+
+    responses.add_callback(responses.GET, f"{_MASTER}/api/v1/experiments", callback=get_experiments)
+
+    with pytest.raises(api.errors.NotFoundException, match=r"\[2\]"):
+        experiment.wait_all(exps, interval=0.01)
+
+
 @responses.activate
 def test_iter_trials_iterates_through_all_trials(
     make_expref: Callable[[int], experiment.Experiment]
@@ -330,3 +441,78 @@ def test_list_checkpoints_errors_on_only_sort_by_set(
         expref.list_checkpoints(
             sort_by=checkpoint.CheckpointSortBy.UUID, order_by=None, max_results=5
         )
+
+
+def metric_report(trial_id: int, steps: int, metrics: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "archived": False,
+        "endTime": f"2023-06-01T00:00:{steps:02d}.123456Z",
+        "group": "training",
+        "id": steps,
+        "metrics": {"avg_metrics": metrics},
+        "totalBatches": steps,
+        "trialId": trial_id,
+        "trialRunId": 1,
+    }
+
+
+@responses.activate
+def test_metrics_frame_streams_trials_in_batches(
+    make_expref: Callable[[int], experiment.Experiment],
+) -> None:
+    pd = pytest.importorskip("pandas")
+    expref = make_expref(1)
+    tr_resp = api_responses.sample_get_experiment_trials()
+    trial_ids = [t.id for t in tr_resp.trials]
+    responses.get(f"{_MASTER}/api/v1/experiments/{expref.id}/trials", json=tr_resp.to_json())
+
+    requested: List[List[int]] = []
+
+    def get_metrics(request: requests.PreparedRequest) -> Tuple[int, Dict[str, str], str]:
+        assert request.url
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(request.url).query)
+        ids = [int(i) for i in query["trialIds"]]
+        requested.append(ids)
+        lines = []
+        for trial_id in ids:
+            # The "acc" metric is only reported by later trials, and "note" is not numeric.
+            reports = [metric_report(trial_id, 1, {"loss": 1.0 / trial_id})]
+            if trial_id > 8:
+                reports.append(metric_report(trial_id, 2, {"loss": 0.5, "acc": 0.9, "note": "x"}))
+            lines.append(json.dumps({"result": {"metrics": reports}}))
+        return 200, {}, "\n".join(lines)
+
+    responses.add_callback(
+        responses.GET, f"{_MASTER}/api/v1/trials/metrics/trial_metrics", callback=get_metrics
+    )
+
+    df = expref.metrics_frame("training", trials_per_request=2)
+
+    assert requested == [trial_ids[0:2], trial_ids[2:4], trial_ids[4:]]
+    assert list(df.columns) == [
+        "trial_id",
+        "trial_run_id",
+        "steps_completed",
+        "end_time",
+        "loss",
+        "acc",
+        "note",
+    ]
+    assert list(df["trial_id"]) == [6, 7, 8, 9, 9, 21, 21]
+    assert list(df["steps_completed"]) == [1, 1, 1, 1, 2, 1, 2]
+    assert df["loss"].dtype == "float64"
+    assert df["loss"][0] == 1.0 / 6
+    assert df["acc"].isna().tolist() == [True, True, True, True, False, True, False]
+    assert df["note"].isna().tolist() == [True, True, True, True, False, True, False]
+    assert df["note"][4] == "x"
+    assert df["end_time"][0] == pd.Timestamp("2023-06-01T00:00:01.123456")
+
+    df = expref.metrics_frame("training", columns=["acc"])
+    assert list(df.columns) == ["trial_id", "trial_run_id", "steps_completed", "end_time", "acc"]
+    assert len(df) == 7
+
+    pa = pytest.importorskip("pyarrow")
+    table = expref.metrics_frame("training", as_arrow=True)
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == 7
+    assert table.column("note").to_pylist() == [None, None, None, None, "x", None, "x"]
@@ -1,6 +1,12 @@
+import contextlib
+import json
 import math
+import os
+import pathlib
+import threading
+import time
 import unittest.mock
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
 
 import pytest
 import torch
@@ -8,6 +14,8 @@ from torch.utils import data
 
 from determined import core, pytorch
 from determined.pytorch import experimental
+from determined.pytorch.experimental import _torch_batch_process
+from tests import parallel
 from tests.launch import test_util
 
 DEFAULT_SLOT_IDS = [0]
@@ -571,6 +579,207 @@ def test_torch_batch_process_invalid_checkpoint_interval_raises_error(
             )
 
 
+def _recording_processor(
+    slow_rank: Optional[int] = None,
+) -> Tuple[Type[experimental.TorchBatchProcessor], List[Tuple[int, int, List[int]]]]:
+    """A processor class which records (rank, batch_idx, items) for every batch it processes."""
+    processed: List[Tuple[int, int, List[int]]] = []
+    lock = threading.Lock()
+
+    class RecordingProcessor(experimental.TorchBatchProcessor):
+        def __init__(self, context: experimental.TorchBatchProcessorContext) -> None:
+            self.rank = context.get_distributed_rank()
+
+        def process_batch(self, batch: Any, batch_idx: int) -> None:
+            if self.rank == slow_rank:
+                time.sleep(0.02)
+            with lock:
+                processed.append((self.rank, batch_idx, batch.tolist()))
+
+    return RecordingProcessor, processed
+
+
+def _latest_checkpoint(storage_path: pathlib.Path) -> str:
+    chunk_files = storage_path.glob(f"*/{_torch_batch_process.CHUNKS_COMPLETED_FILE}")
+    return max(chunk_files, key=lambda p: os.stat(p).st_mtime_ns).parent.name
+
+
+def test_torch_batch_process_dynamic_sharding(tmp_path: pathlib.Path) -> None:
+    processor_cls, processed = _recording_processor(slow_rank=1)
+    with parallel.Execution(2) as pex:
+
+        def init_context(*_: Any) -> core.Context:
+            return core._dummy_init(
+                distributed=pex.distributed,
+                checkpoint_storage=str(tmp_path),
+                preempt_mode=core.PreemptMode.ChiefOnly,
+            )
+
+        with unittest.mock.patch.object(
+            _torch_batch_process, "_initialize_default_inference_context", init_context
+        ), test_util.set_mock_cluster_info(DEFAULT_ADDRS, 0, 2):
+
+            @pex.run
+            def run() -> None:
+                experimental.torch_batch_process(
+                    dataset=IndexData(95),
+                    batch_processor_cls=processor_cls,
+                    batch_size=5,
+                    checkpoint_interval=2,
+                    dynamic_sharding=True,
+                )
+
+    # Every batch is processed exactly once, and batch_idx indexes the whole dataset.
+    assert sorted(batch_idx for _, batch_idx, _ in processed) == list(range(19))
+    for _, batch_idx, items in processed:
+        assert items == list(range(batch_idx * 5, min(batch_idx * 5 + 5, 95)))
+    # The fast chief picked up the slack of the slow worker.
+    assert sum(rank == 0 for rank, _, _ in processed) > sum(rank == 1 for rank, _, _ in processed)
+    completed = _torch_batch_process._load_completed_chunks(
+        tmp_path.joinpath(_latest_checkpoint(tmp_path)), batch_size=5, batches_per_chunk=1
+    )
+    assert completed == set(range(19))
+
+
+def test_torch_batch_process_dynamic_sharding_resumes_exactly(tmp_path: pathlib.Path) -> None:
+    processor_cls, processed = _recording_processor()
+    should_preempt_calls: List[None] = []
+
+    def init_context(preempt_after: Optional[int]) -> Callable[..., core.Context]:
+        def init(*_: Any) -> core.Context:
+            core_context = core._dummy_init(
+                checkpoint_storage=str(tmp_path), preempt_mode=core.PreemptMode.ChiefOnly
+            )
+            if preempt_after is not None:
+
+                def should_preempt() -> bool:
+                    should_preempt_calls.append(None)
+                    return len(should_preempt_calls) >= preempt_after
+
+                core_context.preempt.should_preempt = should_preempt  # type: ignore
+            return core_context
+
+        return init
+
+    def run(preempt_after: Optional[int], latest_checkpoint: Optional[str]) -> None:
+        with unittest.mock.patch.object(
+            _torch_batch_process,
+            "_initialize_default_inference_context",
+            init_context(preempt_after),
+        ), test_util.set_mock_cluster_info(
+            DEFAULT_ADDRS, 0, 1, latest_checkpoint=latest_checkpoint
+        ):
+            experimental.torch_batch_process(
+                dataset=IndexData(50),
+                batch_processor_cls=processor_cls,
+                batch_size=5,
+                checkpoint_interval=2,
+                dynamic_sharding=True,
+                batches_per_chunk=2,
+            )
+
+    run(preempt_after=2, latest_checkpoint=None)
+    first_run = len(processed)
+    assert 0 < first_run < 10
+
+    run(preempt_after=None, latest_checkpoint=_latest_checkpoint(tmp_path))
+    # No batch is processed twice.
+    assert sorted(batch_idx for _, batch_idx, _ in processed) == list(range(10))
+
+    # The chunking cannot change between runs.
+    with pytest.raises(ValueError, match="batches_per_chunk"):
+        with unittest.mock.patch.object(
+            _torch_batch_process, "_initialize_default_inference_context", init_context(None)
+        ), test_util.set_mock_cluster_info(
+            DEFAULT_ADDRS, 0, 1, latest_checkpoint=_latest_checkpoint(tmp_path)
+        ):
+            experimental.torch_batch_process(
+                dataset=IndexData(50),
+                batch_processor_cls=processor_cls,
+                batch_size=5,
+                dynamic_sharding=True,
+                batches_per_chunk=3,
+            )
+
+
+def test_torch_batch_process_checkpoints_in_background(tmp_path: pathlib.Path) -> None:
+    recording_cls, processed = _recording_processor()
+    # Set once processing moves past the first checkpoint interval.
+    moved_on = threading.Event()
+
+    class Processor(recording_cls):  # type: ignore
+        def process_batch(self, batch: Any, batch_idx: int) -> None:
+            super().process_batch(batch, batch_idx)
+            if batch_idx >= 2:
+                moved_on.set()
+
+    core_context = core._dummy_init(checkpoint_storage=str(tmp_path))
+    real_store_path = core_context.checkpoint.store_path
+    lock = threading.Lock()
+    in_flight: List[int] = []
+    most_in_flight = 0
+
+    @contextlib.contextmanager
+    def store_path(*args: Any, **kwargs: Any) -> Iterator[Any]:
+        nonlocal most_in_flight
+        with lock:
+            in_flight.append(1)
+            most_in_flight = max(most_in_flight, len(in_flight))
+        try:
+            # The first upload only finishes once processing has continued without it.
+            assert moved_on.wait(timeout=10)
+            with real_store_path(*args, **kwargs) as out:
+                yield out
+        finally:
+            with lock:
+                in_flight.pop()
+
+    with unittest.mock.patch.object(
+        _torch_batch_process, "_initialize_default_inference_context", return_value=core_context
+    ), unittest.mock.patch.object(
+        core_context.checkpoint, "store_path", store_path
+    ), test_util.set_mock_cluster_info(
+        DEFAULT_ADDRS, 0, 1
+    ):
+        experimental.torch_batch_process(
+            dataset=IndexData(35),
+            batch_processor_cls=Processor,
+            batch_size=5,
+            checkpoint_interval=2,
+        )
+
+    assert [batch_idx for _, batch_idx, _ in processed] == list(range(7))
+    assert most_in_flight == 1
+    # Every checkpoint was uploaded, the last of them recording all batches.
+    steps = []
+    for metadata in tmp_path.glob("*/metadata.json"):
+        with metadata.open() as f:
+            steps.append(json.load(f)["steps_completed"])
+    assert sorted(steps) == [2, 4, 6, 7]
+
+
+def test_torch_batch_process_background_checkpoint_errors_are_raised(
+    tmp_path: pathlib.Path,
+) -> None:
+    processor_cls, _ = _recording_processor()
+    core_context = core._dummy_init(checkpoint_storage=str(tmp_path))
+
+    with unittest.mock.patch.object(
+        _torch_batch_process, "_initialize_default_inference_context", return_value=core_context
+    ), unittest.mock.patch.object(
+        core_context.checkpoint, "store_path", side_effect=OSError("upload failed")
+    ), test_util.set_mock_cluster_info(
+        DEFAULT_ADDRS, 0, 1
+    ):
+        with pytest.raises(OSError, match="upload failed"):
+            experimental.torch_batch_process(
+                dataset=IndexData(35),
+                batch_processor_cls=processor_cls,
+                batch_size=5,
+                checkpoint_interval=2,
+            )
+
+
 @unittest.mock.patch("determined.pytorch.to_device")
 @unittest.mock.patch("determined.pytorch.experimental._torch_batch_process.get_default_device")
 def test_torch_batch_processor_context_to_device_sends_tensor_to_device(
@@ -4,6 +4,7 @@ import json
 import os
 import pathlib
 from typing import Any, Dict, Iterator, Optional
+from unittest import mock
 
 import pytest
 import torch
@@ -12,6 +13,7 @@ from deepspeed.runtime import config_utils
 import determined
 import determined.pytorch.deepspeed as det_deepspeed
 from determined import workload
+from determined.pytorch.deepspeed import _deepspeed_trial
 from tests.experiment import utils  # noqa: I100
 from tests.experiment.fixtures import deepspeed_linear_model
 
@@ -664,3 +666,120 @@ def test_overwrite_deepspeed_config() -> None:
     # Test fail invalid base_ds_config argument.
     with pytest.raises(TypeError, match="Expected string or dict for base_ds_config argument."):
         _ = det_deepspeed.overwrite_deepspeed_config([1, 2], source_ds_config)
+
+
+class FakeCheckpointEngine:
+    def save(self, state_dict: Any, path: str) -> None:
+        torch.save(state_dict, path)
+
+
+class FakeZeroEngine:
+    """A stand-in for one rank's ZeRO-enabled model engine, as far as checkpointing goes."""
+
+    def __init__(
+        self, dp_rank: int, mp_rank: int = 0, elastic: bool = False, stage3: bool = False
+    ) -> None:
+        self.dp_rank = dp_rank
+        self.mp_rank = mp_rank
+        self.elastic = elastic
+        self.stage3 = stage3
+        self.checkpoint_engine = FakeCheckpointEngine()
+
+    def zero_optimization(self) -> bool:
+        return True
+
+    def zero_elastic_checkpoint(self) -> bool:
+        return self.elastic
+
+    def _get_ckpt_name(self, path: str, tag: str) -> str:
+        if self.stage3:
+            name = f"zero_pp_rank_{self.dp_rank}_mp_rank_{self.mp_rank:02d}_model_states.pt"
+        else:
+            name = f"mp_rank_{self.mp_rank:02d}_model_states.pt"
+        return os.path.join(path, tag, name)
+
+    def _get_zero_ckpt_name(self, path: str, tag: str) -> str:
+        name = f"zero_pp_rank_{self.dp_rank}_mp_rank_{self.mp_rank:02d}_optim_states.pt"
+        return os.path.join(path, tag, name)
+
+    def save_checkpoint(self, path: str, tag: str) -> None:
+        os.makedirs(os.path.join(path, tag), exist_ok=True)
+        if self.dp_rank == 0 or self.stage3:
+            self.checkpoint_engine.save({}, self._get_ckpt_name(path, tag))
+        self.checkpoint_engine.save({}, self._get_zero_ckpt_name(path, tag))
+
+
+@pytest.mark.deepspeed
+def test_shard_selector() -> None:
+    files = [
+        "latest",
+        "det_state_dict_rank0.pth",
+        "det_state_dict_rank1.pth",
+        "model0/",
+        "model0/mp_rank_00_model_states.pt",
+        "model0/zero_pp_rank_0_mp_rank_00_optim_states.pt",
+        "model0/zero_pp_rank_1_mp_rank_00_optim_states.pt",
+    ]
+    selector = _deepspeed_trial._shard_selector([FakeZeroEngine(1)], rank=1)
+    assert [f for f in files if selector(f)] == [
+        "latest",
+        "det_state_dict_rank1.pth",
+        "model0/",
+        "model0/mp_rank_00_model_states.pt",
+        "model0/zero_pp_rank_1_mp_rank_00_optim_states.pt",
+    ]
+
+    # Elastic checkpoints read every rank's ZeRO states.
+    selector = _deepspeed_trial._shard_selector([FakeZeroEngine(1, elastic=True)], rank=1)
+    assert [f for f in files if selector(f)] == [f for f in files if f != files[1]]
+
+    # DeepSpeed reads every model parallel rank's model states, but only its own optimizer states.
+    files = [
+        "det_state_dict_rank0.pth",
+        "det_state_dict_rank1.pth",
+        "model0/mp_rank_00_model_states.pt",
+        "model0/mp_rank_01_model_states.pt",
+        "model0/zero_pp_rank_0_mp_rank_00_optim_states.pt",
+        "model0/zero_pp_rank_0_mp_rank_01_optim_states.pt",
+    ]
+    selector = _deepspeed_trial._shard_selector([FakeZeroEngine(0, mp_rank=1)], rank=1)
+    assert [f for f in files if selector(f)] == [
+        "det_state_dict_rank1.pth",
+        "model0/mp_rank_00_model_states.pt",
+        "model0/mp_rank_01_model_states.pt",
+        "model0/zero_pp_rank_0_mp_rank_01_optim_states.pt",
+    ]
+
+    # The same goes for ZeRO-3's model states, which are also split by data parallel rank.
+    files = [
+        f"model0/zero_pp_rank_{dp}_mp_rank_{mp:02d}_{kind}_states.pt"
+        for dp in range(2)
+        for mp in range(2)
+        for kind in ("model", "optim")
+    ]
+    engine = FakeZeroEngine(1, mp_rank=0, stage3=True)
+    selector = _deepspeed_trial._shard_selector([engine], rank=2)
+    assert [f for f in files if selector(f)] == [
+        "model0/zero_pp_rank_1_mp_rank_00_model_states.pt",
+        "model0/zero_pp_rank_1_mp_rank_00_optim_states.pt",
+        "model0/zero_pp_rank_1_mp_rank_01_model_states.pt",
+    ]
+
+    # Engines which cannot name their shards restore everything.
+    assert _deepspeed_trial._shard_selector([object()], rank=1) is None
+
+
+@pytest.mark.deepspeed
+def test_stream_engine_saves(tmp_path: pathlib.Path) -> None:
+    stream = mock.MagicMock()
+    engine = FakeZeroEngine(0)
+    with _deepspeed_trial._stream_engine_saves([engine], stream):
+        engine.save_checkpoint(str(tmp_path), "model0")
+    assert stream.submit.call_args_list == [
+        mock.call(str(tmp_path.joinpath("model0", "mp_rank_00_model_states.pt"))),
+        mock.call(str(tmp_path.joinpath("model0", "zero_pp_rank_0_mp_rank_00_optim_states.pt"))),
+    ]
+
+    # The checkpoint engine is unwrapped afterwards.
+    engine.save_checkpoint(str(tmp_path), "model1")
+    assert stream.submit.call_count == 2
@@ -1,8 +1,10 @@
 # type: ignore
 import os
+import types
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import pytest
 import tensorflow as tf
 from packaging import version
@@ -593,3 +595,46 @@ def test_rng_restore(tmp_path: Path):
 
     assert len(trial_B_metrics) == len(trial_C_metrics) == 5
     assert trial_B_metrics == trial_C_metrics
+
+
+def test_allreduce_logs_uses_one_collective(monkeypatch):
+    from determined.keras import _tf_keras_trial
+
+    calls = []
+
+    class FakeHorovod:
+        Average = "average"
+        Sum = "sum"
+
+        def rank(self):
+            return 0
+
+        def allreduce(self, value, name, op=None, average=None):
+            assert op == self.Average
+            calls.append(name)
+            # Every worker reports the same values, so the average is the input.
+            return np.asarray(value)
+
+    monkeypatch.setattr(_tf_keras_trial, "hvd", FakeHorovod())
+    _tf_keras_trial._hvd_allreduce_params.cache_clear()
+
+    controller = types.SimpleNamespace(
+        context=types.SimpleNamespace(distributed=types.SimpleNamespace(size=2))
+    )
+    cls = _tf_keras_trial.TFKerasTrialController
+    for name in ("_convert_possible_tensor", "_hvd_allreduce"):
+        setattr(controller, name, getattr(cls, name).__get__(controller))
+
+    logs = {"loss": np.float32(0.5), "acc": 1.0, "hist": np.ones(3)}
+    try:
+        reduced, counts = cls._allreduce_logs(controller, logs, [10, 3])
+    finally:
+        _tf_keras_trial._hvd_allreduce_params.cache_clear()
+
+    # Scalar logs and counts share one collective; only the non-scalar log needs its own.
+    assert calls == ["fused_logs", "hist"]
+    assert counts == [20, 6]
+    assert list(reduced) == ["acc", "hist", "loss"]
+    assert reduced["loss"] == 0.5 and reduced["loss"].dtype == np.float32
+    assert reduced["acc"] == 1.0
+    assert list(reduced["hist"]) == [1.0, 1.0, 1.0]
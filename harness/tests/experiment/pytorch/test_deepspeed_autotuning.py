@@ -3,6 +3,7 @@ import copy
 import json
 import math
 import pathlib
+import pickle
 import shutil
 import tempfile
 from collections import deque
@@ -489,6 +490,49 @@ class TestDSATTrialTracker:
             assert trial_tracker.best_trial == popped_trial
             assert trial_tracker.best_trials_by_stage[popped_trial.stage] == popped_trial
 
+    @pytest.mark.timeout(5)
+    def test_indices_match_trial_states(
+        self, basic_queue_and_trial_tracker: Tuple[List[DSATTrial], DSATTrialTracker]
+    ) -> None:
+        """
+        Verify the incrementally maintained views agree with the states of the trials, including
+        after the tracker is pickled and restored.
+        """
+        queued_trials, trial_tracker = basic_queue_and_trial_tracker
+
+        def check(trial_tracker: DSATTrialTracker) -> None:
+            trials = [trial for _, trial in trial_tracker]
+            assert trial_tracker.running_trials == [t for t in trials if t.running]
+            assert trial_tracker.completed_trials == [t for t in trials if t.completed]
+            assert trial_tracker.leaf_trials == [t for t in trials if not t.children]
+            for stage in range(4):
+                stage_trials = [t for t in trials if t.stage == stage]
+                best = trial_tracker._best_trial_fn(stage_trials)
+                assert trial_tracker.best_trials_by_stage[stage] == best
+
+        metric_name = queued_trials[0].searcher_metric_name
+        assert metric_name
+        for idx, trial in enumerate(queued_trials):
+            trial.running = True
+            check(trial_tracker)
+            if idx % 3 == 2:
+                trial_tracker.report_trial_early_exit(trial)
+            else:
+                # Ties between equal metrics are broken by registration order.
+                trial_tracker.update_trial_metric(trial, {metric_name: float(idx % 2)})
+            check(trial_tracker)
+
+        # Changing the best trial's metric invalidates its stage.
+        best = trial_tracker.best_trial
+        assert best is not None
+        best.metric = {metric_name: 100.0 if trial_tracker.smaller_is_better else -100.0}
+        check(trial_tracker)
+        assert trial_tracker.best_trial != best
+
+        restored = pickle.loads(pickle.dumps(trial_tracker))
+        check(restored)
+        assert restored.should_be_failure == trial_tracker.should_be_failure
+
 
 def search_state_and_method_builder(
     args: argparse.Namespace,
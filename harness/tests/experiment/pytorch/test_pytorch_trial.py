@@ -224,6 +224,49 @@ class TestPyTorchTrial:
             )
             trial_controller_A.run()
 
+    def test_restore_memory_maps_checkpoint(self, tmp_path: pathlib.Path) -> None:
+        _, trial_controller = pytorch_utils.create_trial_and_trial_controller(
+            trial_class=pytorch_onevar_model.OneVarTrial,
+            hparams=self.hparams,
+            trial_seed=self.trial_seed,
+            max_batches=1,
+            checkpoint_dir=str(tmp_path.joinpath("checkpoint")),
+            tensorboard_path=tmp_path.joinpath("tensorboard"),
+        )
+        model = trial_controller.context.models[0]
+        optimizer = trial_controller.context.optimizers[0]
+        param = next(model.parameters())
+
+        weights = {k: torch.full_like(v, 3.0) for k, v in model.state_dict().items()}
+        optimizer_state = optimizer.state_dict()
+        optimizer_state["state"] = {0: {"momentum_buffer": torch.full_like(param, 2.0)}}
+        load_path = tmp_path.joinpath("restore")
+        load_path.mkdir()
+        torch.save(
+            {"models_state_dict": [weights], "optimizers_state_dict": [optimizer_state]},
+            load_path.joinpath("state_dict.pth"),
+        )
+
+        loaded = []
+        torch_load = torch.load
+
+        def load(*args, **kwargs):
+            loaded.append((kwargs, torch_load(*args, **kwargs)))
+            return loaded[-1][1]
+
+        with mock.patch.object(torch, "load", load):
+            trial_controller._load(load_path)
+
+        ((kwargs, checkpoint),) = loaded
+        assert kwargs.get("mmap") is True
+        check_equal_structures(model.state_dict(), weights)
+
+        # The optimizer state is copied out of the mapped file, instead of keeping it open.
+        momentum_buffer = optimizer.state[param]["momentum_buffer"]
+        mapped = checkpoint["optimizers_state_dict"][0]["state"][0]["momentum_buffer"]
+        assert torch.equal(momentum_buffer, mapped)
+        assert momentum_buffer.data_ptr() != mapped.data_ptr()
+
     def test_reproducibility(self, tmp_path: pathlib.Path) -> None:
         tensorboard_path = tmp_path.joinpath("tensorboard")
 
@@ -0,0 +1,600 @@
+"""
+In-process stand-ins for the S3, GCS, and Azure Blob Storage REST APIs, for exercising the real
+storage managers and their SDKs without cloud credentials.
+
+Each fake serves just the requests the storage managers make, keeps objects in memory, and counts
+the requests it serves by API operation, so that tests and benchmarks can check how many round trips
+an upload, download, or delete costs. The fakes do not check credentials.
+"""
+import base64
+import collections
+import email.utils
+import http.server
+import itertools
+import re
+import threading
+import urllib.parse
+import xml.etree.ElementTree as ET
+from types import TracebackType
+from typing import Any, Counter, Dict, List, Optional, Set, Tuple, Type, TypeVar
+from xml.sax.saxutils import escape
+
+_Fake = TypeVar("_Fake", bound="FakeCloud")
+
+
+class FakeCloud:
+    """A fake object store, served over HTTP by a background thread until close() is called."""
+
+    def __init__(self) -> None:
+        self.objects: Dict[Tuple[str, str], bytes] = {}
+        self.requests: Counter[str] = collections.Counter()
+        self.lock = threading.Lock()
+        self._etags = itertools.count()
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.server.daemon_threads = True
+        self.server.request_queue_size = 128
+        setattr(self.server, "cloud", self)
+        self.port = self.server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    handler: Type["_Handler"]
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
+
+    def __enter__(self: _Fake) -> _Fake:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def count(self, operation: str) -> None:
+        with self.lock:
+            self.requests[operation] += 1
+
+    def reset_counts(self) -> Counter[str]:
+        """Return the request counts since the last reset, and start counting from zero."""
+        with self.lock:
+            counts, self.requests = self.requests, collections.Counter()
+        return counts
+
+    def next_etag(self) -> str:
+        return f'"{next(self._etags):032x}"'
+
+    def list(self, bucket: str, prefix: str, start_after: str = "") -> List[str]:
+        with self.lock:
+            names = [k for b, k in self.objects if b == bucket and k.startswith(prefix)]
+        return sorted(k for k in names if k > start_after)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # Keep connections alive, like the real services do.
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately; don't let Nagle's algorithm delay the bodies.
+    disable_nagle_algorithm = True
+
+    @property
+    def cloud(self) -> Any:
+        return getattr(self.server, "cloud")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def parse(self) -> Tuple[List[str], Dict[str, str]]:
+        """Split the request path into unquoted segments and the query into a flat dict."""
+        parsed = urllib.parse.urlsplit(self.path)
+        segments = [urllib.parse.unquote(s) for s in parsed.path.lstrip("/").split("/")]
+        query = dict(urllib.parse.parse_qsl(parsed.query, keep_blank_values=True))
+        return segments, query
+
+    def read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    # Skip any trailers.
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    return b"".join(chunks)
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def respond(
+        self,
+        status: int,
+        body: bytes = b"",
+        content_type: str = "application/xml",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Date", email.utils.formatdate(usegmt=True))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def byte_range(self, header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+        """Parse a "bytes=start-end" header into an inclusive range, clamped to the object."""
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", header or "")
+        if match is None:
+            return None
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        return start, min(end, size - 1)
+
+
+def _xml(root: str, body: str, ns: str = "") -> bytes:
+    xmlns = f' xmlns="{ns}"' if ns else ""
+    return f'<?xml version="1.0" encoding="UTF-8"?><{root}{xmlns}>{body}</{root}>'.encode()
+
+
+def _children(body: bytes, tag: str) -> List[str]:
+    """The text of every element named tag in an XML document, ignoring namespaces."""
+    return [el.text or "" for el in ET.fromstring(body).iter() if el.tag.split("}")[-1] == tag]
+
+
+def _aws_chunked(body: bytes) -> bytes:
+    """Decode an aws-chunked body, which boto3 uses to send checksums as trailers."""
+    out: List[bytes] = []
+    pos = 0
+    while True:
+        eol = body.index(b"\r\n", pos)
+        size = int(body[pos:eol].split(b";")[0], 16)
+        if size == 0:
+            return b"".join(out)
+        out.append(body[eol + 2 : eol + 2 + size])
+        pos = eol + 2 + size + 2
+
+
+class _S3Handler(_Handler):
+    NS = "http://s3.amazonaws.com/doc/2006-03-01/"
+
+    def not_found(self, code: str = "NoSuchKey") -> None:
+        self.respond(404, _xml("Error", f"<Code>{code}</Code>"))
+
+    def body(self) -> bytes:
+        body = self.read_body()
+        if "aws-chunked" in self.headers.get("Content-Encoding", "") or self.headers.get(
+            "x-amz-content-sha256", ""
+        ).startswith("STREAMING-"):
+            body = _aws_chunked(body)
+        return body
+
+    def do_GET(self) -> None:
+        segments, query = self.parse()
+        if segments == [""]:
+            # The S3 manager probes the endpoint to detect MinIO.
+            self.respond(200, _xml("ListAllMyBucketsResult", "<Buckets></Buckets>", self.NS))
+            return
+        if len(segments) == 1 or segments[1] == "":
+            self.list_objects(segments[0], query)
+            return
+        self.get_object(segments[0], "/".join(segments[1:]))
+
+    def do_HEAD(self) -> None:
+        segments, _ = self.parse()
+        self.get_object(segments[0], "/".join(segments[1:]), head=True)
+
+    def get_object(self, bucket: str, key: str, head: bool = False) -> None:
+        self.cloud.count("HeadObject" if head else "GetObject")
+        data = self.cloud.objects.get((bucket, key))
+        if data is None:
+            self.not_found()
+            return
+        headers = {"ETag": self.cloud.etags.get((bucket, key), '"0"')}
+        headers["Last-Modified"] = email.utils.formatdate(usegmt=True)
+        headers["Accept-Ranges"] = "bytes"
+        rng = None if head else self.byte_range(self.headers.get("Range"), len(data))
+        if rng is None:
+            self.respond(200, data, "binary/octet-stream", headers)
+            return
+        start, end = rng
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        self.respond(206, data[start : end + 1], "binary/octet-stream", headers)
+
+    def list_objects(self, bucket: str, query: Dict[str, str]) -> None:
+        v2 = query.get("list-type") == "2"
+        self.cloud.count("ListObjectsV2" if v2 else "ListObjects")
+        start_after = query.get("continuation-token" if v2 else "marker", "")
+        max_keys = int(query.get("max-keys", 1000))
+        keys = self.cloud.list(bucket, query.get("prefix", ""), start_after)
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+        encode = query.get("encoding-type") == "url"
+        contents = []
+        for key in page:
+            name = urllib.parse.quote(key) if encode else escape(key)
+            size = len(self.cloud.objects.get((bucket, key), b""))
+            etag = self.cloud.etags.get((bucket, key), '"0"')
+            contents.append(
+                f"<Contents><Key>{name}</Key><Size>{size}</Size><ETag>{escape(etag)}</ETag>"
+                "<LastModified>2024-01-01T00:00:00.000Z</LastModified>"
+                "<StorageClass>STANDARD</StorageClass></Contents>"
+            )
+        body = f"<Name>{bucket}</Name><IsTruncated>{str(truncated).lower()}</IsTruncated>"
+        if encode:
+            body += "<EncodingType>url</EncodingType>"
+        if v2:
+            body += f"<KeyCount>{len(page)}</KeyCount>"
+            if truncated:
+                body += f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>"
+        elif truncated:
+            body += f"<NextMarker>{escape(page[-1])}</NextMarker>"
+        self.respond(200, _xml("ListBucketResult", body + "".join(contents), self.NS))
+
+    def do_PUT(self) -> None:
+        segments, query = self.parse()
+        bucket, key = segments[0], "/".join(segments[1:])
+        data = self.body()
+        if "uploadId" in query:
+            self.cloud.count("UploadPart")
+            with self.cloud.lock:
+                parts = self.cloud.uploads.get(query["uploadId"])
+                if parts is None:
+                    self.not_found("NoSuchUpload")
+                    return
+                parts[int(query["partNumber"])] = data
+            self.respond(200, headers={"ETag": self.cloud.next_etag()})
+            return
+        self.cloud.count("PutObject")
+        etag = self.cloud.next_etag()
+        with self.cloud.lock:
+            self.cloud.objects[(bucket, key)] = data
+            self.cloud.etags[(bucket, key)] = etag
+        self.respond(200, headers={"ETag": etag})
+
+    def do_POST(self) -> None:
+        segments, query = self.parse()
+        bucket, key = segments[0], "/".join(segments[1:])
+        body = self.body()
+        if "delete" in query:
+            self.cloud.count("DeleteObjects")
+            keys = _children(body, "Key")
+            with self.cloud.lock:
+                for k in keys:
+                    self.cloud.objects.pop((bucket, k), None)
+                    self.cloud.etags.pop((bucket, k), None)
+            deleted = "".join(f"<Deleted><Key>{escape(k)}</Key></Deleted>" for k in keys)
+            self.respond(200, _xml("DeleteResult", deleted, self.NS))
+        elif "uploads" in query:
+            self.cloud.count("CreateMultipartUpload")
+            upload_id = self.cloud.next_etag().strip('"')
+            with self.cloud.lock:
+                self.cloud.uploads[upload_id] = {}
+            body_xml = (
+                f"<Bucket>{bucket}</Bucket><Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId>"
+            )
+            self.respond(200, _xml("InitiateMultipartUploadResult", body_xml, self.NS))
+        elif "uploadId" in query:
+            self.cloud.count("CompleteMultipartUpload")
+            part_numbers = [int(n) for n in _children(body, "PartNumber")]
+            etag = self.cloud.next_etag()
+            with self.cloud.lock:
+                parts = self.cloud.uploads.pop(query["uploadId"])
+                self.cloud.objects[(bucket, key)] = b"".join(parts[n] for n in part_numbers)
+                self.cloud.etags[(bucket, key)] = etag
+            body_xml = f"<Bucket>{bucket}</Bucket><Key>{escape(key)}</Key><ETag>{etag}</ETag>"
+            self.respond(200, _xml("CompleteMultipartUploadResult", body_xml, self.NS))
+        else:
+            self.respond(400, _xml("Error", "<Code>NotImplemented</Code>"))
+
+    def do_DELETE(self) -> None:
+        segments, query = self.parse()
+        bucket, key = segments[0], "/".join(segments[1:])
+        self.read_body()
+        with self.cloud.lock:
+            if "uploadId" in query:
+                self.cloud.count("AbortMultipartUpload")
+                self.cloud.uploads.pop(query["uploadId"], None)
+            else:
+                self.cloud.count("DeleteObject")
+                self.cloud.objects.pop((bucket, key), None)
+                self.cloud.etags.pop((bucket, key), None)
+        self.respond(204)
+
+
+class FakeS3(FakeCloud):
+    """
+    A fake S3 endpoint, for S3StorageManager(endpoint_url=fake.url). It understands path-style
+    addressing, which boto3 uses for endpoints which are IP addresses.
+    """
+
+    handler = _S3Handler
+
+    def __init__(self) -> None:
+        self.etags: Dict[Tuple[str, str], str] = {}
+        self.uploads: Dict[str, Dict[int, bytes]] = {}
+        super().__init__()
+
+
+class _GCSHandler(_Handler):
+    def resource(self, bucket: str, name: str) -> Dict[str, Any]:
+        data = self.cloud.objects[(bucket, name)]
+        return {
+            "kind": "storage#object",
+            "id": f"{bucket}/{name}",
+            "name": name,
+            "bucket": bucket,
+            "size": str(len(data)),
+            "generation": "1",
+            "crc32c": self.cloud.crc32c[(bucket, name)],
+            "updated": "2024-01-01T00:00:00.000Z",
+        }
+
+    def json(self, status: int, obj: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        import json
+
+        self.respond(status, json.dumps(obj).encode(), "application/json", headers)
+
+    def not_found(self) -> None:
+        self.json(404, {"error": {"code": 404, "message": "No such object."}})
+
+    def store(self, bucket: str, name: str, data: bytes) -> None:
+        import google_crc32c
+
+        digest = google_crc32c.Checksum(data).digest()  # type: ignore
+        crc = base64.b64encode(digest).decode("ascii")
+        with self.cloud.lock:
+            self.cloud.objects[(bucket, name)] = data
+            self.cloud.crc32c[(bucket, name)] = crc
+        self.json(200, self.resource(bucket, name))
+
+    def do_POST(self) -> None:
+        import json
+
+        segments, query = self.parse()
+        # /upload/storage/v1/b/<bucket>/o
+        bucket = segments[4]
+        body = self.read_body()
+        upload_type = query.get("uploadType")
+        if upload_type == "multipart":
+            self.cloud.count("objects.insert")
+            match = re.search(r'boundary="?([^";]+)"?', self.headers["Content-Type"])
+            assert match, self.headers["Content-Type"]
+            delimiter = b"--" + match.group(1).encode()
+            # The first part is the object's metadata, the second its data.
+            _, metadata_part, data_part = body.split(delimiter, 2)
+            metadata = json.loads(metadata_part.split(b"\r\n\r\n", 1)[1])
+            data = data_part.split(b"\r\n\r\n", 1)[1]
+            data = data[: data.rindex(b"\r\n" + delimiter + b"--")]
+            self.store(bucket, metadata["name"], data)
+        elif upload_type == "resumable":
+            self.cloud.count("objects.insert")
+            name = query.get("name") or json.loads(body)["name"]
+            upload_id = str(next(self.cloud.upload_ids))
+            with self.cloud.lock:
+                self.cloud.uploads[upload_id] = (bucket, name, bytearray())
+            location = (
+                f"{self.cloud.url}/upload/storage/v1/b/{bucket}/o"
+                f"?uploadType=resumable&upload_id={upload_id}"
+            )
+            self.json(200, {}, {"Location": location})
+        elif upload_type == "media":
+            self.cloud.count("objects.insert")
+            self.store(bucket, query["name"], body)
+        else:
+            self.json(400, {"error": {"code": 400, "message": "unsupported upload"}})
+
+    def do_PUT(self) -> None:
+        # A chunk of a resumable upload.
+        self.cloud.count("objects.insert.chunk")
+        _, query = self.parse()
+        data = self.read_body()
+        with self.cloud.lock:
+            bucket, name, received = self.cloud.uploads[query["upload_id"]]
+            received += data
+        match = re.fullmatch(r"bytes (\*|\d+-\d+)/(\d+|\*)", self.headers.get("Content-Range", ""))
+        if match is None or match.group(2) == "*" or int(match.group(2)) > len(received):
+            headers = {"Range": f"bytes=0-{len(received) - 1}"} if received else {}
+            self.respond(308, headers=headers)
+            return
+        with self.cloud.lock:
+            del self.cloud.uploads[query["upload_id"]]
+        self.store(bucket, name, bytes(received))
+
+    def do_GET(self) -> None:
+        segments, query = self.parse()
+        if segments[0] == "download":
+            segments = segments[1:]
+        # /storage/v1/b/<bucket>/o[/<name>]
+        bucket = segments[3]
+        if len(segments) == 5:
+            self.list_objects(bucket, query)
+            return
+        name = "/".join(segments[5:])
+        if (bucket, name) not in self.cloud.objects:
+            self.cloud.count("objects.get")
+            self.not_found()
+            return
+        if query.get("alt") != "media":
+            self.cloud.count("objects.get")
+            self.json(200, self.resource(bucket, name))
+            return
+        self.cloud.count("objects.get.media")
+        data = self.cloud.objects[(bucket, name)]
+        headers = {
+            "x-goog-hash": f"crc32c={self.cloud.crc32c[(bucket, name)]}",
+            "x-goog-generation": "1",
+            "x-goog-stored-content-length": str(len(data)),
+        }
+        rng = self.byte_range(self.headers.get("Range"), len(data))
+        if rng is None:
+            self.respond(200, data, "application/octet-stream", headers)
+            return
+        start, end = rng
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        self.respond(206, data[start : end + 1], "application/octet-stream", headers)
+
+    def list_objects(self, bucket: str, query: Dict[str, str]) -> None:
+        self.cloud.count("objects.list")
+        max_results = int(query.get("maxResults", 1000))
+        names = self.cloud.list(bucket, query.get("prefix", ""), query.get("pageToken", ""))
+        page = names[:max_results]
+        result: Dict[str, Any] = {
+            "kind": "storage#objects",
+            "items": [self.resource(bucket, n) for n in page],
+        }
+        if len(names) > max_results:
+            result["nextPageToken"] = page[-1]
+        self.json(200, result)
+
+    def do_DELETE(self) -> None:
+        self.cloud.count("objects.delete")
+        segments, _ = self.parse()
+        bucket, name = segments[3], "/".join(segments[5:])
+        with self.cloud.lock:
+            found = self.cloud.objects.pop((bucket, name), None) is not None
+            self.cloud.crc32c.pop((bucket, name), None)
+        if not found:
+            self.not_found()
+            return
+        self.respond(204, content_type="application/json")
+
+
+class FakeGCS(FakeCloud):
+    """
+    A fake GCS JSON API endpoint. google-cloud-storage sends its requests here when the
+    STORAGE_EMULATOR_HOST environment variable is set to fake.url.
+    """
+
+    handler = _GCSHandler
+
+    def __init__(self) -> None:
+        self.crc32c: Dict[Tuple[str, str], str] = {}
+        self.uploads: Dict[str, Tuple[str, str, bytearray]] = {}
+        self.upload_ids = itertools.count()
+        super().__init__()
+
+
+class _AzureHandler(_Handler):
+    def error(self, status: int, code: str) -> None:
+        body = _xml("Error", f"<Code>{code}</Code><Message>{code}</Message>")
+        self.respond(status, body, headers={"x-ms-error-code": code})
+
+    def blob_headers(self, container: str, name: str) -> Dict[str, str]:
+        return {
+            "ETag": self.cloud.etags[(container, name)],
+            "Last-Modified": email.utils.formatdate(usegmt=True),
+            "x-ms-blob-type": "BlockBlob",
+            "x-ms-request-server-encrypted": "false",
+        }
+
+    def do_PUT(self) -> None:
+        segments, query = self.parse()
+        # /<account>/<container>[/<blob>]
+        container, name = segments[1], "/".join(segments[2:])
+        data = self.read_body()
+        if query.get("restype") == "container":
+            self.cloud.count("CreateContainer")
+            with self.cloud.lock:
+                exists = container in self.cloud.containers
+                self.cloud.containers.add(container)
+            if exists:
+                self.error(409, "ContainerAlreadyExists")
+            else:
+                self.respond(201, headers={"ETag": self.cloud.next_etag()})
+            return
+        if query.get("comp") == "block":
+            self.cloud.count("PutBlock")
+            with self.cloud.lock:
+                self.cloud.blocks[(container, name, query["blockid"])] = data
+            self.respond(201)
+            return
+        if query.get("comp") == "blocklist":
+            self.cloud.count("PutBlockList")
+            # Blocks are committed in the order the list names them, whatever their tag.
+            root = ET.fromstring(data)
+            block_ids = [el.text or "" for el in root]
+            with self.cloud.lock:
+                data = b"".join(self.cloud.blocks.pop((container, name, b)) for b in block_ids)
+        else:
+            self.cloud.count("PutBlob")
+        with self.cloud.lock:
+            self.cloud.objects[(container, name)] = data
+            self.cloud.etags[(container, name)] = self.cloud.next_etag()
+        self.respond(201, headers=self.blob_headers(container, name))
+
+    def do_GET(self) -> None:
+        segments, query = self.parse()
+        container, name = segments[1], "/".join(segments[2:])
+        if query.get("comp") == "list":
+            self.list_blobs(container, query)
+            return
+        self.cloud.count("GetBlob")
+        data = self.cloud.objects.get((container, name))
+        if data is None:
+            self.error(404, "BlobNotFound")
+            return
+        headers = self.blob_headers(container, name)
+        headers["Accept-Ranges"] = "bytes"
+        header = self.headers.get("x-ms-range") or self.headers.get("Range")
+        rng = self.byte_range(header, len(data))
+        if rng is None:
+            self.respond(200, data, "application/octet-stream", headers)
+            return
+        if not data:
+            # Like the real service, a range of an empty blob is unsatisfiable.
+            headers["Content-Range"] = "bytes */0"
+            self.error(416, "InvalidRange")
+            return
+        start, end = rng
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+        self.respond(206, data[start : end + 1], "application/octet-stream", headers)
+
+    def list_blobs(self, container: str, query: Dict[str, str]) -> None:
+        self.cloud.count("ListBlobs")
+        max_results = int(query.get("maxresults", 5000))
+        names = self.cloud.list(container, query.get("prefix", ""), query.get("marker", ""))
+        page = names[:max_results]
+        blobs = "".join(
+            f"<Blob><Name>{escape(n)}</Name><Properties>"
+            f"<Last-Modified>{email.utils.formatdate(usegmt=True)}</Last-Modified>"
+            f"<Etag>{self.cloud.etags.get((container, n), '')}</Etag>"
+            f"<Content-Length>{len(self.cloud.objects.get((container, n), b''))}</Content-Length>"
+            "<BlobType>BlockBlob</BlobType></Properties></Blob>"
+            for n in page
+        )
+        next_marker = escape(page[-1]) if len(names) > max_results else ""
+        body = f"<Blobs>{blobs}</Blobs><NextMarker>{next_marker}</NextMarker>"
+        self.respond(200, _xml("EnumerationResults", body))
+
+    def do_DELETE(self) -> None:
+        self.cloud.count("DeleteBlob")
+        segments, _ = self.parse()
+        container, name = segments[1], "/".join(segments[2:])
+        with self.cloud.lock:
+            found = self.cloud.objects.pop((container, name), None) is not None
+            self.cloud.etags.pop((container, name), None)
+        if not found:
+            self.error(404, "BlobNotFound")
+            return
+        self.respond(202)
+
+
+class FakeAzure(FakeCloud):
+    """
+    A fake Azure Blob Storage account, addressed like Azurite: AzureStorageManager(
+    account_url=fake.account_url) with no credential.
+    """
+
+    handler = _AzureHandler
+
+    def __init__(self, account: str = "devstoreaccount1") -> None:
+        self.etags: Dict[Tuple[str, str], str] = {}
+        self.containers: Set[str] = set()
+        self.blocks: Dict[Tuple[str, str, str], bytes] = {}
+        super().__init__()
+        self.account_url = f"{self.url}/{account}"
@@ -0,0 +1,122 @@
+import os
+import pathlib
+from typing import List, Optional, Union
+
+from determined.common import storage
+from tests.storage import util
+
+
+class RecordingManager(storage.SharedFSStorageManager):
+    """A shared_fs manager which records the files it is asked to download."""
+
+    def __init__(self, base_path: str) -> None:
+        super().__init__(base_path)
+        self.downloaded: List[str] = []
+
+    def download(
+        self,
+        src: str,
+        dst: Union[str, os.PathLike],
+        selector: Optional[storage.Selector] = None,
+    ) -> None:
+        def recording_selector(path: str) -> bool:
+            want = selector is None or selector(path)
+            if want and not path.endswith("/"):
+                self.downloaded.append(path)
+            return want
+
+        super().download(src, dst, recording_selector)
+
+
+def make_manager(tmp_path: pathlib.Path, *storage_ids: str) -> RecordingManager:
+    manager = RecordingManager(str(tmp_path.joinpath("storage")))
+    for storage_id in storage_ids:
+        util.create_checkpoint(pathlib.Path(manager._base_path, storage_id))
+    return manager
+
+
+def expected_files() -> List[str]:
+    return sorted(f for f, content in util.EXPECTED_FILES.items() if content is not None)
+
+
+def test_cache_serves_hits_by_hardlink(tmp_path: pathlib.Path) -> None:
+    manager = make_manager(tmp_path, "ckpt")
+    cache = storage.CheckpointCache(tmp_path.joinpath("cache"))
+
+    cache.download(manager, "ckpt", tmp_path.joinpath("a"))
+    assert sorted(manager.downloaded) == expected_files()
+    util.validate_checkpoint(tmp_path.joinpath("a"), util.EXPECTED_FILES)
+
+    manager.downloaded.clear()
+    cache.download(manager, "ckpt", tmp_path.joinpath("b"))
+    assert manager.downloaded == []
+    util.validate_checkpoint(tmp_path.joinpath("b"), util.EXPECTED_FILES)
+    a_stat = tmp_path.joinpath("a", "root.txt").stat()
+    b_stat = tmp_path.joinpath("b", "root.txt").stat()
+    assert a_stat.st_ino == b_stat.st_ino
+
+
+def test_cache_with_selector(tmp_path: pathlib.Path) -> None:
+    manager = make_manager(tmp_path, "ckpt")
+    cache = storage.CheckpointCache(tmp_path.joinpath("cache"))
+
+    cache.download(manager, "ckpt", tmp_path.joinpath("a"), lambda p: p == "root.txt")
+    assert manager.downloaded == ["root.txt"]
+    assert not tmp_path.joinpath("a", "subdir", "file1.txt").exists()
+
+    # A partially cached checkpoint only downloads the files it is missing.
+    manager.downloaded.clear()
+    cache.download(manager, "ckpt", tmp_path.joinpath("b"))
+    assert sorted(manager.downloaded) == [f for f in expected_files() if f != "root.txt"]
+    util.validate_checkpoint(tmp_path.joinpath("b"), util.EXPECTED_FILES)
+
+
+def test_cache_redownloads_modified_files(tmp_path: pathlib.Path) -> None:
+    manager = make_manager(tmp_path, "ckpt")
+    cache = storage.CheckpointCache(tmp_path.joinpath("cache"))
+
+    cache.download(manager, "ckpt", tmp_path.joinpath("a"))
+    # Writing through the hardlink modifies the cached file as well.
+    with tmp_path.joinpath("a", "root.txt").open("a") as f:
+        f.write("modified")
+
+    manager.downloaded.clear()
+    cache.download(manager, "ckpt", tmp_path.joinpath("b"))
+    assert manager.downloaded == ["root.txt"]
+    util.validate_checkpoint(tmp_path.joinpath("b"), util.EXPECTED_FILES)
+
+
+def test_cache_verifies_content(tmp_path: pathlib.Path) -> None:
+    manager = make_manager(tmp_path, "ckpt")
+    cache = storage.CheckpointCache(tmp_path.joinpath("cache"))
+
+    cache.download(manager, "ckpt", tmp_path.joinpath("a"))
+    # A same-size write which restores the modification time still invalidates the cached file.
+    path = tmp_path.joinpath("a", "root.txt")
+    st = path.stat()
+    path.write_bytes(bytes(st.st_size))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    manager.downloaded.clear()
+    cache.download(manager, "ckpt", tmp_path.joinpath("b"))
+    assert manager.downloaded == ["root.txt"]
+    util.validate_checkpoint(tmp_path.joinpath("b"), util.EXPECTED_FILES)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: pathlib.Path) -> None:
+    manager = make_manager(tmp_path, "ckpt1", "ckpt2")
+    ckpt_size = sum(len(c) for c in util.EXPECTED_FILES.values() if c is not None)
+    cache = storage.CheckpointCache(tmp_path.joinpath("cache"), max_bytes=ckpt_size)
+
+    cache.download(manager, "ckpt1", tmp_path.joinpath("a"))
+    cache.download(manager, "ckpt2", tmp_path.joinpath("b"))
+    # Files which were served before being evicted stay valid in their destination.
+    util.validate_checkpoint(tmp_path.joinpath("a"), util.EXPECTED_FILES)
+
+    manager.downloaded.clear()
+    cache.download(manager, "ckpt2", tmp_path.joinpath("c"))
+    assert manager.downloaded == []
+
+    cache.download(manager, "ckpt1", tmp_path.joinpath("d"))
+    assert sorted(manager.downloaded) == expected_files()
+    util.validate_checkpoint(tmp_path.joinpath("d"), util.EXPECTED_FILES)
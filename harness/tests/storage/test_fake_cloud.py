@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import Any
+
+from determined.common import storage
+from tests.storage import fake_cloud, util
+
+
+def test_s3_lifecycle(tmp_path: Path) -> None:
+    with fake_cloud.FakeS3() as s3:
+        manager = storage.S3StorageManager(
+            bucket="bucket",
+            access_key="access",
+            secret_key="secret",
+            endpoint_url=s3.url,
+            prefix=None,
+            temp_dir=str(tmp_path),
+        )
+        util.run_storage_lifecycle_test(manager)
+
+        # A checkpoint is deleted with one listing and one batched delete.
+        with manager.store_path("storage-id") as path:
+            util.create_checkpoint(path)
+        s3.reset_counts()
+        manager.delete("storage-id", ["**/*"])
+        assert s3.reset_counts() == {"ListObjects": 1, "DeleteObjects": 1}
+
+        # Several checkpoints are deleted with one listing each, and batched deletes across them.
+        storage_ids = [f"storage-id-{i}" for i in range(5)]
+        for storage_id in storage_ids:
+            with manager.store_path(storage_id) as path:
+                util.create_checkpoint(path)
+        s3.reset_counts()
+        results = manager.delete_many(storage_ids, ["**/*.txt"], max_workers=3)
+        assert results == {
+            storage_id: {"empty_dir/": 0, "subdir/": 0} for storage_id in storage_ids
+        }
+        assert s3.reset_counts() == {"ListObjects": 5, "DeleteObjects": 1}
+        assert {key for _, key in s3.objects if key.startswith("storage-id-")} == {
+            f"{storage_id}/{d}" for storage_id in storage_ids for d in ["empty_dir/", "subdir/"]
+        }
+
+
+def test_gcs_lifecycle(tmp_path: Path, monkeypatch: Any) -> None:
+    with fake_cloud.FakeGCS() as gcs:
+        monkeypatch.setenv("STORAGE_EMULATOR_HOST", gcs.url)
+        manager = storage.GCSStorageManager(bucket="bucket", prefix=None, temp_dir=str(tmp_path))
+        util.run_storage_lifecycle_test(manager)
+
+
+def test_azure_lifecycle(tmp_path: Path) -> None:
+    with fake_cloud.FakeAzure() as azure:
+        manager = storage.AzureStorageManager(
+            container="container", account_url=azure.account_url, temp_dir=str(tmp_path)
+        )
+        util.run_storage_lifecycle_test(manager)
+        assert azure.requests["CreateContainer"] == 1
@@ -1,6 +1,13 @@
+import random
 import tempfile
+import uuid
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
+import pytest
+
+from determined import searcher
+from determined.common.api import bindings
 from tests.custom_search_mocks import MockMasterSearchRunner, SimulateMaster
 from tests.search_methods import ASHASearchMethod, RandomSearchMethod
 
@@ -39,3 +46,208 @@ def test_run_asha_batches_exp_mock_master(tmp_path: Path) -> None:
     assert len(search_runner.state.trials_closed) == len(
         search_method.asha_search_state.closed_trials
     )
+
+
+def test_local_search_runner_prunes_snapshots(tmp_path: Path) -> None:
+    search_method = RandomSearchMethod(max_trials=5, max_concurrent_trials=2, max_length=500)
+    search_runner = MockMasterSearchRunner(
+        search_method,
+        SimulateMaster(metric=1.0),
+        tmp_path,
+        snapshot_every_events=4,
+        max_snapshots=2,
+    )
+    exp_id = search_runner.run(exp_config={}, context_dir="", includes=None)
+
+    assert search_method.closed_trials == 5
+    state_dir = search_runner._get_state_path(exp_id)
+    snapshots = sorted(p.name for p in state_dir.iterdir() if p.is_dir())
+    assert len(snapshots) == 2
+    assert all(name.startswith("event_") for name in snapshots)
+    with state_dir.joinpath("event_id").open() as f:
+        assert f"event_{f.read()}" in snapshots
+
+
+def run_until_crash(
+    search_runner: MockMasterSearchRunner, mock_master_obj: SimulateMaster, event_id: int
+) -> List[searcher.Operation]:
+    """
+    Crash after handling, but before posting the operations for, the first batch of events which
+    reaches the given event. Returns the operations which were not posted.
+    """
+    handle_post_operations = mock_master_obj.handle_post_operations
+    unposted = []
+
+    def crash(event: bindings.v1SearcherEvent, operations: List[searcher.Operation]) -> None:
+        if event.id >= event_id:
+            unposted.extend(operations)
+            raise RuntimeError("crashed")
+        handle_post_operations(event, operations)
+
+    mock_master_obj.handle_post_operations = crash  # type: ignore
+    with pytest.raises(RuntimeError, match="crashed"):
+        search_runner.run(exp_config={}, context_dir="", includes=None)
+    assert search_runner.state.last_event_id >= event_id
+    return unposted
+
+
+def test_local_search_runner_replays_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Replaying events requires the search method to create the same trials again.
+    methods: List[RandomSearchMethod] = []
+    monkeypatch.setattr(uuid, "uuid4", lambda: uuid.UUID(int=methods[-1].created_trials + 1))
+    monkeypatch.setattr(random, "randint", lambda a, b: a)
+
+    search_method = RandomSearchMethod(max_trials=5, max_concurrent_trials=2, max_length=500)
+    methods.append(search_method)
+    mock_master_obj = SimulateMaster(metric=1.0)
+    search_runner = MockMasterSearchRunner(
+        search_method, mock_master_obj, tmp_path, snapshot_every_events=5
+    )
+    unposted = run_until_crash(search_runner, mock_master_obj, event_id=8)
+    exp_id = search_runner.state.experiment_id
+    last_event_id = search_runner.state.last_event_id
+    assert exp_id is not None
+
+    # Simulate a crash in the middle of writing a journal entry.
+    state_dir = search_runner._get_state_path(exp_id)
+    assert state_dir.joinpath("journal.jsonl").exists()
+    with state_dir.joinpath("journal.jsonl").open("a") as f:
+        f.write('{"event": {"id": 9, "trialCr')
+
+    resumed_method = RandomSearchMethod(max_trials=5, max_concurrent_trials=2, max_length=500)
+    methods.append(resumed_method)
+    resumed_runner = MockMasterSearchRunner(resumed_method, SimulateMaster(metric=1.0), tmp_path)
+    _, operations = resumed_runner.load_state(exp_id)
+
+    assert resumed_runner.state.last_event_id == last_event_id
+    assert [op._to_searcher_operation().to_json() for op in operations] == [
+        op._to_searcher_operation().to_json() for op in unposted
+    ]
+    assert resumed_runner.state.trials_created == search_runner.state.trials_created
+    assert resumed_runner.state.trials_closed == search_runner.state.trials_closed
+    assert resumed_runner.state.trial_progress == search_runner.state.trial_progress
+    assert resumed_method.created_trials == search_method.created_trials
+    assert resumed_method.closed_trials == search_method.closed_trials
+    # The replayed events were compacted into a new snapshot.
+    assert not state_dir.joinpath("journal.jsonl").exists()
+    assert state_dir.joinpath(f"event_{last_event_id}").is_dir()
+
+
+def test_local_search_runner_rejects_nondeterministic_replay(tmp_path: Path) -> None:
+    search_method = RandomSearchMethod(max_trials=5, max_concurrent_trials=2, max_length=500)
+    mock_master_obj = SimulateMaster(metric=1.0)
+    search_runner = MockMasterSearchRunner(
+        search_method, mock_master_obj, tmp_path, snapshot_every_events=100
+    )
+    run_until_crash(search_runner, mock_master_obj, event_id=8)
+    exp_id = search_runner.state.experiment_id
+    assert exp_id is not None
+
+    # initial_operations creates trials with random request IDs.
+    resumed_method = RandomSearchMethod(max_trials=5, max_concurrent_trials=2, max_length=500)
+    resumed_runner = MockMasterSearchRunner(resumed_method, SimulateMaster(metric=1.0), tmp_path)
+    with pytest.raises(RuntimeError, match="must be deterministic"):
+        resumed_runner.load_state(exp_id)
+
+
+class FakeSession:
+    """Serves canned batches of searcher events and records the operations posted in reply."""
+
+    def __init__(self, batches: List[List[bindings.v1SearcherEvent]]) -> None:
+        self.batches = batches
+        self.posts: List[bindings.v1PostSearcherOperationsRequest] = []
+
+    def _do_request(self, method: str, path: str, json: Any, **kwargs: Any) -> Any:
+        if method == "GET":
+            body = bindings.v1GetSearcherEventsResponse(searcherEvents=self.batches.pop(0))
+            return FakeResponse(body.to_json())
+        assert path.endswith("/searcher_operations")
+        self.posts.append(bindings.v1PostSearcherOperationsRequest.from_json(json))
+        return FakeResponse({})
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body: Dict[str, Any]) -> None:
+        self.body = body
+
+    def json(self) -> Dict[str, Any]:
+        return self.body
+
+
+class RecordingSearchRunner(searcher.SearchRunner):
+    def __init__(self, search_method: searcher.SearchMethod) -> None:
+        super().__init__(search_method)
+        self.state.experiment_id = 1
+        self.handled: List[Tuple[int, List[searcher.Operation]]] = []
+
+    def _get_operations(self, event: bindings.v1SearcherEvent) -> List[searcher.Operation]:
+        operations = super()._get_operations(event)
+        self.handled.append((event.id, operations))
+        return operations
+
+
+def test_search_runner_posts_batched_operations() -> None:
+    request_ids = [str(uuid.uuid4()) for _ in range(3)]
+    burst = [bindings.v1SearcherEvent(id=1, initialOperations=bindings.v1InitialOperations())]
+    burst += [
+        bindings.v1SearcherEvent(id=i + 2, trialClosed=bindings.v1TrialClosed(requestId=r))
+        for i, r in enumerate(request_ids)
+    ]
+    inactive = bindings.v1SearcherEvent(
+        id=5,
+        experimentInactive=bindings.v1ExperimentInactive(
+            experimentState=bindings.experimentv1State.COMPLETED
+        ),
+    )
+    session = FakeSession([burst, [inactive]])
+
+    search_runner = RecordingSearchRunner(RandomSearchMethod(10, 2, 500))
+    search_runner.run_experiment(1, session, None, sleep_time=0)  # type: ignore
+
+    # Every event of the burst is handled in order, and answered by a single request.
+    assert [event_id for event_id, _ in search_runner.handled] == [1, 2, 3, 4]
+    assert len(session.posts) == 1
+    post = session.posts[0]
+    assert post.triggeredByEvent is not None and post.triggeredByEvent.id == 4
+    assert [op.to_json() for op in post.searcherOperations or []] == [
+        op._to_searcher_operation().to_json()
+        for _, operations in search_runner.handled
+        for op in operations
+    ]
+    assert search_runner.state.last_event_id == 4
+    assert search_runner.state.experiment_completed
+
+
+def test_search_runner_resubmits_prior_operations_once() -> None:
+    events = [
+        bindings.v1SearcherEvent(
+            id=i,
+            trialProgress=bindings.v1TrialProgress(partialUnits=1.0, requestId=str(uuid.uuid4())),
+        )
+        for i in (1, 2)
+    ]
+    inactive = bindings.v1SearcherEvent(
+        id=3,
+        experimentInactive=bindings.v1ExperimentInactive(
+            experimentState=bindings.experimentv1State.COMPLETED
+        ),
+    )
+    session = FakeSession([events, [inactive]])
+
+    search_runner = RecordingSearchRunner(RandomSearchMethod(10, 2, 500))
+    # Both events were handled before a restart, but their operations were never posted.
+    search_runner.state.last_event_id = 2
+    prior_operations: List[searcher.Operation] = [searcher.Progress(0.5)]
+    search_runner.run_experiment(1, session, prior_operations, sleep_time=0)  # type: ignore
+
+    assert search_runner.handled == []
+    assert len(session.posts) == 1
+    post = session.posts[0]
+    assert post.triggeredByEvent is not None and post.triggeredByEvent.id == 2
+    assert [op.to_json() for op in post.searcherOperations or []] == [
+        searcher.Progress(0.5)._to_searcher_operation().to_json()
+    ]
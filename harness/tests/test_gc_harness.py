@@ -1,10 +1,12 @@
 import os
 import pathlib
+import unittest.mock
 import uuid
-from typing import Any, List
+from typing import Any, Dict, List
 
 import pytest
 
+from determined import errors
 from determined.common import storage
 from determined.exec.gc_checkpoints import delete_checkpoints
 from tests.storage import util as storage_util
@@ -28,9 +30,50 @@ def to_delete(request: Any, manager: storage.StorageManager) -> List[str]:
     return storage_ids
 
 
-def test_delete_checkpoints(manager: storage.StorageManager, to_delete: List[str]) -> None:
-    delete_checkpoints(manager, to_delete, ["**/*.dontmatchanything", "**/*"], dry_run=False)
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_delete_checkpoints(
+    manager: storage.StorageManager, to_delete: List[str], max_workers: int
+) -> None:
+    deleted, failed = delete_checkpoints(
+        manager,
+        to_delete,
+        ["**/*.dontmatchanything", "**/*"],
+        dry_run=False,
+        max_workers=max_workers,
+    )
     assert len(os.listdir(manager._base_path)) == 0
+    assert deleted == {storage_id: {} for storage_id in to_delete}
+    assert failed == {}
+
+
+def test_delete_checkpoints_reports_each_failure(manager: storage.StorageManager) -> None:
+    to_delete = []
+    for _ in range(4):
+        storage_id = str(uuid.uuid4())
+        with manager.store_path(storage_id) as path:
+            storage_util.create_checkpoint(path)
+        to_delete.append(storage_id)
+    missing = str(uuid.uuid4())
+    broken = to_delete[1]
+
+    delete = manager.delete
+
+    def flaky_delete(storage_id: str, globs: List[str]) -> Dict[str, int]:
+        if storage_id == broken:
+            raise OSError("permission denied")
+        if storage_id == missing:
+            raise errors.CheckpointNotFound(storage_id)
+        return delete(storage_id, globs)
+
+    with unittest.mock.patch.object(manager, "delete", flaky_delete):
+        deleted, failed = delete_checkpoints(
+            manager, to_delete + [missing], ["**/*"], dry_run=False, max_workers=2
+        )
+
+    # A missing checkpoint is not a failure, and one failure does not stop the other deletes.
+    assert sorted(deleted) == sorted(set(to_delete) - {broken})
+    assert list(failed) == [broken] and isinstance(failed[broken], OSError)
+    assert os.listdir(manager._base_path) == [broken]
 
 
 def test_dry_run(manager: storage.StorageManager, to_delete: List[str]) -> None:
@@ -1,4 +1,5 @@
 import contextlib
+import json
 import os
 import pathlib
 import shutil
@@ -65,6 +66,63 @@ def test_import_side_effects() -> None:
     subprocess.run([sys.executable, "-c", textwrap.dedent(script)], check=True)
 
 
+@pytest.mark.parametrize(
+    "module,max_modules,max_seconds",
+    [
+        # Nothing past the version should be imported until it's used.
+        ("determined", 10, 1.0),
+        # The SDK needs the REST bindings, but not the Core API or any training loop.
+        ("determined.experimental", 400, 3.0),
+    ],
+)
+def test_import_budget(module: str, max_modules: int, max_seconds: float) -> None:
+    # The budgets are loose, to allow for slow CI machines; they exist to catch a new eager import
+    # of something heavy, which costs far more.
+    script = f"""
+        import json
+        import sys
+        import time
+
+        before = set(sys.modules)
+        start = time.perf_counter()
+        import {module}
+        elapsed = time.perf_counter() - start
+        print(json.dumps({{"elapsed": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+    """
+    p = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)], check=True, stdout=subprocess.PIPE
+    )
+    result = json.loads(p.stdout)
+    modules = result["modules"]
+
+    heavy = {
+        "determined.core",
+        "determined.keras",
+        "determined.profiler",
+        "determined.pytorch",
+        "numpy",
+        "tensorflow",
+        "torch",
+    }
+    found = [m for m in modules if any(m == h or m.startswith(h + ".") for h in heavy)]
+    assert not found, found
+    assert len(modules) <= max_modules, f"{module} imported {len(modules)} modules"
+    assert result["elapsed"] <= max_seconds, f"{module} took {result['elapsed']:.2f}s to import"
+
+
+def test_lazy_attributes() -> None:
+    for name in det._lazy_attrs:
+        assert getattr(det, name) is not None, name
+    assert det.TrialContext is det._trial_context.TrialContext
+    assert det.pytorch.PyTorchTrial is not None
+    from determined import pytorch
+
+    assert det.pytorch is pytorch
+    assert {"core", "pytorch", "TrialContext"} <= set(dir(det))
+    with pytest.raises(AttributeError, match="no_such_thing"):
+        _ = det.no_such_thing  # type: ignore
+
+
 def test_import_from_path() -> None:
     @contextlib.contextmanager
     def prepend_sys_path(path: str) -> Iterator:
@@ -1,8 +1,11 @@
 import abc
 import itertools
 import multiprocessing
+import os
+import signal
 import sys
 import textwrap
+import threading
 import time
 import traceback
 from typing import Any, List, Optional, cast
@@ -204,6 +207,49 @@ class TestPIDServer:
             if crash:
                 raise ValueError("Crashing...")
 
+    @staticmethod
+    def _hanging_worker_proc(addr: int, share_connection: bool) -> None:
+        with ipc.PIDClient(addr):
+            if share_connection and os.fork() == 0:
+                # The child inherits the connection, keeping it open after the worker dies.
+                time.sleep(5)
+                os._exit(0)
+            time.sleep(30)
+
+    @pytest.mark.parametrize("share_connection", [False, True])
+    def test_worker_death_detection_latency(self, share_connection: bool) -> None:
+        if share_connection and not hasattr(os, "pidfd_open"):
+            pytest.skip("a worker whose connection outlives it is only noticed by polling")
+
+        with ipc.PIDServer(addr=0, num_clients=1) as pid_server:
+            assert pid_server.listener
+            _, port = pid_server.listener.getsockname()
+
+            p = multiprocessing.Process(
+                target=TestPIDServer._hanging_worker_proc, args=(port, share_connection)
+            )
+            p.start()
+
+            killed_at = []
+
+            def kill_worker() -> None:
+                killed_at.append(time.time())
+                assert p.pid
+                os.kill(p.pid, signal.SIGKILL)
+
+            killer = threading.Timer(1, kill_worker)
+            killer.start()
+            try:
+                with pytest.raises(det.errors.WorkerError):
+                    pid_server.run(poll_period=None)
+                latency = time.time() - killed_at[0]
+            finally:
+                killer.cancel()
+                p.join()
+
+            # Much less than the period at which pids used to be polled.
+            assert latency < 0.5, f"worker death detected after {latency:.3f}s"
+
     def test_normal_execution(self) -> None:
         with ipc.PIDServer(addr=0, num_clients=2) as pid_server:
             assert pid_server.listener
@@ -0,0 +1,110 @@
+import base64
+import io
+import os
+import pathlib
+import tarfile
+from typing import Any, List
+from unittest import mock
+
+import pytest
+
+from determined.common.api import bindings
+from determined.exec import prep_container
+from tests.storage import util as storage_util
+
+CONTEXT_FILES = {**storage_util.EXPECTED_FILES, "link.txt": "root file", "linkdir/": None}
+
+
+def make_context(tmp_path: pathlib.Path) -> str:
+    src = tmp_path.joinpath("src")
+    storage_util.create_checkpoint(src)
+    src.joinpath("link.txt").symlink_to("root.txt")
+    src.joinpath("linkdir").symlink_to("subdir")
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        tf.add(str(src), arcname=".")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def validate_context(path: pathlib.Path) -> None:
+    storage_util.validate_checkpoint(path, CONTEXT_FILES)
+    # Symlinks are recreated as symlinks, including those to directories.
+    assert os.readlink(path.joinpath("link.txt")) == "root.txt"
+    assert os.readlink(path.joinpath("linkdir")) == "subdir"
+
+
+def test_extract_context(tmp_path: pathlib.Path, monkeypatch: Any) -> None:
+    # Decode the context in several chunks.
+    monkeypatch.setattr(prep_container, "_B64_CHUNK_SIZE", 64)
+    prep_container._extract_context(make_context(tmp_path), tmp_path.joinpath("dst"))
+    validate_context(tmp_path.joinpath("dst"))
+
+
+def test_extract_context_rejects_parent_paths(tmp_path: pathlib.Path) -> None:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        tf.addfile(tarfile.TarInfo("../escape.txt"), io.BytesIO(b""))
+    b64_tgz = base64.b64encode(buf.getvalue()).decode("ascii")
+    with pytest.raises(ValueError, match="parent directory"):
+        prep_container._extract_context(b64_tgz, tmp_path.joinpath("dst"))
+    assert not tmp_path.joinpath("escape.txt").exists()
+
+
+def test_cached_context(tmp_path: pathlib.Path, monkeypatch: Any) -> None:
+    b64_tgz = make_context(tmp_path)
+    cache_dir = tmp_path.joinpath("cache")
+    extracted: List[pathlib.Path] = []
+    extract_context = prep_container._extract_context
+
+    def recording_extract_context(b64_tgz: str, path: pathlib.Path) -> None:
+        extracted.append(path)
+        extract_context(b64_tgz, path)
+
+    monkeypatch.setattr(prep_container, "_extract_context", recording_extract_context)
+
+    a, b = tmp_path.joinpath("a"), tmp_path.joinpath("b")
+    prep_container._cached_context(b64_tgz, cache_dir, [a, b])
+    assert len(extracted) == 1
+    for dst in (a, b):
+        validate_context(dst)
+    assert not os.path.samefile(a.joinpath("root.txt"), b.joinpath("root.txt"))
+
+    # Writes to one task's files don't affect other tasks, or the cache.
+    with a.joinpath("root.txt").open("a") as f:
+        f.write("modified")
+    validate_context(b)
+
+    # Another task on the same node copies the cached tree without extracting it again.
+    c = tmp_path.joinpath("c")
+    prep_container._cached_context(b64_tgz, cache_dir, [c])
+    assert len(extracted) == 1
+    validate_context(c)
+
+    # A cached tree which was changed is extracted again.
+    cached = next(p for p in cache_dir.iterdir() if p.is_dir())
+    cached.joinpath("root.txt").unlink()
+    d = tmp_path.joinpath("d")
+    prep_container._cached_context(b64_tgz, cache_dir, [d])
+    assert len(extracted) == 2
+    validate_context(d)
+
+
+def test_download_context_directory(tmp_path: pathlib.Path, monkeypatch: Any) -> None:
+    model_copy = tmp_path.joinpath("model")
+    workdir = tmp_path.joinpath("workdir")
+    workdir.mkdir()
+    monkeypatch.setattr(prep_container.constants, "MANAGED_TRAINING_MODEL_COPY", str(model_copy))
+    monkeypatch.delenv(prep_container.CONTEXT_CACHE_DIR_ENV, raising=False)
+    monkeypatch.chdir(workdir)
+    resp = bindings.v1GetTaskContextDirectoryResponse(b64Tgz=make_context(tmp_path))
+    info = mock.MagicMock(task_type="COMMAND")
+
+    with mock.patch.object(bindings, "get_GetTaskContextDirectory", return_value=resp):
+        prep_container.download_context_directory(mock.MagicMock(), info)
+
+    validate_context(model_copy)
+    validate_context(workdir)
+    # Writing to a file in the working directory leaves the model copy untouched.
+    with workdir.joinpath("root.txt").open("w") as f:
+        f.write("overwritten")
+    validate_context(model_copy)
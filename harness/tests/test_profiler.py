@@ -0,0 +1,42 @@
+import datetime
+
+from determined import profiler
+
+
+def test_metric_batch_consume() -> None:
+    batch = profiler.MetricBatch("1", "agent")
+    start = datetime.datetime(2023, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+
+    # Append more samples than the initial capacity so the columns have to grow.
+    n = profiler._MetricSeries.INITIAL_CAPACITY + 10
+    for i in range(n):
+        timestamp = start + datetime.timedelta(seconds=i)
+        batch.append(
+            profiler.MetricType.SYSTEM,
+            profiler.SysMetricName.GPU_UTIL_METRIC,
+            profiler.Measurement(timestamp, i, i / 2),
+            "gpu-0",
+        )
+    batch.add(profiler.MetricType.TIMING, "train_batch", start.timestamp(), 7, 0.25)
+    assert not batch.isempty()
+
+    gpu, timing = batch.consume()
+    assert gpu.values == [i / 2 for i in range(n)]
+    assert gpu.batches == list(range(n))
+    assert gpu.timestamps[:2] == ["2023-01-02T03:04:05.678901Z", "2023-01-02T03:04:06.678901Z"]
+    assert gpu.labels == {
+        "trialId": "1",
+        "name": profiler.SysMetricName.GPU_UTIL_METRIC,
+        "agentId": "agent",
+        "gpuUuid": "gpu-0",
+        "metricType": profiler.MetricType.SYSTEM.value,
+    }
+    assert timing.values == [0.25]
+    assert timing.labels["name"] == "train_batch"
+
+    # Consuming resets the batch, but keeps its columns for the next flush.
+    assert batch.isempty()
+    assert batch.consume() == []
+    batch.add(profiler.MetricType.TIMING, "train_batch", start.timestamp(), 8, 0.5)
+    (timing,) = batch.consume()
+    assert timing.batches == [8]
@@ -0,0 +1,37 @@
+import json
+import pathlib
+
+import pytest
+
+from determined import _trace
+
+
+def test_trace_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_trace, "_tracer", None)
+    with _trace.span("nothing"):
+        pass
+    _trace.complete("nothing", _trace.now())
+
+
+def test_trace_writes_chrome_trace(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(_trace.TRACE_DIR_ENV, str(tmp_path))
+    monkeypatch.setenv(_trace.TRACE_BUFFER_SIZE_ENV, "3")
+    tracer = _trace.Tracer.from_env()
+    assert tracer is not None
+    monkeypatch.setattr(_trace, "_tracer", tracer)
+
+    for i in range(5):
+        with _trace.span(f"step{i}", "train"):
+            pass
+    start = _trace.now()
+    _trace.complete("upload", start, "checkpoint")
+    tracer.write()
+
+    with tracer.path.open() as f:
+        trace = json.load(f)
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    # The ring buffer only keeps the most recent spans.
+    assert [e["name"] for e in spans] == ["step3", "step4", "upload"]
+    assert spans[-1]["cat"] == "checkpoint"
+    assert all(e["dur"] >= 0 and e["ts"] > 0 for e in spans)
+    assert [e["name"] for e in trace["traceEvents"] if e["ph"] == "M"] == ["process_name"]
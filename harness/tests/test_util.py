@@ -1,6 +1,10 @@
+import datetime
+import enum
+import json
 import os
 import pathlib
-from typing import Optional
+import uuid
+from typing import Any, Optional
 
 import numpy as np
 import pytest
@@ -24,6 +28,13 @@ def test_sizeof_fmt() -> None:
     assert det.common.util.sizeof_fmt(36) == "36.0B"
 
 
+def test_backoff_intervals() -> None:
+    delays = det.common.util.backoff_intervals(1.0, 5.0)
+    bounds = [1.0, 2.0, 4.0, 5.0, 5.0]
+    for bound in bounds:
+        assert bound / 2 <= next(delays) <= bound
+
+
 def test_calculate_batch_sizes() -> None:
     # Valid cases.
     psbs, gbs = det.util.calculate_batch_sizes({"global_batch_size": 1}, 1, "Trial")
@@ -101,3 +112,35 @@ def test_is_numerical_scalar() -> None:
     assert util.is_numerical_scalar(np.array(1))
     assert util.is_numerical_scalar(np.array(-3.14))
     assert util.is_numerical_scalar(np.array([1.0])[0])
+
+
+class Color(enum.Enum):
+    RED = 1
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"loss": 0.5, "accuracy": np.float32(0.25), "count": np.int64(3), "ok": True},
+        {"loss": np.float64("nan"), "grad_norm": float("inf"), "lr": -float("inf")},
+        {"hist": np.arange(6, dtype=np.float32).reshape(2, 3), "ids": np.arange(3)},
+        {"hist": np.array([1.0, np.nan, np.inf, -np.inf]), "flags": np.array([True, False])},
+        [(1, 2.5), b"bytes", None, "str", np.array(["a", "b"])],
+        {"when": datetime.datetime(2023, 1, 2), "color": Color.RED, "id": uuid.UUID(int=1)},
+        {"batch_metrics": [{"loss": np.float32(i) / 3, "n": i} for i in range(100)]},
+        {"nested": {"metrics": [np.array([[np.nan]]), {"x": np.float16(0.1)}]}},
+        [{"a": np.int64(1), "b": 1.5}, {"a": 2, "b": np.float32(2)}, {"b": 3, "a": 4}],
+        [np.longdouble(0.1), np.longdouble(0.2), np.uint8(3), np.uint8(4)],
+        {"hist": np.array([0.1, 0.2], dtype=np.longdouble)},
+        [{"x": np.longdouble(0.1)}, {"x": np.longdouble(0.2)}],
+    ],
+)
+def test_json_encode(obj: Any) -> None:
+    for kwargs in ({}, {"indent": "  ", "sort_keys": True}):
+        expected = json.dumps(util._jsonable(obj), **kwargs)  # type: ignore
+        assert util.json_encode(obj, **kwargs) == expected  # type: ignore
+
+
+def test_json_encode_unserializable() -> None:
+    with pytest.raises(TypeError, match="Unserializable object"):
+        util.json_encode({"metrics": [object()]})
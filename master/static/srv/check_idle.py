@@ -16,9 +16,13 @@ class IdleType(enum.Enum):
     ACTIVITY = 3
 
 
+# Jupyter is checked MIN_POLL_INTERVAL seconds after the notebook changes between idle and active,
+# and then less and less often while it stays that way, down to every REPORT_IDLE_INTERVAL seconds.
+MIN_POLL_INTERVAL = 5
 REPORT_IDLE_INTERVAL = 30
-
-last_activity = None
+# The master only acts on reports that the notebook is active, so an idle notebook is reported
+# again only this often.
+IDLE_REPORT_INTERVAL = 300
 
 
 def wait_for_jupyter(addr):
@@ -43,29 +47,83 @@ def wait_for_jupyter(addr):
             i += 1
 
 
-def is_idle(request_address, mode):
-    try:
-        kernels = requests.get(request_address + "/api/kernels", verify=False).json()
-        terminals = requests.get(request_address + "/api/terminals", verify=False).json()
-        sessions = requests.get(request_address + "/api/sessions", verify=False).json()
-    except Exception:
-        logging.warning("Cannot get notebook kernel status", exc_info=True)
-        return False
+class IdleDetector:
+    """
+    IdleDetector checks whether a Jupyter server is idle over one pooled connection, stopping at
+    the first request which shows that it is not.
+    """
+
+    def __init__(self, request_address, mode):
+        self.request_address = request_address
+        self.mode = mode
+        self.session = requests.Session()
+        self.session.verify = False
+        self.last_activity = None
+
+    def get(self, path):
+        return self.session.get(self.request_address + path, timeout=10).json()
 
-    if mode == IdleType.KERNELS_OR_TERMINALS:
-        return len(kernels) == 0 and len(terminals) == 0 and len(sessions) == 0
-    elif mode == IdleType.KERNEL_CONNECTIONS:
-        # Unfortunately, the terminals API doesn't return a connection count.
-        return all(k["connections"] == 0 for k in kernels)
-    elif mode == IdleType.ACTIVITY:
-        global last_activity
+    def is_idle(self):
+        try:
+            return self._is_idle()
+        except Exception:
+            logging.warning("Cannot get notebook kernel status", exc_info=True)
+            return False
+
+    def _is_idle(self):
+        kernels = self.get("/api/kernels")
 
-        old_last_activity = last_activity
-        if kernels or terminals:
-            last_activity = max(x["last_activity"] for x in kernels + terminals)
-        no_busy_kernels = all(k["execution_state"] != "busy" for k in kernels)
+        if self.mode == IdleType.KERNELS_OR_TERMINALS:
+            return not kernels and not self.get("/api/terminals") and not self.get("/api/sessions")
+        elif self.mode == IdleType.KERNEL_CONNECTIONS:
+            # Unfortunately, the terminals API doesn't return a connection count.
+            return all(k["connections"] == 0 for k in kernels)
+        elif self.mode == IdleType.ACTIVITY:
+            if any(k["execution_state"] == "busy" for k in kernels):
+                return False
 
-        return no_busy_kernels and (last_activity == old_last_activity)
+            old_last_activity = self.last_activity
+            terminals = self.get("/api/terminals")
+            if kernels or terminals:
+                self.last_activity = max(x["last_activity"] for x in kernels + terminals)
+
+            return self.last_activity == old_last_activity
+
+
+class IdleMonitor:
+    """
+    IdleMonitor checks a notebook with an IdleDetector and reports to the master whether it is
+    idle: immediately whenever that changes, at every check while the notebook is active, and
+    every IDLE_REPORT_INTERVAL seconds while it is idle.
+    """
+
+    def __init__(self, detector, report):
+        self.detector = detector
+        self.report = report
+        self.interval = MIN_POLL_INTERVAL
+        self.idle = None
+        self.reported_idle = None
+        self.reported_at = None
+
+    def check(self):
+        """Check the notebook once, and return how many seconds to wait before the next check."""
+        idle = self.detector.is_idle()
+        now = time.monotonic()
+
+        if idle != self.reported_idle or not idle or now - self.reported_at >= IDLE_REPORT_INTERVAL:
+            try:
+                self.report(idle)
+                self.reported_idle = idle
+                self.reported_at = now
+            except Exception:
+                logging.warning("ignoring error communicating with master", exc_info=True)
+
+        if idle != self.idle:
+            self.interval = MIN_POLL_INTERVAL
+        else:
+            self.interval = min(self.interval * 2, REPORT_IDLE_INTERVAL)
+        self.idle = idle
+        return self.interval
 
 
 def main():
@@ -85,18 +143,17 @@ def main():
 
     wait_for_jupyter(("127.0.0.1", int(port)))
 
+    def report(idle):
+        api.put(
+            master_url,
+            f"/api/v1/notebooks/{notebook_id}/report_idle",
+            {"notebook_id": notebook_id, "idle": idle},
+            cert=cert,
+        )
+
+    monitor = IdleMonitor(IdleDetector(notebook_server, idle_type), report)
     while True:
-        try:
-            idle = is_idle(notebook_server, idle_type)
-            api.put(
-                master_url,
-                f"/api/v1/notebooks/{notebook_id}/report_idle",
-                {"notebook_id": notebook_id, "idle": idle},
-                cert=cert,
-            )
-        except Exception:
-            logging.warning("ignoring error communicating with master", exc_info=True)
-        time.sleep(REPORT_IDLE_INTERVAL)
+        time.sleep(monitor.check())
 
 
 if __name__ == "__main__":
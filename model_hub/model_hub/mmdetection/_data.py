@@ -5,7 +5,7 @@ import functools
 import logging
 import math
 import os
-from typing import Any, Iterator, List, Tuple
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type, cast
 
 import filelock
 import mmcv
@@ -16,6 +16,7 @@ import torch
 import torch.utils.data as torch_data
 
 import determined.pytorch as det_torch
+from model_hub.mmdetection import _data_backends as data_backends
 
 
 class GroupSampler(torch.utils.data.Sampler):
@@ -30,6 +31,7 @@ class GroupSampler(torch.utils.data.Sampler):
         dataset: torch_data.Dataset,
         samples_per_gpu: int,
         num_replicas: int,
+        skip: int = 0,
     ):
         """
         This sampler will generate indices such that each batch will belong to the same group.
@@ -41,14 +43,21 @@ class GroupSampler(torch.utils.data.Sampler):
             dataset: dataset that has a flag attribute to indicate group member for each sample.
             samples_per_gpu: number of samples per slot.
             num_replicas: number of processes participating in distributed training.
+            skip: number of indices to skip at the start of the first epoch, to resume mid-epoch.
+                Later epochs are not affected.
         """
         self.dataset = dataset
         self.samples_per_gpu = samples_per_gpu
         self.num_replicas = num_replicas
+        self.skip = skip
 
         assert hasattr(self.dataset, "flag")
         self.flag = self.dataset.flag  # type: ignore
         self.group_sizes = np.bincount(self.flag)
+        # The indices of each group's samples in ascending order, group after group, so that a
+        # group's indices are a slice of group_indices.
+        self.group_indices = np.argsort(self.flag, kind="stable")
+        self.group_offsets = np.concatenate([[0], np.cumsum(self.group_sizes)])
 
         self.num_samples = 0
         for size in self.group_sizes:
@@ -58,39 +67,49 @@ class GroupSampler(torch.utils.data.Sampler):
             )
         self.total_size = self.num_samples * self.num_replicas
 
-    def __iter__(self) -> Iterator[Any]:
-        shuffled_indices: List[int] = []
+    def shuffled_indices(self) -> np.ndarray:
+        """
+        Generate an epoch's indices. Each group is shuffled and padded by repeating it up to a
+        multiple of samples_per_gpu * num_replicas, then the batches of all groups are shuffled.
+        """
+        shuffled_groups = []
         for i, size in enumerate(self.group_sizes):
             if size > 0:
-                group_indices = np.where(self.flag == i)[0]
-                assert len(group_indices) == size
-                shuffled_group_indices: List[int] = group_indices[
-                    list(torch.randperm(int(size)))
-                ].tolist()
-                extra = int(
-                    math.ceil(size * 1.0 / self.samples_per_gpu / self.num_replicas)
-                ) * self.samples_per_gpu * self.num_replicas - len(shuffled_group_indices)
-                # pad index
-                tmp = shuffled_group_indices.copy()
-                for _ in range(extra // size):
-                    shuffled_group_indices.extend(tmp)
-                shuffled_group_indices.extend(tmp[: extra % size])
-                shuffled_indices.extend(shuffled_group_indices)
-
+                group_indices = self.group_indices[
+                    self.group_offsets[i] : self.group_offsets[i + 1]
+                ]
+                padded_size = (
+                    int(math.ceil(size * 1.0 / self.samples_per_gpu / self.num_replicas))
+                    * self.samples_per_gpu
+                    * self.num_replicas
+                )
+                # np.resize pads by repeating the shuffled group.
+                shuffled_groups.append(
+                    np.resize(group_indices[torch.randperm(int(size)).numpy()], padded_size)
+                )
+        shuffled_indices = np.concatenate(shuffled_groups)
         assert len(shuffled_indices) == self.total_size
 
-        shuffled_indices = [
-            shuffled_indices[j]
-            for i in list(torch.randperm(len(shuffled_indices) // self.samples_per_gpu))
-            for j in range(i * self.samples_per_gpu, (i + 1) * self.samples_per_gpu)
-        ]
+        batches = shuffled_indices.reshape(-1, self.samples_per_gpu)
+        shuffled_batches: np.ndarray = batches[torch.randperm(len(batches)).numpy()]
+        return shuffled_batches.reshape(-1)
 
-        return iter(shuffled_indices)
+    def __iter__(self) -> Iterator[Any]:
+        shuffled_indices = self.shuffled_indices()
+        # Slicing skips ahead without generating the skipped indices as Python ints.
+        skip, self.skip = self.skip, 0
+        return _iter_in_chunks(shuffled_indices[skip:])
 
     def __len__(self) -> int:
         return self.total_size
 
 
+def _iter_in_chunks(indices: np.ndarray, chunk_size: int = 65536) -> Iterator[int]:
+    """Yield indices as Python ints, converting a chunk at a time rather than the whole epoch."""
+    for start in range(0, len(indices), chunk_size):
+        yield from indices[start : start + chunk_size].tolist()
+
+
 def maybe_download_ann_file(cfg: mmcv.Config) -> None:
     """
     mmdetection expects the annotation files to be available in the disk at a specific directory
@@ -153,6 +172,88 @@ class DatasetWithIndex(torch.utils.data.Dataset):
         return self.dataset.__len__()  # type: ignore
 
 
+class PrefetchDataLoader(det_torch.DataLoader):
+    """
+    A DataLoader which downloads the images of the batches its slot will load next, in the order
+    they will be loaded: the prefetching wraps the batch sampler after Determined has applied
+    repeating, sharding, and skipping to it.
+    """
+
+    def __init__(
+        self,
+        dataset: torch_data.Dataset,
+        *args: Any,
+        prefetcher: data_backends.Prefetcher,
+        keys: Callable[[int], str],
+        lookahead: int,
+        **kwargs: Any,
+    ):
+        super().__init__(dataset, *args, **kwargs)
+        self.prefetcher = prefetcher
+        self.keys = keys
+        self.lookahead = lookahead
+
+    def get_data_loader(
+        self, repeat: bool = False, skip: int = 0, num_replicas: int = 1, rank: int = 0
+    ) -> torch.utils.data.DataLoader:
+        loader = super().get_data_loader(
+            repeat=repeat, skip=skip, num_replicas=num_replicas, rank=rank
+        )
+        batch_sampler = data_backends.PrefetchBatchSampler(
+            cast(torch_data.BatchSampler, loader.batch_sampler),
+            self.prefetcher,
+            self.keys,
+            self.lookahead,
+        )
+        # The loader's batch sampler cannot be replaced, so build it again around the new one.
+        extra_kwargs = {
+            name: getattr(loader, name)
+            for name in [
+                "multiprocessing_context",
+                "generator",
+                "prefetch_factor",
+                "persistent_workers",
+            ]
+            if hasattr(loader, name)
+        }
+        return torch.utils.data.DataLoader(
+            loader.dataset,
+            batch_sampler=batch_sampler,
+            num_workers=loader.num_workers,
+            collate_fn=loader.collate_fn,
+            pin_memory=loader.pin_memory,
+            timeout=loader.timeout,
+            worker_init_fn=loader.worker_init_fn,
+            **extra_kwargs,
+        )
+
+
+def image_keys(dataset: torch_data.Dataset) -> Optional[Callable[[int], str]]:
+    """
+    Map dataset indices to the paths LoadImageFromFile loads them from, for datasets which keep
+    their images in data_infos, or return None for others, such as concatenated datasets.
+    """
+    data_infos = getattr(dataset, "data_infos", None)
+    if data_infos is None or not hasattr(dataset, "img_prefix"):
+        return None
+    img_prefix = dataset.img_prefix
+
+    def key(idx: int) -> str:
+        filename: str = data_infos[idx]["filename"]
+        return filename if img_prefix is None else os.path.join(img_prefix, filename)
+
+    return key
+
+
+def load_image_step(cfg: mmcv.Config) -> Optional[mmcv.ConfigDict]:
+    """The dataset's LoadImageFromFile step, if it has one."""
+    dataset = cfg.dataset if "dataset" in cfg else cfg
+    for step in dataset.get("pipeline", []):
+        if step.get("type") == "LoadImageFromFile":
+            return step
+    return None
+
+
 def build_dataloader(
     cfg: mmcv.Config,
     split: "str",
@@ -179,12 +280,42 @@ def build_dataloader(
     cfg = eval(f"cfg.{split}")
     maybe_download_ann_file(cfg)
 
+    # Object store backends give each slot on a node its own image cache. Every process which
+    # builds the backend, including data loader workers, does so from these arguments.
+    load_image = load_image_step(cfg)
+    file_client_args = load_image.get("file_client_args") if load_image is not None else None
+    if file_client_args is not None and file_client_args.get("backend") in ("s3", "gcs"):
+        file_client_args = {
+            **file_client_args,
+            "local_rank": context.distributed.get_local_rank(),
+            "local_size": context.distributed.get_local_size(),
+        }
+        load_image["file_client_args"] = file_client_args
+
     dataset = mmdet.datasets.build_dataset(cfg, {"test_mode": test_mode})
     if test_mode:
         dataset = DatasetWithIndex(dataset)
     sampler = GroupSampler(dataset, num_samples_per_gpu, num_replicas) if shuffle else None
 
-    return dataset, det_torch.DataLoader(
+    # Prefetch images if the backend is configured to.
+    loader_cls: Type[det_torch.DataLoader] = det_torch.DataLoader
+    prefetch_kwargs: Dict[str, Any] = {}
+    if file_client_args is not None:
+        backend = mmcv.FileClient(**file_client_args).client
+        keys = image_keys(dataset)
+        if isinstance(backend, data_backends.ObjectStoreBackend):
+            prefetcher = backend.prefetcher(num_samples_per_gpu)
+            if prefetcher is not None and keys is None:
+                logging.warning(f"Cannot prefetch images of {type(dataset).__name__}.")
+            elif prefetcher is not None:
+                loader_cls = PrefetchDataLoader
+                prefetch_kwargs = {
+                    "prefetcher": prefetcher,
+                    "keys": keys,
+                    "lookahead": backend.prefetch_batches,
+                }
+
+    return dataset, loader_cls(
         dataset,
         batch_size=num_samples_per_gpu,
         num_workers=num_workers,
@@ -197,4 +328,5 @@ def build_dataloader(
             rank=context.distributed.get_rank(),
             num_workers=num_workers,
         ),
+        **prefetch_kwargs,
     )
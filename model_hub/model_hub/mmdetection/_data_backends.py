@@ -2,42 +2,185 @@
 Add backends to support loading data from other sources including
 S3 buckets, GCS storage buckets, and fake data.
 """
+import abc
+import collections
+import concurrent.futures
 import contextlib
+import hashlib
 import logging
 import os
 import tempfile
+import threading
 import time
-from typing import Any, Dict, Iterator, List, Optional, Union, cast
+import uuid
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union, cast
 
 import boto3
+import botocore.config
 import mmcv
+import torch
 from google.cloud import storage
 
 import determined
 import model_hub.utils as utils
 
 
-class S3Backend(mmcv.fileio.BaseStorageBackend):  # type: ignore
+class DiskCache:
     """
-    To use a S3 bucket as the storage backend, set ``data.file_client_args`` field of
-    the experiment config as follows:
+    A directory of downloaded objects, each in a file named by a hash of its key, so that any
+    process can find an object without coordinating with the process which downloaded it.
 
-    .. code-block:: yaml
+    Only one process, the one which prefetches, may put files in the cache; it evicts the least
+    recently used files once they total more than max_bytes, or once there are more than
+    max_entries of them. Files already in the directory are adopted, oldest first, so that a
+    restarted trial reuses them.
+    """
 
-        data:
-          file_client_args:
-            backend: s3
-            bucket_name: <FILL IN>
+    def __init__(
+        self, directory: str, max_bytes: Optional[int] = None, max_entries: Optional[int] = None
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # File name -> size, least recently used first.
+        self._entries: "collections.OrderedDict[str, int]" = collections.OrderedDict()
+        self._size = 0
+        with os.scandir(directory) as it:
+            files = [(e.stat().st_mtime, e.name, e.stat().st_size) for e in it if e.is_file()]
+        for _, name, size in sorted(files):
+            if name.startswith("."):
+                # A partial download, or a reader's link, left by an earlier process.
+                os.remove(os.path.join(directory, name))
+            else:
+                self._entries[name] = size
+                self._size += size
+        self._evict()
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, self._name(key))
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def touch(self, key: str) -> bool:
+        """Mark key as most recently used, and return whether it is in the cache."""
+        name = self._name(key)
+        with self._lock:
+            if name not in self._entries:
+                return False
+            self._entries.move_to_end(name)
+            return True
+
+    def put(self, key: str, data: bytes) -> None:
+        name = self._name(key)
+        # Write under a temporary name, so that readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(self.directory, name))
+        with self._lock:
+            self._size += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            (self.max_bytes is not None and self._size > self.max_bytes)
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.directory, name))
+
+
+class ObjectStoreBackend(mmcv.fileio.BaseStorageBackend):  # type: ignore
     """
+    The parts of the S3 and GCS backends which do not depend on the object store.
 
-    def __init__(self, bucket_name: str):
-        self._storage_client = boto3.client("s3")
-        self._bucket = bucket_name
+    Each process creates its own client on first use, so data loader workers never share a client
+    (and its connection pool) created before they were forked, and every download a worker makes
+    reuses the same connections.
+
+    With prefetch_batches set, the data loader built for MMDetTrial downloads the images of each
+    slot's next prefetch_batches batches into cache_dir, with prefetch_threads concurrent
+    downloads, while workers load the current batches. Workers read cached images in place and
+    download any others themselves.
+
+    Only one process may put files in a DiskCache, so with local_size slots on a node, each slot
+    caches into its own subdirectory of cache_dir, with an equal share of cache_size_mb.
+    """
+
+    def __init__(
+        self,
+        prefetch_batches: int = 0,
+        prefetch_threads: int = 16,
+        cache_dir: Optional[str] = None,
+        cache_size_mb: Optional[int] = None,
+        local_rank: int = 0,
+        local_size: int = 1,
+    ) -> None:
+        self.prefetch_batches = prefetch_batches
+        self.prefetch_threads = prefetch_threads
+        self.cache_size_mb = cache_size_mb
+        self.local_size = local_size
+        if prefetch_batches > 0 and cache_dir is None:
+            cache_dir = os.path.join(
+                tempfile.gettempdir(), "model_hub_cache", self._default_cache_name()
+            )
+        if cache_dir is not None and local_size > 1:
+            cache_dir = os.path.join(cache_dir, f"slot{local_rank}")
+        self.cache_dir = cache_dir
+        self._client_pid: Optional[int] = None
+        self._client_obj: Any = None
+        self._prefetcher: Optional[Prefetcher] = None
+
+    @abc.abstractmethod
+    def _default_cache_name(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def _make_client(self) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def download(self, filepath: str) -> bytes:
+        """Download an object, bypassing the cache."""
+        pass
+
+    @property
+    def _client(self) -> Any:
+        if self._client_pid != os.getpid():
+            self._client_obj = self._make_client()
+            self._client_pid = os.getpid()
+        return self._client_obj
+
+    def _cached_path(self, filepath: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        path = os.path.join(self.cache_dir, DiskCache._name(filepath))
+        return path if os.path.exists(path) else None
 
     def get(self, filepath: str) -> Any:
-        obj = self._storage_client.get_object(Bucket=self._bucket, Key=filepath)
-        data = obj["Body"].read()
-        return data
+        path = self._cached_path(filepath)
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                # Evicted since we looked.
+                pass
+        return self.download(filepath)
 
     def get_text(self, filepath: str) -> Any:
         raise NotImplementedError
@@ -48,9 +191,26 @@ class S3Backend(mmcv.fileio.BaseStorageBackend):  # type: ignore
         ``get_local_path`` is decorated by :meth:`contxtlib.contextmanager`. It
         can be called with ``with`` statement, and when exists from the
         ``with`` statement, the temporary path will be released.
+        A file which has been prefetched is served from the cache without copying it.
         Args:
             filepath (str): Download a file from ``filepath``.
         """
+        path = self._cached_path(filepath)
+        if path is not None:
+            # Read through a link of our own, which stays readable even if the file is evicted
+            # meanwhile. The cache removes links left behind when it is next created.
+            link = os.path.join(os.path.dirname(path), f".{uuid.uuid4().hex}")
+            try:
+                os.link(path, link)
+            except OSError:
+                # Evicted since we looked.
+                pass
+            else:
+                try:
+                    yield link
+                finally:
+                    os.remove(link)
+                return
         try:
             f = tempfile.NamedTemporaryFile(delete=False)
             f.write(self.get(filepath))
@@ -59,11 +219,146 @@ class S3Backend(mmcv.fileio.BaseStorageBackend):  # type: ignore
         finally:
             os.remove(f.name)
 
+    def prefetcher(self, batch_size: int) -> Optional["Prefetcher"]:
+        """
+        The Prefetcher for this backend's cache, or None if prefetching is disabled. Every data
+        loader using this backend shares one Prefetcher, so that one DiskCache writes the cache.
+        """
+        if self.prefetch_batches <= 0:
+            return None
+        if self._prefetcher is None:
+            assert self.cache_dir is not None
+            max_bytes = None
+            if self.cache_size_mb is not None:
+                max_bytes = self.cache_size_mb * 1024 * 1024 // self.local_size
+            # Without a cache size, keep the images of batches which may still be loading.
+            max_entries = 4 * self.prefetch_batches * batch_size if max_bytes is None else None
+            cache = DiskCache(self.cache_dir, max_bytes, max_entries)
+            self._prefetcher = Prefetcher(self, cache, self.prefetch_threads)
+        return self._prefetcher
+
+
+class Prefetcher:
+    """Download objects into a DiskCache ahead of time, from a pool of threads."""
+
+    def __init__(self, backend: ObjectStoreBackend, cache: DiskCache, threads: int) -> None:
+        self.backend = backend
+        self.cache = cache
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="prefetch"
+        )
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+
+    def schedule(self, keys: Iterable[str]) -> None:
+        """Start downloading the keys which are neither cached nor already being downloaded."""
+        for key in keys:
+            if self.cache.touch(key):
+                continue
+            with self._lock:
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+            self._executor.submit(self._fetch, key)
+
+    def _fetch(self, key: str) -> None:
+        try:
+            self.cache.put(key, self.backend.download(key))
+        except Exception as e:
+            # The worker which loads the image will download it itself, and raise if that fails.
+            logging.debug(f"Failed to prefetch {key}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class PrefetchBatchSampler(torch.utils.data.BatchSampler):
+    """
+    Yield the batches of an underlying BatchSampler, scheduling the download of each batch's images
+    lookahead batches before yielding it.
+    """
+
+    def __init__(
+        self,
+        batch_sampler: torch.utils.data.BatchSampler,
+        prefetcher: Prefetcher,
+        keys: Callable[[int], str],
+        lookahead: int,
+    ) -> None:
+        self.batch_sampler = batch_sampler
+        self.prefetcher = prefetcher
+        self.keys = keys
+        self.lookahead = lookahead
+
+    def __len__(self) -> int:
+        return len(self.batch_sampler)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        ahead: "collections.deque[List[int]]" = collections.deque()
+        for batch in self.batch_sampler:
+            self.prefetcher.schedule(self.keys(idx) for idx in batch)
+            ahead.append(batch)
+            if len(ahead) > self.lookahead:
+                yield ahead.popleft()
+        yield from ahead
+
+
+class S3Backend(ObjectStoreBackend):
+    """
+    To use a S3 bucket as the storage backend, set ``data.file_client_args`` field of
+    the experiment config as follows:
+
+    .. code-block:: yaml
+
+        data:
+          file_client_args:
+            backend: s3
+            bucket_name: <FILL IN>
+
+    To download images ahead of the data loader workers which load them, add:
+
+    .. code-block:: yaml
+
+            # How many batches ahead of the current batch to download images.
+            prefetch_batches: 8
+            # How many images to download at once (default 16).
+            prefetch_threads: 16
+            # Keep up to this much of the dataset cached on disk across epochs, split evenly
+            # between the slots on each node, evicting the least recently used images. By
+            # default, only images near the current batch are kept.
+            cache_size_mb: 20000
+            # Where to cache images (default: a directory in the system's temporary directory).
+            # Each slot on a node caches into its own subdirectory.
+            cache_dir: /tmp/images
+
+    Set ``endpoint_url`` to use an S3-compatible service other than AWS.
+    """
+
+    def __init__(self, bucket_name: str, endpoint_url: Optional[str] = None, **kwargs: Any):
+        self._bucket = bucket_name
+        self._endpoint_url = endpoint_url
+        super().__init__(**kwargs)
+
+    def _default_cache_name(self) -> str:
+        return f"s3-{self._bucket}"
+
+    def _make_client(self) -> Any:
+        # Enough connections for every prefetch thread.
+        config = botocore.config.Config(max_pool_connections=max(10, self.prefetch_threads))
+        return boto3.client("s3", endpoint_url=self._endpoint_url, config=config)
+
+    def download(self, filepath: str) -> bytes:
+        obj = self._client.get_object(Bucket=self._bucket, Key=filepath)
+        return cast(bytes, obj["Body"].read())
+
 
 mmcv.fileio.FileClient.register_backend("s3", S3Backend)
 
 
-class GCSBackend(mmcv.fileio.BaseStorageBackend):  # type: ignore
+class GCSBackend(ObjectStoreBackend):
     """
     To use a Google Storage bucket as the storage backend, set ``data.file_client_args`` field of
     the experiment config as follows:
@@ -74,39 +369,41 @@ class GCSBackend(mmcv.fileio.BaseStorageBackend):  # type: ignore
           file_client_args:
             backend: gcs
             bucket_name: <FILL IN>
+
+    To download images ahead of the data loader workers which load them, add:
+
+    .. code-block:: yaml
+
+            # How many batches ahead of the current batch to download images.
+            prefetch_batches: 8
+            # How many images to download at once (default 16).
+            prefetch_threads: 16
+            # Keep up to this much of the dataset cached on disk across epochs, split evenly
+            # between the slots on each node, evicting the least recently used images. By
+            # default, only images near the current batch are kept.
+            cache_size_mb: 20000
+            # Where to cache images (default: a directory in the system's temporary directory).
+            # Each slot on a node caches into its own subdirectory.
+            cache_dir: /tmp/images
     """
 
-    def __init__(self, bucket_name: str):
-        self._storage_client = storage.Client()
-        self._bucket = self._storage_client.bucket(bucket_name)
+    def __init__(self, bucket_name: str, **kwargs: Any):
+        self._bucket_name = bucket_name
+        super().__init__(**kwargs)
 
-    def get(self, filepath: str) -> Any:
-        blob = self._bucket.blob(filepath)
+    def _default_cache_name(self) -> str:
+        return f"gcs-{self._bucket_name}"
+
+    def _make_client(self) -> Any:
+        return storage.Client().bucket(self._bucket_name)
+
+    def download(self, filepath: str) -> bytes:
+        blob = self._client.blob(filepath)
         try:
             data = determined.util.download_gcs_blob_with_backoff(blob)
         except Exception as e:
             raise Exception(f"Encountered {e}, failed to download {filepath} from gcs bucket.")
-        return data
-
-    def get_text(self, filepath: str) -> Any:
-        raise NotImplementedError
-
-    @contextlib.contextmanager
-    def get_local_path(self, filepath: str) -> Iterator[str]:
-        """Download a file from ``filepath``.
-        ``get_local_path`` is decorated by :meth:`contxtlib.contextmanager`. It
-        can be called with ``with`` statement, and when exists from the
-        ``with`` statement, the temporary path will be released.
-        Args:
-            filepath (str): Download a file from ``filepath``.
-        """
-        try:
-            f = tempfile.NamedTemporaryFile(delete=False)
-            f.write(self.get(filepath))
-            f.close()
-            yield f.name
-        finally:
-            os.remove(f.name)
+        return cast(bytes, data)
 
 
 mmcv.fileio.FileClient.register_backend("gcs", GCSBackend)
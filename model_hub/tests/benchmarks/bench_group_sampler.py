@@ -0,0 +1,83 @@
+"""
+Measure how long GroupSampler takes to produce an epoch's indices, against the list-based
+implementation it replaced, and how long resuming halfway through an epoch takes to yield its first
+index.
+
+The list-based implementation holds a tensor object per sample, so it is timed on a smaller dataset
+of --reference-samples.
+
+Run it from the model_hub directory:
+
+    python -m tests.benchmarks.bench_group_sampler --samples 10000000 --groups 2
+"""
+import argparse
+import itertools
+import time
+from typing import Callable
+
+import numpy as np
+import torch
+
+import model_hub.mmdetection as mh_mmdet
+from tests.test_mmdetection import FlagDataset, group_sampler_reference_indices
+
+
+def timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10_000_000)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--samples-per-gpu", type=int, default=2)
+    parser.add_argument("--replicas", type=int, default=8)
+    parser.add_argument(
+        "--reference-samples",
+        type=int,
+        default=1_000_000,
+        help="dataset size to time the list-based implementation on, or 0 to skip it",
+    )
+    args = parser.parse_args()
+
+    def make_sampler(num_samples: int) -> mh_mmdet.GroupSampler:
+        flag = np.random.default_rng(0).integers(0, args.groups, num_samples).astype(np.uint8)
+        return mh_mmdet.GroupSampler(FlagDataset(flag), args.samples_per_gpu, args.replicas)
+
+    results = {}
+    if args.reference_samples > 0:
+        sampler = make_sampler(args.reference_samples)
+        torch.manual_seed(0)
+        results[f"reference epoch, {args.reference_samples} samples"] = timed(
+            lambda: group_sampler_reference_indices(sampler)
+        )
+        torch.manual_seed(0)
+        results[f"epoch, {args.reference_samples} samples"] = timed(lambda: list(sampler))
+
+    start = time.perf_counter()
+    sampler = make_sampler(args.samples)
+    print(f"{len(sampler)} indices per epoch; init {time.perf_counter() - start:.2f}s")
+    torch.manual_seed(0)
+    results["epoch"] = timed(lambda: list(sampler))
+    torch.manual_seed(0)
+    results["first index"] = timed(lambda: next(iter(sampler)))
+
+    sampler.skip = len(sampler) // 2
+    results["first index after skipping half"] = timed(lambda: next(iter(sampler)))
+
+    # The same resume through a batch sampler, which has to consume every skipped index.
+    batch_sampler = torch.utils.data.BatchSampler(sampler, args.samples_per_gpu, drop_last=False)
+    skip_batches = len(sampler) // 2 // args.samples_per_gpu
+    results["first batch after consuming half"] = timed(
+        lambda: next(itertools.islice(iter(batch_sampler), skip_batches, None))
+    )
+
+    width = max(len(name) for name in results)
+    for name, elapsed in results.items():
+        print(f"{name:<{width}} {elapsed:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
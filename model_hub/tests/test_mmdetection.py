@@ -1,8 +1,14 @@
+import math
 import os
+import pathlib
 import shutil
-from typing import Generator
+import unittest.mock
+from typing import Generator, List
 
+import boto3
 import git
+import moto
+import numpy as np
 import pytest
 import torch
 
@@ -10,6 +16,7 @@ import determined as det
 import determined.pytorch as det_torch
 import model_hub.mmdetection as mh_mmdet
 import model_hub.mmdetection._callbacks as callbacks
+import model_hub.mmdetection._data_backends as data_backends
 import model_hub.utils as mh_utils
 from determined.common import util
 
@@ -110,6 +117,170 @@ def test_group_sampler(dataloader: torch.utils.data.DataLoader) -> None:
     assert all(test)
 
 
+class FlagDataset(torch.utils.data.Dataset):
+    def __init__(self, flag: np.ndarray) -> None:
+        self.flag = flag
+
+    def __len__(self) -> int:
+        return len(self.flag)
+
+
+def group_sampler_reference_indices(sampler: mh_mmdet.GroupSampler) -> List[int]:
+    """The list-based index generation which GroupSampler's vectorized version must reproduce."""
+    shuffled_indices: List[int] = []
+    for i, size in enumerate(sampler.group_sizes):
+        if size > 0:
+            group_indices = np.where(sampler.flag == i)[0]
+            shuffled_group_indices: List[int] = group_indices[
+                list(torch.randperm(int(size)))
+            ].tolist()
+            extra = int(
+                math.ceil(size * 1.0 / sampler.samples_per_gpu / sampler.num_replicas)
+            ) * sampler.samples_per_gpu * sampler.num_replicas - len(shuffled_group_indices)
+            tmp = shuffled_group_indices.copy()
+            for _ in range(extra // size):
+                shuffled_group_indices.extend(tmp)
+            shuffled_group_indices.extend(tmp[: extra % size])
+            shuffled_indices.extend(shuffled_group_indices)
+
+    return [
+        shuffled_indices[j]
+        for i in list(torch.randperm(len(shuffled_indices) // sampler.samples_per_gpu))
+        for j in range(i * sampler.samples_per_gpu, (i + 1) * sampler.samples_per_gpu)
+    ]
+
+
+@pytest.mark.parametrize(
+    "num_samples,num_groups,samples_per_gpu,num_replicas",
+    [(1, 1, 1, 1), (5, 3, 8, 4), (100, 2, 2, 1), (1001, 3, 4, 8)],
+)
+def test_group_sampler_matches_reference(
+    num_samples: int, num_groups: int, samples_per_gpu: int, num_replicas: int
+) -> None:
+    flag = np.random.default_rng(0).integers(0, num_groups, num_samples).astype(np.uint8)
+    sampler = mh_mmdet.GroupSampler(FlagDataset(flag), samples_per_gpu, num_replicas)
+
+    torch.manual_seed(0)
+    expected = group_sampler_reference_indices(sampler)
+    torch.manual_seed(0)
+    assert list(sampler) == expected
+    assert len(expected) == len(sampler)
+
+
+def test_group_sampler_skip() -> None:
+    flag = np.array([0, 0, 2, 2, 2, 0, 2], dtype=np.uint8)
+    torch.manual_seed(0)
+    expected = list(mh_mmdet.GroupSampler(FlagDataset(flag), 2, 1))
+
+    sampler = mh_mmdet.GroupSampler(FlagDataset(flag), 2, 1, skip=3)
+    torch.manual_seed(0)
+    assert list(sampler) == expected[3:]
+    # Only the first epoch is skipped into.
+    assert len(list(sampler)) == len(sampler)
+
+
+# _data_backends.py
+@pytest.fixture
+def s3_images() -> Generator[List[str], None, None]:
+    with moto.mock_s3():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="images")
+        keys = [f"img/{i}.jpg" for i in range(8)]
+        for i, key in enumerate(keys):
+            s3.put_object(Bucket="images", Key=key, Body=bytes([i]) * 100)
+        yield keys
+
+
+def test_s3_backend_prefetches_into_cache(s3_images: List[str], tmp_path: pathlib.Path) -> None:
+    backend = mh_mmdet.S3Backend("images", prefetch_batches=2, cache_dir=str(tmp_path))
+    with unittest.mock.patch.object(backend, "download", wraps=backend.download) as download:
+        prefetcher = backend.prefetcher(2)
+        assert prefetcher is not None
+        batches = [[0, 1], [2, 3], [4, 5], [0, 1]]
+        sampler = data_backends.PrefetchBatchSampler(
+            batches, prefetcher, lambda idx: s3_images[idx], lookahead=2  # type: ignore
+        )
+        assert list(sampler) == batches
+        prefetcher.close()
+        # Every image is downloaded once, even when it is scheduled again.
+        assert sorted(c.args[0] for c in download.call_args_list) == s3_images[:6]
+
+        download.reset_mock()
+        assert backend.get(s3_images[3]) == bytes([3]) * 100
+        with backend.get_local_path(s3_images[3]) as path:
+            assert os.path.dirname(path) == str(tmp_path)
+        download.assert_not_called()
+
+        # Images which were not prefetched are downloaded directly, and not cached.
+        assert backend.get(s3_images[7]) == bytes([7]) * 100
+        with backend.get_local_path(s3_images[7]) as path:
+            assert os.path.dirname(path) != str(tmp_path)
+        assert download.call_count == 2
+
+
+def test_s3_backend_get_local_path_survives_eviction(
+    s3_images: List[str], tmp_path: pathlib.Path
+) -> None:
+    backend = mh_mmdet.S3Backend("images", prefetch_batches=2, cache_dir=str(tmp_path))
+    prefetcher = backend.prefetcher(2)
+    assert prefetcher is not None
+    prefetcher.cache.put(s3_images[0], bytes([0]) * 100)
+
+    # A file evicted while it is being read stays readable.
+    with backend.get_local_path(s3_images[0]) as path:
+        os.remove(prefetcher.cache.path(s3_images[0]))
+        with open(path, "rb") as f:
+            assert f.read() == bytes([0]) * 100
+    assert os.listdir(tmp_path) == []
+
+    # A file evicted after it was found in the cache is downloaded instead.
+    with unittest.mock.patch.object(
+        backend, "_cached_path", return_value=prefetcher.cache.path(s3_images[1])
+    ):
+        with backend.get_local_path(s3_images[1]) as path:
+            with open(path, "rb") as f:
+                assert f.read() == bytes([1]) * 100
+
+
+def test_s3_backend_cache_per_slot(tmp_path: pathlib.Path) -> None:
+    backends = [
+        mh_mmdet.S3Backend(
+            "images",
+            prefetch_batches=2,
+            cache_dir=str(tmp_path),
+            cache_size_mb=4,
+            local_rank=rank,
+            local_size=2,
+        )
+        for rank in range(2)
+    ]
+    prefetchers = [backend.prefetcher(2) for backend in backends]
+    # Each slot on a node has its own cache, and the node's budget is split between them.
+    assert [p.cache.directory for p in prefetchers if p] == [
+        str(tmp_path.joinpath("slot0")),
+        str(tmp_path.joinpath("slot1")),
+    ]
+    assert all(p and p.cache.max_bytes == 2 * 1024 * 1024 for p in prefetchers)
+    for p in prefetchers:
+        assert p
+        p.close()
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: pathlib.Path) -> None:
+    cache = data_backends.DiskCache(str(tmp_path), max_bytes=250)
+    for key in ["a", "b", "c"]:
+        cache.put(key, b"x" * 100)
+    assert len(cache) == 2 and cache.size == 200
+    assert not cache.touch("a")
+    assert cache.touch("b")
+    cache.put("d", b"x" * 100)
+    assert cache.touch("b") and not cache.touch("c") and cache.touch("d")
+
+    # A new cache adopts the files, and evicts the oldest to fit its own limit.
+    cache = data_backends.DiskCache(str(tmp_path), max_entries=1)
+    assert len(cache) == 1 and len(os.listdir(tmp_path)) == 1
+
+
 # utils.py
 def test_get_pretrained_weights(
     mmdet_config_dir: None, context: det_torch.PyTorchTrialContext